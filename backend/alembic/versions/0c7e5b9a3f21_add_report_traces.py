@@ -0,0 +1,38 @@
+"""add report_traces table
+
+Revision ID: 0c7e5b9a3f21
+Revises: f3a8c61d2b90
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0c7e5b9a3f21"
+down_revision: Union[str, Sequence[str], None] = "f3a8c61d2b90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "report_traces",
+        sa.Column(
+            "report_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("reports.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("span_count", sa.Integer(), nullable=False),
+        sa.Column("dropped_spans", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("report_traces")
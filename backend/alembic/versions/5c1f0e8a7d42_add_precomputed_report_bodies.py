@@ -0,0 +1,30 @@
+"""add precomputed report bodies
+
+Revision ID: 5c1f0e8a7d42
+Revises: 13909e2a60b7
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1f0e8a7d42"
+down_revision: Union[str, Sequence[str], None] = "13909e2a60b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("reports", sa.Column("body_v1", sa.LargeBinary(), nullable=True))
+    op.add_column("reports", sa.Column("body_v2", sa.LargeBinary(), nullable=True))
+    op.add_column("reports", sa.Column("body_etag", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("reports") as batch:
+        batch.drop_column("body_etag")
+        batch.drop_column("body_v2")
+        batch.drop_column("body_v1")
@@ -0,0 +1,34 @@
+"""add reports.analysis_profile
+
+Revision ID: 7a4e2c9d1b56
+Revises: 0c7e5b9a3f21
+Create Date: 2026-10-18 00:00:00.000000
+
+Existing rows keep NULL, which reads as the standard profile.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "7a4e2c9d1b56"
+down_revision: Union[str, Sequence[str], None] = "0c7e5b9a3f21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "reports",
+        sa.Column(
+            "analysis_profile",
+            postgresql.JSONB().with_variant(sa.JSON(), "sqlite"),
+            nullable=True,
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("reports", "analysis_profile")
@@ -0,0 +1,40 @@
+"""compact findings storage into findings_v2
+
+Revision ID: 8e3b2d41c6f9
+Revises: 5c1f0e8a7d42
+Create Date: 2026-10-18 00:00:00.000000
+
+Every row keeps a single findings document in findings_v2. Rows that only
+have findings_json (written before findings_v2 existed) move it across
+unchanged: their recommendations are already flat strings, which the v1
+renderer passes through and v2 already served as a fallback. The duplicate
+findings_json copies are then cleared and the precomputed v1 body is dropped;
+run VACUUM afterwards to return the freed TOAST pages.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8e3b2d41c6f9"
+down_revision: Union[str, Sequence[str], None] = "5c1f0e8a7d42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "UPDATE reports SET findings_v2 = findings_json "
+        "WHERE findings_v2 IS NULL AND findings_json IS NOT NULL"
+    )
+    op.execute("UPDATE reports SET findings_json = NULL WHERE findings_v2 IS NOT NULL")
+    with op.batch_alter_table("reports") as batch:
+        batch.drop_column("body_v1")
+
+
+def downgrade() -> None:
+    # findings_json stays NULL: the previous revision renders v1 from
+    # findings_v2 when findings_json is missing, and falls back to rendering
+    # when body_v1 is missing.
+    op.add_column("reports", sa.Column("body_v1", sa.LargeBinary(), nullable=True))
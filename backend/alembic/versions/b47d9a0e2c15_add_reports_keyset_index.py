@@ -0,0 +1,24 @@
+"""add reports (created_at, id) index for keyset pagination
+
+Revision ID: b47d9a0e2c15
+Revises: 8e3b2d41c6f9
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b47d9a0e2c15"
+down_revision: Union[str, Sequence[str], None] = "8e3b2d41c6f9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_reports_created_at_id", "reports", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reports_created_at_id", table_name="reports")
@@ -0,0 +1,78 @@
+"""add report search indexes and failed-check table
+
+Revision ID: d2a86f3c9e71
+Revises: b47d9a0e2c15
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "d2a86f3c9e71"
+down_revision: Union[str, Sequence[str], None] = "b47d9a0e2c15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "report_failed_checks",
+        sa.Column("check_id", sa.Text(), primary_key=True),
+        sa.Column(
+            "report_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("reports.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+    )
+    op.create_index("ix_reports_status_created_at", "reports", ["status", "created_at"])
+    op.create_index("ix_reports_score_created_at", "reports", ["overall_score", "created_at"])
+    op.create_index(
+        "ix_reports_owner_repo_created_at",
+        "reports",
+        [sa.text("lower(repo_owner)"), sa.text("lower(repo_name)"), "created_at"],
+    )
+
+    # Backfill from stored findings. Rows without a sections array (errors,
+    # pending) contribute nothing.
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            """
+            INSERT INTO report_failed_checks (check_id, report_id)
+            SELECT DISTINCT c->>'id', r.id
+            FROM reports r
+            CROSS JOIN LATERAL jsonb_array_elements(
+                CASE WHEN jsonb_typeof(r.findings_v2->'sections') = 'array'
+                     THEN r.findings_v2->'sections' ELSE '[]'::jsonb END
+            ) AS s
+            CROSS JOIN LATERAL jsonb_array_elements(
+                CASE WHEN jsonb_typeof(s->'checks') = 'array'
+                     THEN s->'checks' ELSE '[]'::jsonb END
+            ) AS c
+            WHERE c->>'status' = 'fail' AND c->>'id' IS NOT NULL
+            """
+        )
+        # Failed reports never had owner/repo set; derive them from the URL.
+        op.execute(
+            r"""
+            UPDATE reports SET
+                repo_owner = split_part(x.p, '/', 1),
+                repo_name = regexp_replace(split_part(x.p, '/', 2), '\.git$', '', 'i')
+            FROM (
+                SELECT id, regexp_replace(repo_url, '^https?://github\.com/', '', 'i') AS p
+                FROM reports WHERE repo_owner IS NULL
+            ) AS x
+            WHERE reports.id = x.id
+            """
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reports_owner_repo_created_at", table_name="reports")
+    op.drop_index("ix_reports_score_created_at", table_name="reports")
+    op.drop_index("ix_reports_status_created_at", table_name="reports")
+    op.drop_table("report_failed_checks")
@@ -0,0 +1,34 @@
+"""add rate_limit_buckets table
+
+Revision ID: e9c4a7b15d38
+Revises: d2a86f3c9e71
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e9c4a7b15d38"
+down_revision: Union[str, Sequence[str], None] = "d2a86f3c9e71"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rate_limit_buckets",
+        sa.Column("key", sa.Text(), primary_key=True),
+        sa.Column("window_index", sa.BigInteger(), nullable=False),
+        sa.Column("prev_count", sa.Integer(), nullable=False),
+        sa.Column("curr_count", sa.Integer(), nullable=False),
+        sa.Column("expires_at", sa.Float(), nullable=False),
+    )
+    op.create_index("ix_rate_limit_buckets_expires_at", "rate_limit_buckets", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rate_limit_buckets_expires_at", table_name="rate_limit_buckets")
+    op.drop_table("rate_limit_buckets")
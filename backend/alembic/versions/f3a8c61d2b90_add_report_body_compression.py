@@ -0,0 +1,48 @@
+"""add report body compression
+
+Revision ID: f3a8c61d2b90
+Revises: e9c4a7b15d38
+Create Date: 2026-10-18 00:00:00.000000
+
+Existing bodies stay uncompressed (body_encoding NULL); convert them with
+`python -m app.cli compress-bodies`.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a8c61d2b90"
+down_revision: Union[str, Sequence[str], None] = "e9c4a7b15d38"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "compression_dictionaries",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("sample_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+    with op.batch_alter_table("reports") as batch:
+        batch.add_column(sa.Column("body_encoding", sa.Text(), nullable=True))
+        batch.add_column(sa.Column("body_dict_id", sa.Integer(), nullable=True))
+        batch.create_foreign_key(
+            "fk_reports_body_dict_id", "compression_dictionaries", ["body_dict_id"], ["id"]
+        )
+
+
+def downgrade() -> None:
+    # Compressed bodies cannot be served by the previous revision; drop them
+    # (and their digests) so those rows fall back to rendering from findings.
+    op.execute(
+        "UPDATE reports SET body_v2 = NULL, body_etag = NULL WHERE body_encoding IS NOT NULL"
+    )
+    with op.batch_alter_table("reports") as batch:
+        batch.drop_constraint("fk_reports_body_dict_id", type_="foreignkey")
+        batch.drop_column("body_dict_id")
+        batch.drop_column("body_encoding")
+    op.drop_table("compression_dictionaries")
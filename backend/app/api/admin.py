@@ -0,0 +1,151 @@
+"""Operator endpoints under /api/admin, behind a bearer token (ADMIN_TOKEN).
+
+Without ADMIN_TOKEN the whole router answers 404, so a deployment that never
+configured it does not advertise it.
+"""
+
+import gzip
+import hmac
+import threading
+import uuid
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.reports import _collect_content, _fetch
+from app.core.analysis_profiles import STANDARD, AnalysisProfile
+from app.core.config import ADMIN_TOKEN
+from app.core.database import get_async_db
+from app.core.profiling import StackSampler
+from app.models import Report, ReportTrace
+from app.services.analyzer import analyze
+from app.services.snapshot_archive import CorruptArchiveError, SnapshotNotFoundError, get_archive
+
+
+def require_admin(request: Request) -> None:
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = (request.headers.get("authorization") or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.strip().encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(
+            status_code=401, detail="Admin token required", headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/reports/{report_id}/trace")
+async def get_report_trace(report_id: uuid.UUID, db: AsyncSession = Depends(get_async_db)):
+    """The report's analysis trace as Chrome trace event JSON (chrome://tracing, Perfetto)."""
+    data = (
+        await db.execute(select(ReportTrace.data).where(ReportTrace.report_id == report_id))
+    ).scalar_one_or_none()
+    if data is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return Response(
+        content=gzip.decompress(data),
+        media_type="application/json",
+        headers={"Content-Disposition": f'attachment; filename="trace-{report_id}.json"'},
+    )
+
+
+class ProfileRequest(BaseModel):
+    """Exactly one of report_id (that report's snapshot, else its repository re-fetched) or fixture.
+
+    A fixture is a fetch_repo() result, optionally with a "content_by_path"
+    map of file contents, as in tests/fixtures/sample_repo.json.
+    """
+
+    report_id: uuid.UUID | None = None
+    fixture: dict[str, Any] | None = None
+    repeat: int = Field(1, ge=1, le=20, description="Run analyze() this many times to gather more samples")
+    interval_ms: float = Field(1.0, ge=0.1, le=100)
+
+
+# One profile at a time: concurrent runs would sample each other's GIL waits.
+_profiling = threading.Lock()
+
+
+def _profile(
+    fetch: dict[str, Any],
+    content_by_path: dict[str, str],
+    body: ProfileRequest,
+    profile: AnalysisProfile = STANDARD,
+) -> StackSampler:
+    sampler = StackSampler(interval=body.interval_ms / 1000, root=analyze)
+    for _ in range(body.repeat):
+        sampler.run(analyze, fetch, content_by_path=content_by_path, profile=profile)
+    return sampler
+
+
+def _load_snapshot(report_id: uuid.UUID) -> tuple[dict[str, Any], dict[str, str]] | None:
+    """(fetch, content_by_path) archived for report_id, or None without a usable snapshot."""
+    archive = get_archive()
+    if archive is None:
+        return None
+    try:
+        snapshot = archive.load(report_id)
+    except (SnapshotNotFoundError, CorruptArchiveError):
+        return None
+    return snapshot.fetch, snapshot.content
+
+
+@router.post("/profile")
+async def profile_analysis(body: ProfileRequest, db: AsyncSession = Depends(get_async_db)):
+    """Re-run analyze() under the sampling profiler; returns collapsed stacks (flamegraph.pl, speedscope).
+
+    A report is re-run on its snapshot (SNAPSHOT_DIR) when there is one, so
+    it sees exactly the inputs of the original analysis; otherwise its
+    repository is fetched again. Either way it uses the report's stored
+    analysis profile. Only analyze() is profiled: loading or fetching the
+    inputs happens first and is not sampled.
+    """
+    if (body.report_id is None) == (body.fixture is None):
+        raise HTTPException(status_code=400, detail="Give exactly one of report_id or fixture")
+    profile = STANDARD
+    if body.fixture is not None:
+        fetch = dict(body.fixture)
+        content_by_path = fetch.pop("content_by_path", None) or {}
+        source = "fixture"
+    else:
+        row = (
+            await db.execute(
+                select(Report.repo_url, Report.analysis_profile).where(Report.id == body.report_id)
+            )
+        ).one_or_none()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Report not found")
+        profile = AnalysisProfile.from_dict(row.analysis_profile)
+        snapshot = await run_in_threadpool(_load_snapshot, body.report_id)
+        if snapshot is not None:
+            fetch, content_by_path = snapshot
+            source = f"snapshot:{body.report_id}"
+        else:
+            try:
+                fetch = await run_in_threadpool(_fetch, row.repo_url)
+            except Exception as e:
+                raise HTTPException(status_code=502, detail=f"Could not fetch repository: {e}")
+            content_by_path = await run_in_threadpool(_collect_content, fetch, profile)
+            source = f"report:{body.report_id}"
+
+    if not _profiling.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    try:
+        sampler = await run_in_threadpool(_profile, fetch, content_by_path, body, profile)
+    finally:
+        _profiling.release()
+    return Response(
+        content=sampler.collapsed(),
+        media_type="text/plain; charset=utf-8",
+        headers={
+            "X-Profile-Source": source,
+            "X-Profile-Samples": str(sampler.samples),
+            "X-Profile-Duration-Ms": f"{sampler.duration * 1000:.1f}",
+            "Content-Disposition": 'attachment; filename="profile.folded"',
+        },
+    )
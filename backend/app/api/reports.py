@@ -1,21 +1,29 @@
-import copy
+import hashlib
 import json
 import uuid
+from collections.abc import AsyncIterator
 from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-
-from app.core.config import GITHUB_TOKEN
-from app.core.database import get_db
+from sqlalchemy import JSON, Select, Text, case, cast, exists, func, literal, literal_column, select, tuple_, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.admission import ANALYSIS_ADMISSION, AdmissionRejected
+from app.core.analysis_profiles import STANDARD, AnalysisProfile, InvalidProfileError, resolve_profile
+from app.core.config import GITHUB_TOKEN, REPORT_BODY_COMPRESSION, REPORT_TRACE_MAX_SPANS
+from app.core.database import get_async_db, get_async_sessionmaker
+from app.core.metrics import ANALYSES_IN_FLIGHT, record_cache, time_stage
 from app.core.rate_limit import RateLimitExceeded, check_analyze_rate_limit
-from app.core.repo_limits import MAX_FILES_FETCH, MAX_TOTAL_BYTES
-from app.models import Report
+from app.core.tracing import Trace, encode_trace, recording
+from app.models import CompressionDictionary, Report, ReportFailedCheck, ReportTrace
 from app.services.analyzer import ReportResult, analyze
-from app.services.candidate_selector import select_candidates
+from app.services.cost_model import COST_MODEL, CostEstimate, RepoStats, estimate_cost
 from app.services.github_client import (
     GitHubAPIError,
     GitHubRateLimitError,
@@ -25,6 +33,11 @@ from app.services.github_client import (
     fetch_repo,
 )
 from app.services.repo_content import batch_fetch_text
+from app.services.report_diff import DiffCache, diff_findings
+from app.services.report_render import buffered, iter_legacy_detail, iter_legacy_section
+from app.services.report_storage import accepts_gzip, decode_body, encode_body, iter_decoded
+from app.services.sampling import select_for_profile
+from app.services.snapshot_archive import get_archive
 
 _BACKEND_ROOT = Path(__file__).resolve().parent.parent.parent
 _DEMO_FIXTURE_PATH = _BACKEND_ROOT / "tests" / "fixtures" / "sample_repo.json"
@@ -39,63 +52,54 @@ router = APIRouter(prefix="/api", tags=["reports"])
 
 class AnalyzeRequest(BaseModel):
     repo_url: str
+    depth: Literal["quick", "full"] = "full"
+    # Analysis profile name (quick, standard, deep) and per-limit overrides;
+    # see app.core.analysis_profiles.
+    profile: str | None = None
+    limits: dict[str, int] | None = None
+    # "stratified" samples code files at random across directories and
+    # languages and extrapolates per-file metrics; see app.services.sampling.
+    sampling: Literal["priority", "stratified"] | None = None
 
 
 class AnalyzeResponse(BaseModel):
     report_id: str
+    provisional: bool = False
+    # For a provisional report: predicted seconds until the full analysis is done.
+    eta_seconds: float | None = None
 
 
-def _serialize_report_result(result: ReportResult) -> tuple[dict, dict]:
-    """Produce (legacy_findings_json, structured_findings_v2) from one ReportResult.
+def _serialize_report_result(result: ReportResult) -> dict:
+    """Produce the canonical structured findings (stored in findings_v2) from one ReportResult.
 
-    Both have the same overall shape; they differ only in how
-    `recommendation` is rendered: legacy is a flat string, v2 is the
-    structured what/where/why/how dict.
-    """
-    structured = asdict(result)  # recursively turns Recommendation into dict
-    legacy = copy.deepcopy(structured)
-    for section in legacy.get("sections") or []:
-        for check in section.get("checks") or []:
-            rec = check.get("recommendation")
-            if isinstance(rec, dict):
-                # Mirror Recommendation.to_legacy_string(): "{what} {how}"
-                what = rec.get("what") or ""
-                how = rec.get("how") or ""
-                check["recommendation"] = f"{what} {how}".strip()
-    return legacy, structured
-
-
-def _v2_to_legacy(findings_v2: Any) -> Any:
-    """Convert a structured findings_v2 payload into legacy shape on read.
-
-    Used when a row was written with both columns and a v=1 client requests it,
-    or to rebuild a legacy view on the fly when only findings_v2 exists.
+    This is the only findings document written per report; the legacy v1
+    shape is rendered from it on read (see app.services.report_render).
     """
-    if not isinstance(findings_v2, dict):
-        return findings_v2
-    out = copy.deepcopy(findings_v2)
-    for section in out.get("sections") or []:
-        for check in section.get("checks") or []:
-            rec = check.get("recommendation")
-            if isinstance(rec, dict):
-                check["recommendation"] = f"{rec.get('what') or ''} {rec.get('how') or ''}".strip()
-    return out
+    return asdict(result)  # recursively turns Recommendation into dict
+
+
+def _failed_check_ids(result: ReportResult) -> list[str]:
+    """Distinct ids of checks with status "fail", in report order."""
+    ids: dict[str, None] = {}
+    for section in result.sections:
+        for check in section.checks:
+            if check.status == "fail":
+                ids[check.id] = None
+    return list(ids)
 
 
-def _report_to_detail(r: Report, version: int = 1) -> dict:
-    """Return the report as a JSON-friendly dict.
+def _stored_findings(r: Report) -> Any:
+    """The row's single findings document: findings_v2, or findings_json on rows not yet compacted."""
+    return r.findings_v2 if r.findings_v2 is not None else r.findings_json
 
-    version=1 (default): findings_json field has flat-string recommendations.
-    version=2: findings_json field has structured recommendation dicts.
 
-    Field name stays `findings_json` either way so old clients see the same
-    response shape; only the `recommendation` field within changes.
+def _report_to_detail(r: Report) -> dict:
+    """Return the report as a JSON-friendly dict with findings as stored (v2 shape).
+
+    The field name stays `findings_json` so old clients see the same response
+    shape; v1 responses pass this dict through iter_legacy_detail, which only
+    changes each check's `recommendation`.
     """
-    if version == 2:
-        # Prefer the new column, fall back to the legacy column if missing.
-        payload = r.findings_v2 if r.findings_v2 is not None else r.findings_json
-    else:
-        payload = r.findings_json if r.findings_json is not None else _v2_to_legacy(r.findings_v2)
     return {
         "id": str(r.id),
         "repo_url": r.repo_url,
@@ -104,13 +108,211 @@ def _report_to_detail(r: Report, version: int = 1) -> dict:
         "commit_sha": r.commit_sha,
         "status": r.status,
         "overall_score": r.overall_score,
-        "findings_json": payload,
+        "findings_json": _stored_findings(r),
         "created_at": r.created_at.isoformat() if r.created_at else None,
         "updated_at": r.updated_at.isoformat() if r.updated_at else None,
+        "analysis_profile": r.analysis_profile,
     }
 
 
-def _report_to_list_item(r: Report) -> dict:
+CACHE_CONTROL_IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def _encode_body(detail: dict) -> bytes:
+    return json.dumps(detail, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _finalize_report(r: Report, dictionary: tuple[int, bytes] | None = None) -> None:
+    """Stamp a terminal report and precompute its v2 response body.
+
+    Reports never change once done or failed, so the exact bytes GET returns
+    are rendered once here. updated_at is set client-side so the stored body
+    matches the row. v1 is streamed from the same body on read. The body is
+    stored compressed when REPORT_BODY_COMPRESSION is set; the ETag digest is
+    always over the uncompressed bytes.
+    """
+    r.updated_at = datetime.now(timezone.utc)
+    raw = _encode_body(_report_to_detail(r))
+    r.body_etag = hashlib.sha256(raw).hexdigest()[:32]
+    r.body_v2, r.body_encoding, r.body_dict_id = encode_body(raw, REPORT_BODY_COMPRESSION, dictionary)
+
+
+# Dictionaries are immutable, so each is loaded at most once per process.
+_dictionaries: dict[int, bytes] = {}
+
+
+async def _dictionary(db: AsyncSession, dict_id: int | None) -> bytes | None:
+    if dict_id is None:
+        return None
+    hit = dict_id in _dictionaries
+    record_cache("compression_dictionary", hit)
+    if not hit:
+        data = (
+            await db.execute(select(CompressionDictionary.data).where(CompressionDictionary.id == dict_id))
+        ).scalar_one()
+        _dictionaries[dict_id] = data
+    return _dictionaries[dict_id]
+
+
+async def _write_dictionary(db: AsyncSession) -> tuple[int, bytes] | None:
+    """The newest dictionary, for compressing a body being written; None unless "zdict" is configured."""
+    if REPORT_BODY_COMPRESSION != "zdict":
+        return None
+    dict_id = (await db.execute(select(func.max(CompressionDictionary.id)))).scalar()
+    if dict_id is None:
+        return None
+    return dict_id, await _dictionary(db, dict_id)
+
+
+def _legacy_response(detail: dict, headers: dict[str, str] | None = None) -> StreamingResponse:
+    return StreamingResponse(
+        buffered(iter_legacy_detail(detail)),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def _etag_for(body_etag: str, version: int, variant: str = "") -> str:
+    """Strong ETag for one representation; v1 and v2 (and each projection) share a digest but not a tag."""
+    return f'"{body_etag}-v{version}{variant}"'
+
+
+def _variant_tag(kind: str, value: str) -> str:
+    return f"-{kind}{hashlib.sha256(value.encode('utf-8')).hexdigest()[:8]}"
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison per RFC 9110 13.1.2: W/ prefixes are ignored, * matches anything."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+async def _not_modified(
+    db: AsyncSession,
+    report_id: uuid.UUID,
+    if_none_match: str | None,
+    version: int,
+    variant: str = "",
+    gzip_ok: bool = False,
+) -> Response | None:
+    """304 when a conditional GET matches a terminal report's tag. Only the digest is read.
+
+    gzip_ok: the stored gzip body would be passed through, which is a
+    different representation with its own tag.
+    """
+    if not if_none_match:
+        return None
+    row = (
+        await db.execute(select(Report.body_etag, Report.body_encoding).where(Report.id == report_id))
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    if row.body_etag:
+        if gzip_ok and row.body_encoding == "gzip":
+            variant += "-gzip"
+        etag = _etag_for(row.body_etag, version, variant)
+        matched = _etag_matches(if_none_match, etag)
+        record_cache("report_etag", matched)
+        if matched:
+            headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL_IMMUTABLE}
+            if gzip_ok and row.body_encoding is not None:
+                headers["Vary"] = "Accept-Encoding"
+            return Response(status_code=304, headers=headers)
+    return None
+
+
+# The row's findings document (see _stored_findings), as a SQL expression so
+# parts of it can be extracted in the database.
+_FINDINGS = type_coerce(
+    func.coalesce(Report.findings_v2, Report.findings_json), Report.findings_v2.type
+)
+
+# ?fields= names, in response order. Top-level findings keys are selected as
+# "findings_json.<key>".
+DETAIL_FIELDS = {
+    "id": Report.id,
+    "repo_url": Report.repo_url,
+    "repo_owner": Report.repo_owner,
+    "repo_name": Report.repo_name,
+    "commit_sha": Report.commit_sha,
+    "status": Report.status,
+    "overall_score": Report.overall_score,
+    "findings_json": _FINDINGS,
+    "created_at": Report.created_at,
+    "updated_at": Report.updated_at,
+    "analysis_profile": Report.analysis_profile,
+}
+FINDINGS_KEYS = (
+    "overall_score", "category_scores", "sections", "interview_pack", "sampling",
+    "scaffold", "generated", "packages", "provisional", "eta", "error",
+)
+
+
+def _parse_fields(fields: str) -> tuple[list[str], list[str]]:
+    """Split ?fields= into detail field names and findings keys, both in canonical order."""
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    if not requested:
+        raise HTTPException(status_code=400, detail="fields must name at least one field")
+    unknown = requested - set(DETAIL_FIELDS) - {f"findings_json.{k}" for k in FINDINGS_KEYS}
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    names = [n for n in DETAIL_FIELDS if n in requested]
+    keys = [] if "findings_json" in requested else [
+        k for k in FINDINGS_KEYS if f"findings_json.{k}" in requested
+    ]
+    return names, keys
+
+
+def _format_field(name: str, value: Any) -> Any:
+    if value is None:
+        return None
+    if name == "id":
+        return str(value)
+    if name in ("created_at", "updated_at"):
+        return value.isoformat()
+    return value
+
+
+def _findings_key_expr(dialect: str, key: str) -> Any:
+    """The top-level findings key, extracted in SQL; NULL when the document has no such key."""
+    if dialect == "postgresql":
+        # Postgres cannot subscript a function call, so not _FINDINGS[key].
+        return func.jsonb_extract_path(_FINDINGS, cast(key, Text), type_=Report.findings_v2.type)
+    return type_coerce(func.json_quote(func.json_extract(_FINDINGS, f"$.{key}")), JSON)
+
+
+def _section_expr(dialect: str, name: str) -> Any:
+    """The findings section called name, extracted in SQL so only that subtree leaves the database."""
+    if dialect == "postgresql":
+        return func.jsonb_path_query_first(
+            _FINDINGS,
+            literal_column("'$.sections[*] ? (@.name == $name)'::jsonpath"),
+            func.jsonb_build_object("name", cast(name, Text)),
+            type_=Report.findings_v2.type,
+        )
+    sections = func.json_each(_FINDINGS, "$.sections").table_valued("value")
+    return (
+        select(type_coerce(sections.c.value, JSON))
+        .where(func.json_extract(sections.c.value, "$.name") == name)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+LIST_COLUMNS = (Report.id, Report.repo_url, Report.overall_score, Report.created_at)
+SEARCH_COLUMNS = LIST_COLUMNS + (Report.repo_owner, Report.repo_name, Report.status)
+
+
+def _report_to_list_item(r: Any) -> dict:
     return {
         "id": str(r.id),
         "repo_url": r.repo_url,
@@ -119,108 +321,690 @@ def _report_to_list_item(r: Report) -> dict:
     }
 
 
+def _fetch(repo_url: str) -> dict[str, Any]:
+    """Fetch repo metadata; falls back to the demo fixture when rate-limited without a token."""
+    try:
+        with time_stage("fetch_repo"):
+            return fetch_repo(repo_url)
+    except GitHubRateLimitError:
+        if GITHUB_TOKEN:
+            raise
+        return _load_demo_fixture()
+
+
+def _collect_content(
+    fetch: dict[str, Any], profile: AnalysisProfile = STANDARD, timings: dict[str, float] | None = None
+) -> dict[str, str]:
+    """Download prioritized blobs (best-effort) within the profile's limits. Returns {path: text}."""
+    tree_blobs = fetch.get("tree_blobs") or []
+    if not tree_blobs:
+        return {}
+    try:
+        owner = fetch.get("owner") or ""
+        repo = fetch.get("name") or ""
+        with time_stage("select_candidates"):
+            candidate_blobs = select_for_profile(tree_blobs, profile)
+        with time_stage("batch_fetch_text", timings):
+            return batch_fetch_text(
+                owner, repo, candidate_blobs,
+                max_files=profile.max_files_fetch,
+                max_total_bytes=profile.max_total_bytes,
+                generated=fetch.setdefault("generated_files", {}),
+            )
+    except Exception:
+        return {}
+
+
+def _save_snapshot(
+    report_id: uuid.UUID,
+    repo_url: str,
+    fetch: dict[str, Any],
+    content_by_path: dict[str, str],
+    profile: AnalysisProfile,
+) -> None:
+    """Archive the analysis inputs when SNAPSHOT_DIR is set (best-effort)."""
+    archive = get_archive()
+    if archive is None:
+        return
+    try:
+        with time_stage("snapshot"):
+            archive.save(report_id, repo_url, fetch, content_by_path, profile.as_dict())
+    except Exception:
+        pass
+
+
+def _collect_and_analyze(
+    fetch: dict[str, Any],
+    report_id: uuid.UUID | None = None,
+    repo_url: str = "",
+    profile: AnalysisProfile = STANDARD,
+) -> ReportResult:
+    """Download prioritized blobs (best-effort), snapshot the inputs for report_id, and run the analyzer.
+
+    The download and analyzer timings calibrate the cost model (app.services.cost_model).
+    """
+    timings: dict[str, float] = {}
+    content_by_path = _collect_content(fetch, profile, timings)
+    if report_id is not None:
+        _save_snapshot(report_id, repo_url, fetch, content_by_path, profile)
+    with time_stage("analyze", timings):
+        result = analyze(fetch, content_by_path=content_by_path, profile=profile)
+    if content_by_path:
+        stats = RepoStats.from_tree(fetch.get("tree_blobs") or [], profile)
+        COST_MODEL.observe(stats, timings.get("batch_fetch_text"), timings["analyze"])
+    return result
+
+
+def _unavailable(e: AdmissionRejected) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
 @router.post(
     "/analyze",
     response_model=AnalyzeResponse,
     summary="Analyze repository",
-    description="Analyze a public GitHub repository. Read-only; no repository code is executed.",
+    description=(
+        "Analyze a public GitHub repository. Read-only; no repository code is executed. "
+        "With depth=quick the report is scored from repository metadata first and returned "
+        "pending with provisional findings and an ETA; the full analysis then completes it in place. "
+        "Analyses wait for a slot cheapest first; when the queue is full the response is 503 with Retry-After."
+    ),
 )
-def post_analyze(
+async def post_analyze(
     body: AnalyzeRequest,
     request: Request,
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    sessionmaker: async_sessionmaker[AsyncSession] = Depends(get_async_sessionmaker),
 ):
     repo_url = (body.repo_url or "").strip()
     if not repo_url:
         raise HTTPException(status_code=400, detail="repo_url is required")
 
     try:
-        _parse_repo_url(repo_url)
+        owner, name = _parse_repo_url(repo_url)
     except InvalidRepoUrlError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    try:
+        profile = resolve_profile(body.profile, body.limits, body.sampling)
+    except InvalidProfileError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     ip = request.client.host if request.client else "unknown"
     try:
-        check_analyze_rate_limit(ip)
+        await run_in_threadpool(check_analyze_rate_limit, ip)
     except RateLimitExceeded as e:
         raise HTTPException(status_code=429, detail=str(e))
 
-    report = Report(repo_url=repo_url, status="pending")
+    # A request that finds the queue full is turned away before the report
+    # exists. Otherwise it queues for a slot once the tree is fetched and its
+    # cost is known, so cheap analyses are not stuck behind large ones.
+    try:
+        ANALYSIS_ADMISSION.check()
+    except AdmissionRejected as e:
+        raise _unavailable(e)
+
+    report = Report(
+        repo_url=repo_url, repo_owner=owner, repo_name=name, status="pending",
+        analysis_profile=profile.as_dict(),
+    )
     db.add(report)
-    db.commit()
-    db.refresh(report)
+    await db.commit()
+    await db.refresh(report)
     report_id = str(report.id)
+    trace = _new_trace()
 
-    try:
-        fetch = fetch_repo(repo_url)
-    except GitHubRateLimitError as e:
-        if not GITHUB_TOKEN:
-            fetch = _load_demo_fixture()
-        else:
-            report.status = "failed"
-            report.findings_json = {"error": str(e)}
-            db.commit()
+    if body.depth == "quick":
+        started = await _quick_analyze_into(db, report, repo_url, trace)
+        if started is None:
+            await _store_trace(db, report, repo_url, trace)
             return AnalyzeResponse(report_id=report_id)
+        fetch, cost = started
+        background_tasks.add_task(
+            _upgrade_report, sessionmaker, report.id, repo_url, fetch, trace, cost.total_seconds
+        )
+        return AnalyzeResponse(report_id=report_id, provisional=True, eta_seconds=report.findings_v2["eta"]["seconds"])
+
+    with ANALYSES_IN_FLIGHT.track_inprogress(), recording(trace):
+        fetch = await _fetch_or_fail(db, report, repo_url)
+    if fetch is None:
+        await _store_trace(db, report, repo_url, trace)
+        return AnalyzeResponse(report_id=report_id)
+    cost = await run_in_threadpool(estimate_cost, fetch, profile)
+    try:
+        async with ANALYSIS_ADMISSION.admitted(cost=cost.total_seconds):
+            await _run_analysis(db, report, repo_url, fetch, trace)
+    except AdmissionRejected as e:
+        await db.delete(report)
+        await db.commit()
+        raise _unavailable(e)
+    return AnalyzeResponse(report_id=report_id)
+
+
+def _new_trace() -> Trace | None:
+    return Trace() if REPORT_TRACE_MAX_SPANS > 0 else None
+
+
+async def _store_trace(db: AsyncSession, report: Report, repo_url: str, trace: Trace | None) -> None:
+    if trace is None:
+        return
+    db.add(ReportTrace(
+        report_id=report.id,
+        data=encode_trace(trace, {"report_id": str(report.id), "repo_url": repo_url}),
+        span_count=len(trace.events),
+        dropped_spans=trace.dropped,
+    ))
+    await db.commit()
+
+
+async def _run_analysis(
+    db: AsyncSession,
+    report: Report,
+    repo_url: str,
+    fetch: dict[str, Any] | None = None,
+    trace: Trace | None = None,
+) -> None:
+    """Fetch (unless given) and analyze the repo, then finalize the pending report in place and commit.
+
+    The analysis is traced (app.core.tracing) and the trace is stored in
+    report_traces after the report, in its own commit, so a failure to store
+    it never loses the findings. A quick scan passes its fetch result and
+    trace on, so the upgraded report has one trace covering both.
+    """
+    if trace is None:
+        trace = _new_trace()
+    with ANALYSES_IN_FLIGHT.track_inprogress(), recording(trace):
+        await _analyze_into(db, report, repo_url, fetch)
+    await _store_trace(db, report, repo_url, trace)
+
+
+async def _fail_into(db: AsyncSession, report: Report, error: Exception) -> None:
+    report.status = "failed"
+    report.findings_v2 = {"error": str(error)}
+    dictionary = await _write_dictionary(db)
+    with time_stage("serialize"):
+        _finalize_report(report, dictionary)
+    with time_stage("db_commit"):
+        await db.commit()
+
+
+async def _fetch_or_fail(db: AsyncSession, report: Report, repo_url: str) -> dict[str, Any] | None:
+    """The fetch result, or None after marking the report failed."""
+    # GitHub calls and analysis are blocking; they run in the threadpool so
+    # the event loop keeps serving other requests meanwhile.
+    try:
+        return await run_in_threadpool(_fetch, repo_url)
     except (
         InvalidRepoUrlError,
         RepoNotFoundError,
+        GitHubRateLimitError,
         GitHubAPIError,
         Exception,
     ) as e:
-        report.status = "failed"
-        report.findings_json = {"error": str(e)}
-        db.commit()
-        return AnalyzeResponse(report_id=report_id)
+        await _fail_into(db, report, e)
+        return None
 
-    content_by_path = {}
-    tree_blobs = fetch.get("tree_blobs") or []
-    if tree_blobs:
-        try:
-            owner = fetch.get("owner") or ""
-            repo = fetch.get("name") or ""
-            candidate_blobs = select_candidates(tree_blobs)
-            content_by_path = batch_fetch_text(
-                owner, repo, candidate_blobs,
-                max_files=MAX_FILES_FETCH,
-                max_total_bytes=MAX_TOTAL_BYTES,
+
+async def _analyze_into(
+    db: AsyncSession, report: Report, repo_url: str, fetch: dict[str, Any] | None = None
+) -> None:
+    if fetch is None:
+        fetch = await _fetch_or_fail(db, report, repo_url)
+        if fetch is None:
+            return
+
+    profile = AnalysisProfile.from_dict(report.analysis_profile)
+    result: ReportResult = await run_in_threadpool(
+        _collect_and_analyze, fetch, report.id, repo_url, profile
+    )
+    dictionary = await _write_dictionary(db)
+    with time_stage("serialize"):
+        report.status = "done"
+        report.overall_score = result.overall_score
+        report.findings_v2 = _serialize_report_result(result)
+        report.repo_owner = fetch.get("owner")
+        report.repo_name = fetch.get("name")
+        _finalize_report(report, dictionary)
+    db.add_all(
+        ReportFailedCheck(report_id=report.id, check_id=check_id)
+        for check_id in _failed_check_ids(result)
+    )
+    with time_stage("db_commit"):
+        await db.commit()
+
+
+def _analyze_metadata(fetch: dict[str, Any]) -> ReportResult:
+    """The analyzer on tree paths, key files and workflows only: no blob downloads, no code analysis."""
+    with time_stage("quick_analyze"):
+        return analyze(fetch, content_by_path={})
+
+
+async def _quick_analyze_into(
+    db: AsyncSession, report: Report, repo_url: str, trace: Trace | None
+) -> tuple[dict[str, Any], CostEstimate] | None:
+    """Give the pending report a provisional score from metadata and commit it.
+
+    The report stays pending, so it is never cached as final; its findings
+    carry "provisional": true and the "eta" of the full analysis until that
+    analysis replaces them. Returns the fetch result and predicted cost for
+    it, or None if fetching failed and the report is now failed.
+    """
+    with ANALYSES_IN_FLIGHT.track_inprogress(), recording(trace):
+        fetch = await _fetch_or_fail(db, report, repo_url)
+        if fetch is None:
+            return None
+        result = await run_in_threadpool(_analyze_metadata, fetch)
+        profile = AnalysisProfile.from_dict(report.analysis_profile)
+        cost = await run_in_threadpool(estimate_cost, fetch, profile)
+        eta = ANALYSIS_ADMISSION.eta(cost.total_seconds)
+        with time_stage("serialize"):
+            report.overall_score = result.overall_score
+            report.findings_v2 = {
+                **_serialize_report_result(result),
+                "provisional": True,
+                "eta": {
+                    "seconds": eta,
+                    "at": (datetime.now(timezone.utc) + timedelta(seconds=eta)).isoformat(),
+                    "estimate": cost.as_dict(),
+                },
+            }
+            report.repo_owner = fetch.get("owner")
+            report.repo_name = fetch.get("name")
+        with time_stage("db_commit"):
+            await db.commit()
+    return fetch, cost
+
+
+async def _upgrade_report(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    report_id: uuid.UUID,
+    repo_url: str,
+    fetch: dict[str, Any],
+    trace: Trace | None,
+    cost: float | None = None,
+) -> None:
+    """Background task after a quick scan: run the full analysis and finalize the same report.
+
+    Nobody is waiting on the response, so any failure marks the report
+    failed; otherwise it would stay pending and provisional forever.
+    """
+    async with sessionmaker() as db:
+        report = await db.get(Report, report_id)
+        if report is None or report.status != "pending":
+            return
+        # Already accepted, so it waits for a slot however long the queue is.
+        async with ANALYSIS_ADMISSION.admitted(block=True, cost=cost):
+            try:
+                await _run_analysis(db, report, repo_url, fetch, trace)
+            except Exception as e:
+                await db.rollback()
+                await db.refresh(report)
+                await _fail_into(db, report, e)
+                await _store_trace(db, report, repo_url, trace)
+
+
+async def _keyset_page(
+    db: AsyncSession, stmt: Select, limit: int, cursor: uuid.UUID | None, response: Response
+) -> list[Any]:
+    """Run stmt with (created_at, id) keyset pagination, newest first, and set X-Next-Cursor.
+
+    The cursor row's created_at is resolved in SQL so the comparison uses the
+    stored value exactly.
+    """
+    if cursor is not None:
+        anchor = select(Report.created_at).where(Report.id == cursor).scalar_subquery()
+        stmt = stmt.where(tuple_(Report.created_at, Report.id) < tuple_(anchor, literal(cursor, Report.id.type)))
+    stmt = stmt.order_by(Report.created_at.desc(), Report.id.desc()).limit(limit + 1)
+    rows = list((await db.execute(stmt)).all())
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = str(rows[-1].id)
+    return rows
+
+
+@router.get("/reports/search")
+async def search_reports(
+    response: Response,
+    owner: str | None = Query(None, description="Repository owner (case-insensitive)"),
+    repo: str | None = Query(None, description="Repository name (case-insensitive)"),
+    status: Literal["pending", "done", "failed"] | None = Query(None),
+    min_score: int | None = Query(None, ge=0, le=100),
+    max_score: int | None = Query(None, ge=0, le=100),
+    created_after: datetime | None = Query(None, description="Inclusive lower bound on created_at"),
+    created_before: datetime | None = Query(None, description="Exclusive upper bound on created_at"),
+    failing_check: str | None = Query(None, description="Only reports where this check id has status fail"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: uuid.UUID | None = Query(None, description="Resume after this report id (the previous page's X-Next-Cursor)"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    # Every filter maps to an indexed column or to report_failed_checks, so
+    # no findings document is read.
+    q = select(*SEARCH_COLUMNS)
+    if owner:
+        q = q.where(func.lower(Report.repo_owner) == owner.lower())
+    if repo:
+        q = q.where(func.lower(Report.repo_name) == repo.lower())
+    if status:
+        q = q.where(Report.status == status)
+    if min_score is not None:
+        q = q.where(Report.overall_score >= min_score)
+    if max_score is not None:
+        q = q.where(Report.overall_score <= max_score)
+    if created_after is not None:
+        q = q.where(Report.created_at >= created_after)
+    if created_before is not None:
+        q = q.where(Report.created_at < created_before)
+    if failing_check:
+        q = q.where(
+            exists().where(
+                ReportFailedCheck.report_id == Report.id,
+                ReportFailedCheck.check_id == failing_check,
             )
-        except Exception:
-            pass
-
-    result: ReportResult = analyze(fetch, content_by_path=content_by_path)
-    legacy_payload, structured_payload = _serialize_report_result(result)
-    report.status = "done"
-    report.overall_score = result.overall_score
-    report.findings_json = legacy_payload
-    report.findings_v2 = structured_payload
-    report.repo_owner = fetch.get("owner")
-    report.repo_name = fetch.get("name")
-    db.commit()
+        )
+    rows = await _keyset_page(db, q, limit, cursor, response)
+    return [
+        {
+            **_report_to_list_item(r),
+            "repo_owner": r.repo_owner,
+            "repo_name": r.repo_name,
+            "status": r.status,
+        }
+        for r in rows
+    ]
+
+
+async def _projected_report(
+    db: AsyncSession, report_id: uuid.UUID, fields: str, v: int, if_none_match: str | None
+) -> Response:
+    """Only the requested columns and findings keys are selected; the rest of the document stays in the database."""
+    names, keys = _parse_fields(fields)
+    variant = _variant_tag("f", ",".join(names + [f"findings_json.{k}" for k in keys]))
+    not_modified = await _not_modified(db, report_id, if_none_match, v, variant)
+    if not_modified is not None:
+        return not_modified
+
+    columns = [DETAIL_FIELDS[n].label(n) for n in names]
+    dialect = db.get_bind().dialect.name
+    columns += [_findings_key_expr(dialect, k).label(f"findings_{k}") for k in keys]
+    row = (
+        await db.execute(select(Report.body_etag, *columns).where(Report.id == report_id))
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    detail = {n: _format_field(n, row._mapping[n]) for n in names}
+    if keys:
+        # Keys absent from the stored document are omitted.
+        values = {k: row._mapping[f"findings_{k}"] for k in keys}
+        detail["findings_json"] = {k: val for k, val in values.items() if val is not None}
+    headers = None
+    if row.body_etag:
+        headers = {"ETag": _etag_for(row.body_etag, v, variant), "Cache-Control": CACHE_CONTROL_IMMUTABLE}
+    if v == 2:
+        return JSONResponse(detail, headers=headers)
+    return _legacy_response(detail, headers=headers)
+
+
+EXPORT_BATCH_ROWS = 100
+
+
+def _unless_body(column: Any) -> Any:
+    """column, but NULL on rows that have a stored body (which already contains it)."""
+    return type_coerce(case((Report.body_v2.is_(None), column), else_=None), column.type)
+
+
+EXPORT_COLUMNS = (
+    Report.id,
+    Report.repo_url,
+    Report.repo_owner,
+    Report.repo_name,
+    Report.commit_sha,
+    Report.status,
+    Report.overall_score,
+    Report.created_at,
+    Report.updated_at,
+    _unless_body(Report.analysis_profile).label("analysis_profile"),
+    Report.body_v2,
+    Report.body_encoding,
+    Report.body_dict_id,
+    _unless_body(Report.findings_v2).label("findings_v2"),
+    _unless_body(Report.findings_json).label("findings_json"),
+)
 
-    return AnalyzeResponse(report_id=report_id)
+
+async def _export_line(db: AsyncSession, r: Any, v: int) -> bytes:
+    """One NDJSON line: the report exactly as GET /api/reports/{id}?v= returns it."""
+    if r.body_v2 is not None:
+        body = decode_body(r.body_v2, r.body_encoding, await _dictionary(db, r.body_dict_id))
+        if v == 2:
+            return body + b"\n"
+        detail = json.loads(body)
+    else:
+        detail = _report_to_detail(r)
+        if v == 2:
+            return _encode_body(detail) + b"\n"
+    return "".join(iter_legacy_detail(detail)).encode("utf-8") + b"\n"
+
+
+async def _iter_export(
+    sessionmaker: async_sessionmaker[AsyncSession], stmt: Select, v: int
+) -> AsyncIterator[bytes]:
+    # A server-side cursor fetched EXPORT_BATCH_ROWS at a time: memory stays
+    # bounded by one batch however many reports match. Each batch is one chunk.
+    async with sessionmaker() as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_ROWS))
+        async for rows in result.partitions():
+            yield b"".join([await _export_line(db, r, v) for r in rows])
+
+
+@router.get("/reports/export")
+async def export_reports(
+    status: Literal["pending", "done", "failed"] | None = Query(None),
+    created_after: datetime | None = Query(None, description="Inclusive lower bound on created_at"),
+    created_before: datetime | None = Query(None, description="Exclusive upper bound on created_at"),
+    cursor: uuid.UUID | None = Query(None, description="Resume after this report id (the last id received)"),
+    v: int = Query(1, ge=1, le=2, description="Recommendation shape version, as for GET /api/reports/{id}"),
+    sessionmaker: async_sessionmaker[AsyncSession] = Depends(get_async_sessionmaker),
+):
+    """Every matching report as NDJSON, oldest first, streamed with chunked transfer."""
+    q = select(*EXPORT_COLUMNS)
+    if status:
+        q = q.where(Report.status == status)
+    if created_after is not None:
+        q = q.where(Report.created_at >= created_after)
+    if created_before is not None:
+        q = q.where(Report.created_at < created_before)
+    if cursor is not None:
+        async with sessionmaker() as db:
+            found = (await db.execute(select(Report.id).where(Report.id == cursor))).first()
+        if found is None:
+            # An empty export here would look like "nothing new" to a resuming client.
+            raise HTTPException(status_code=400, detail="Unknown cursor")
+        anchor = select(Report.created_at).where(Report.id == cursor).scalar_subquery()
+        q = q.where(tuple_(Report.created_at, Report.id) > tuple_(anchor, literal(cursor, Report.id.type)))
+    q = q.order_by(Report.created_at, Report.id)
+    return StreamingResponse(_iter_export(sessionmaker, q, v), media_type="application/x-ndjson")
+
+
+@router.get("/reports/{report_id}/sections/{name}")
+async def get_report_section(
+    report_id: uuid.UUID,
+    name: str,
+    request: Request,
+    v: int = Query(1, ge=1, le=2, description="Recommendation shape version: 1=legacy strings, 2=structured what/where/why/how dicts"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """One findings section (e.g. "Secrets Safety"), extracted in SQL."""
+    variant = _variant_tag("s", name)
+    not_modified = await _not_modified(db, report_id, request.headers.get("if-none-match"), v, variant)
+    if not_modified is not None:
+        return not_modified
+
+    section = _section_expr(db.get_bind().dialect.name, name).label("section")
+    row = (await db.execute(select(Report.body_etag, section).where(Report.id == report_id))).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    if row.section is None:
+        raise HTTPException(status_code=404, detail="Section not found")
+    headers = None
+    if row.body_etag:
+        headers = {"ETag": _etag_for(row.body_etag, v, variant), "Cache-Control": CACHE_CONTROL_IMMUTABLE}
+    if v == 2:
+        return JSONResponse(row.section, headers=headers)
+    return StreamingResponse(
+        buffered(iter_legacy_section(row.section)),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+_diff_cache = DiffCache()
+
+DIFF_COLUMNS = (
+    Report.id,
+    Report.status,
+    Report.repo_owner,
+    Report.repo_name,
+    Report.overall_score,
+    Report.created_at,
+    Report.body_etag,
+)
+
+
+def _diff_side(r: Any) -> dict:
+    return {
+        "id": str(r.id),
+        "overall_score": r.overall_score,
+        "created_at": _format_field("created_at", r.created_at),
+    }
+
+
+def _diff_etag(base_etag: str, head_etag: str) -> str:
+    return f'"{hashlib.sha256(f"{base_etag}:{head_etag}".encode("utf-8")).hexdigest()[:32]}-d"'
+
+
+@router.get("/reports/{base_id}/diff/{head_id}")
+async def diff_reports(
+    base_id: uuid.UUID,
+    head_id: uuid.UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """What changed between two finished analyses of the same repository."""
+    rows = {
+        r.id: r
+        for r in (await db.execute(select(*DIFF_COLUMNS).where(Report.id.in_([base_id, head_id])))).all()
+    }
+    base, head = rows.get(base_id), rows.get(head_id)
+    if base is None or head is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    for r in (base, head):
+        if r.status != "done":
+            raise HTTPException(
+                status_code=409, detail=f"Report {r.id} is {r.status}; only done reports can be diffed"
+            )
+    repos = {((r.repo_owner or "").lower(), (r.repo_name or "").lower()) for r in (base, head)}
+    if len(repos) > 1:
+        raise HTTPException(status_code=400, detail="Reports are for different repositories")
+
+    # Finished reports are immutable, so the diff of two digests never changes.
+    key = (base.body_etag, head.body_etag) if base.body_etag and head.body_etag else None
+    headers = None
+    if key is not None:
+        etag = _diff_etag(*key)
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL_IMMUTABLE}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        cached = _diff_cache.get(key)
+        record_cache("diff", cached is not None)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json", headers=headers)
+
+    findings = dict(
+        (await db.execute(
+            select(Report.id, _FINDINGS.label("findings")).where(Report.id.in_([base_id, head_id]))
+        )).all()
+    )
+    body = _encode_body(
+        {
+            "base": _diff_side(base),
+            "head": _diff_side(head),
+            **diff_findings(findings.get(base_id), findings.get(head_id)),
+        }
+    )
+    if key is not None:
+        _diff_cache.put(key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/reports/{report_id}")
-def get_report(
+async def get_report(
     report_id: uuid.UUID,
+    request: Request,
     v: int = Query(1, ge=1, le=2, description="Recommendation shape version: 1=legacy strings, 2=structured what/where/why/how dicts"),
-    db: Session = Depends(get_db),
+    fields: str | None = Query(
+        None,
+        description="Comma-separated fields to return, e.g. id,status,findings_json.category_scores",
+    ),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    report = db.query(Report).filter(Report.id == report_id).first()
+    if_none_match = request.headers.get("if-none-match")
+    if fields is not None:
+        return await _projected_report(db, report_id, fields, v, if_none_match)
+
+    # Fast path: terminal reports carry a precomputed v2 body. A conditional
+    # GET only reads the digest; the findings JSONB is never touched.
+    gzip_ok = v == 2 and accepts_gzip(request.headers.get("accept-encoding"))
+    not_modified = await _not_modified(db, report_id, if_none_match, v, gzip_ok=gzip_ok)
+    if not_modified is not None:
+        return not_modified
+    row = (
+        await db.execute(
+            select(Report.body_etag, Report.body_v2, Report.body_encoding, Report.body_dict_id)
+            .where(Report.id == report_id)
+        )
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Report not found")
+    if row.body_etag and row.body_v2 is not None:
+        headers = {"ETag": _etag_for(row.body_etag, v), "Cache-Control": CACHE_CONTROL_IMMUTABLE}
+        if row.body_encoding is None:
+            if v == 2:
+                return Response(content=row.body_v2, media_type="application/json", headers=headers)
+            return _legacy_response(json.loads(row.body_v2), headers=headers)
+
+        headers["Vary"] = "Accept-Encoding"
+        if gzip_ok and row.body_encoding == "gzip":
+            # Stored bytes go out untouched; the client decompresses.
+            headers["ETag"] = _etag_for(row.body_etag, v, "-gzip")
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=row.body_v2, media_type="application/json", headers=headers)
+        zdict = await _dictionary(db, row.body_dict_id)
+        if v == 2:
+            return StreamingResponse(
+                iter_decoded(row.body_v2, row.body_encoding, zdict),
+                media_type="application/json",
+                headers=headers,
+            )
+        return _legacy_response(
+            json.loads(decode_body(row.body_v2, row.body_encoding, zdict)), headers=headers
+        )
+
+    # Rows written before bodies were precomputed, or still pending.
+    report = await db.get(Report, report_id)
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
-    return _report_to_detail(report, version=v)
+    detail = _report_to_detail(report)
+    return detail if v == 2 else _legacy_response(detail)
 
 
 @router.get("/reports")
-def list_reports(
+async def list_reports(
+    response: Response,
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db),
+    cursor: uuid.UUID | None = Query(None, description="Resume after this report id (the previous page's X-Next-Cursor)"),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    rows = (
-        db.query(Report)
-        .order_by(Report.created_at.desc())
-        .limit(limit)
-        .all()
-    )
+    # Only the list columns are selected, so findings documents are never read.
+    rows = await _keyset_page(db, select(*LIST_COLUMNS), limit, cursor, response)
     return [_report_to_list_item(r) for r in rows]
@@ -1,18 +1,41 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy import text
-from sqlalchemy.orm import Session
-
-from app.core.database import get_db
-
-router = APIRouter()
-
-
-@router.get("/health")
-def health():
-    return {"status": "ok"}
-
-
-@router.get("/db-check")
-def db_check(db: Session = Depends(get_db)):
-    db.execute(text("SELECT 1"))
-    return {"status": "ok"}
+from fastapi import APIRouter, Depends, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.admission import ANALYSIS_ADMISSION
+from app.core.database import get_async_db
+from app.core.metrics import render as render_metrics
+from app.services.cost_model import COST_MODEL
+
+router = APIRouter()
+
+
+@router.get("/health")
+def health():
+    return {"status": "ok", "admission": ANALYSIS_ADMISSION.status(), "cost_model": COST_MODEL.status()}
+
+
+@router.get("/ready")
+def ready():
+    """503 while the analysis queue is full, so a load balancer can route elsewhere."""
+    admission = ANALYSIS_ADMISSION.status()
+    if admission["saturated"]:
+        return JSONResponse(
+            {"status": "saturated", "admission": admission},
+            status_code=503,
+            headers={"Retry-After": str(admission["retry_after_s"])},
+        )
+    return {"status": "ready", "admission": admission}
+
+
+@router.get("/db-check")
+async def db_check(db: AsyncSession = Depends(get_async_db)):
+    await db.execute(text("SELECT 1"))
+    return {"status": "ok"}
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -0,0 +1,23 @@
+"""Operator commands. Run `python -m app.cli --help` from backend/."""
+
+import argparse
+from collections.abc import Sequence
+
+from app.cli import analyze, export, reanalyze, scaffolds, storage
+
+# Each command module exposes register(subparsers), which adds its
+# subcommands and sets `func` on them.
+COMMANDS = (storage, export, analyze, reanalyze, scaffolds)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for module in COMMANDS:
+        module.register(sub)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args) or 0
@@ -0,0 +1,67 @@
+"""Analyze local directories, zip archives, git repositories or GitHub URLs offline."""
+
+import argparse
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import replace
+from typing import Any
+
+from app.core.analysis_profiles import PROFILES, SAMPLING_MODES, STANDARD, AnalysisProfile
+from app.services.local_repo import report_json
+
+
+def analyze_one(source: str, ref: str | None = None, profile: AnalysisProfile = STANDARD) -> dict[str, Any]:
+    """report_json(source), or {"source", "error"} if it cannot be read."""
+    try:
+        return report_json(source, ref, profile)
+    except Exception as e:
+        return {"source": source, "ref": ref, "error": f"{type(e).__name__}: {e}"}
+
+
+def _analyze_args(item: tuple[str, str | None, AnalysisProfile]) -> dict[str, Any]:
+    return analyze_one(*item)
+
+
+def _analyze_command(args: argparse.Namespace) -> int:
+    profile = PROFILES[args.profile]
+    if args.sampling:
+        profile = replace(profile, sampling=args.sampling)
+    items = [(source, args.ref, profile) for source in args.sources]
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    failed = 0
+    parallel = args.jobs > 1 and len(items) > 1
+    try:
+        with ProcessPoolExecutor(max_workers=args.jobs) if parallel else nullcontext() as pool:
+            results = pool.map(_analyze_args, items) if pool else map(_analyze_args, items)
+            try:
+                # One JSON document per line, in argument order.
+                for report in results:
+                    failed += "error" in report
+                    json.dump(report, out, indent=2 if args.pretty else None, ensure_ascii=False)
+                    out.write("\n")
+                    out.flush()
+            except BaseException:
+                # Do not start the remaining sources just to discard them.
+                if pool is not None:
+                    pool.shutdown(cancel_futures=True)
+                raise
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if failed:
+        print(f"{failed} of {len(items)} sources failed.", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def register(sub: argparse._SubParsersAction) -> None:
+    p = sub.add_parser("analyze", help="Analyze local paths, zip files or GitHub URLs and print JSON reports")
+    p.add_argument("sources", nargs="+", help="Directory, .zip, git repository or https://github.com/owner/repo")
+    p.add_argument("--ref", help="For git repositories: analyze this commit, branch or tag instead of the working tree")
+    p.add_argument("--profile", choices=list(PROFILES), default=STANDARD.name, help="Analysis profile (default standard)")
+    p.add_argument("--sampling", choices=SAMPLING_MODES, help="Code file sampling: priority (path order) or stratified (random, with estimates)")
+    p.add_argument("--jobs", "-j", type=int, default=1, help="Analyze this many sources in parallel processes")
+    p.add_argument("--output", "-o", help="Write to this file instead of stdout")
+    p.add_argument("--pretty", action="store_true", help="Indent the JSON")
+    p.set_defaults(func=_analyze_command)
@@ -0,0 +1,81 @@
+"""Pull reports from GET /api/reports/export into an NDJSON file, resumably."""
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+import httpx
+
+DEFAULT_API_URL = os.getenv("SHIPCHECK_API_URL", "http://localhost:8000")
+_TAIL_BLOCK_BYTES = 64 * 1024
+
+
+def resume_cursor(path: Path) -> str | None:
+    """Id of the last complete line in path, after cutting off any partial line a dropped
+    connection left behind. None if the file holds no complete line."""
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        tail = b""
+        while pos > 0:
+            step = min(_TAIL_BLOCK_BYTES, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+            last_newline = tail.rfind(b"\n")
+            if last_newline == -1:
+                continue
+            f.truncate(pos + last_newline + 1)
+            previous = tail.rfind(b"\n", 0, last_newline)
+            if previous != -1 or pos == 0:
+                return json.loads(tail[previous + 1:last_newline])["id"]
+        f.truncate(0)
+        return None
+
+
+def export(client: httpx.Client, out: Path, params: dict[str, str], resume: bool = False) -> int:
+    """Stream the export into out and return how many reports were written.
+
+    With resume, appends after the last complete line of an existing file.
+    """
+    params = {k: v for k, v in params.items() if v is not None}
+    mode = "wb"
+    if resume and out.exists():
+        cursor = resume_cursor(out)
+        if cursor is not None:
+            params["cursor"] = cursor
+        mode = "ab"
+    written = 0
+    with client.stream("GET", "/api/reports/export", params=params) as resp:
+        resp.raise_for_status()
+        with open(out, mode) as f:
+            for chunk in resp.iter_bytes():
+                f.write(chunk)
+                written += chunk.count(b"\n")
+    return written
+
+
+def _export_command(args: argparse.Namespace) -> int:
+    params = {
+        "status": args.status,
+        "created_after": args.created_after,
+        "created_before": args.created_before,
+        "v": str(args.v),
+    }
+    with httpx.Client(base_url=args.api_url, timeout=httpx.Timeout(30.0, read=None)) as client:
+        written = export(client, Path(args.out), params, resume=args.resume)
+    print(f"Wrote {written} reports to {args.out}.")
+    return 0
+
+
+def register(sub: argparse._SubParsersAction) -> None:
+    p = sub.add_parser("export", help="Export reports as NDJSON from a running API")
+    p.add_argument("out", help="Output file (NDJSON, one report per line)")
+    p.add_argument("--api-url", default=DEFAULT_API_URL)
+    p.add_argument("--status", choices=("pending", "done", "failed"))
+    p.add_argument("--created-after", help="ISO date or datetime, inclusive")
+    p.add_argument("--created-before", help="ISO date or datetime, exclusive")
+    p.add_argument("--v", type=int, choices=(1, 2), default=1, help="Recommendation shape version")
+    p.add_argument("--resume", action="store_true", help="Continue an interrupted export into the same file")
+    p.set_defaults(func=_export_command)
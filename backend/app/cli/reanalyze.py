@@ -0,0 +1,140 @@
+"""Re-run the current analyzer on archived analysis inputs (app.services.snapshot_archive)."""
+
+import argparse
+import json
+import sys
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.api.reports import _failed_check_ids, _finalize_report, _serialize_report_result
+from app.core.analysis_profiles import AnalysisProfile
+from app.core.config import REPORT_BODY_COMPRESSION, SNAPSHOT_DIR
+from app.core.database import SessionLocal
+from app.models import CompressionDictionary, Report, ReportFailedCheck
+from app.services.analyzer import analyze
+from app.services.snapshot_archive import SnapshotArchive, SnapshotNotFoundError
+
+_archive: SnapshotArchive | None = None
+
+
+def _open(directory: str) -> None:
+    global _archive
+    _archive = SnapshotArchive(directory)
+
+
+def reanalyze(archive: SnapshotArchive, report_id: uuid.UUID) -> dict[str, Any]:
+    """Analyze the snapshot of report_id with the profile it was taken with.
+
+    Returns {report_id, repo_url, repo_owner, repo_name, analysis_profile,
+    overall_score, failed_checks, findings}.
+    """
+    snapshot = archive.load(report_id)
+    profile = AnalysisProfile.from_dict(snapshot.profile)
+    result = analyze(snapshot.fetch, content_by_path=snapshot.content, profile=profile)
+    fetch = snapshot.fetch
+    return {
+        "report_id": str(report_id),
+        "repo_url": snapshot.repo_url,
+        "repo_owner": fetch.get("owner"),
+        "repo_name": fetch.get("name"),
+        "analysis_profile": profile.as_dict(),
+        "overall_score": result.overall_score,
+        "failed_checks": _failed_check_ids(result),
+        "findings": _serialize_report_result(result),
+    }
+
+
+def _reanalyze_one(report_id: uuid.UUID) -> dict[str, Any]:
+    assert _archive is not None
+    try:
+        return reanalyze(_archive, report_id)
+    except SnapshotNotFoundError as e:
+        return {"report_id": str(report_id), "error": str(e.args[0])}
+    except Exception as e:
+        return {"report_id": str(report_id), "error": f"{type(e).__name__}: {e}"}
+
+
+def _newest_dictionary(db: Session) -> tuple[int, bytes] | None:
+    if REPORT_BODY_COMPRESSION != "zdict":
+        return None
+    dict_id = db.execute(select(func.max(CompressionDictionary.id))).scalar()
+    if dict_id is None:
+        return None
+    return dict_id, db.execute(
+        select(CompressionDictionary.data).where(CompressionDictionary.id == dict_id)
+    ).scalar_one()
+
+
+def store(db: Session, line: dict[str, Any], dictionary: tuple[int, bytes] | None = None) -> Report:
+    """Store a reanalysis as a new done report. Stored reports are immutable, so the original stays as is."""
+    report = Report(
+        repo_url=line["repo_url"], repo_owner=line["repo_owner"], repo_name=line["repo_name"], status="done",
+        analysis_profile=line["analysis_profile"],
+    )
+    db.add(report)
+    db.flush()
+    db.refresh(report)
+    report.overall_score = line["overall_score"]
+    report.findings_v2 = line["findings"]
+    _finalize_report(report, dictionary)
+    db.add_all(ReportFailedCheck(report_id=report.id, check_id=c) for c in line["failed_checks"])
+    db.commit()
+    return report
+
+
+def _reanalyze_command(args: argparse.Namespace) -> int:
+    directory = args.snapshot_dir or SNAPSHOT_DIR
+    if not directory:
+        print("Set SNAPSHOT_DIR or pass --snapshot-dir.", file=sys.stderr)
+        return 2
+    _open(directory)
+    assert _archive is not None
+    try:
+        ids = [uuid.UUID(r) for r in args.report_ids] or _archive.report_ids()
+    except ValueError as e:
+        print(f"Invalid report id: {e}", file=sys.stderr)
+        return 2
+
+    db = SessionLocal() if args.save else None
+    dictionary = _newest_dictionary(db) if db is not None else None
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    failed = 0
+    pool = ProcessPoolExecutor(args.jobs, initializer=_open, initargs=(directory,)) if args.jobs > 1 else None
+    try:
+        results = pool.map(_reanalyze_one, ids, chunksize=8) if pool else map(_reanalyze_one, ids)
+        for line in results:
+            if "error" in line:
+                failed += 1
+            elif db is not None:
+                previous = db.get(Report, uuid.UUID(line["report_id"]))
+                line["previous_score"] = previous.overall_score if previous is not None else None
+                line["new_report_id"] = str(store(db, line, dictionary).id)
+            if not args.full:
+                line.pop("findings", None)
+            out.write(json.dumps(line, ensure_ascii=False) + "\n")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if db is not None:
+            db.close()
+        if out is not sys.stdout:
+            out.close()
+        _archive.close()
+    if failed:
+        print(f"{failed} of {len(ids)} snapshots failed.", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def register(sub: argparse._SubParsersAction) -> None:
+    p = sub.add_parser("reanalyze", help="Re-run analysis on archived inputs and print JSON lines")
+    p.add_argument("report_ids", nargs="*", help="Reports to re-run (default: every snapshot, oldest first)")
+    p.add_argument("--snapshot-dir", help="Archive directory (default: $SNAPSHOT_DIR)")
+    p.add_argument("--jobs", "-j", type=int, default=1, help="Analyze in this many processes")
+    p.add_argument("--full", action="store_true", help="Include the findings document in each line")
+    p.add_argument("--save", action="store_true", help="Store each result as a new report")
+    p.add_argument("--output", "-o", help="Write to this file instead of stdout")
+    p.set_defaults(func=_reanalyze_command)
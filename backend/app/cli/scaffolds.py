@@ -0,0 +1,87 @@
+"""Build the index of known scaffold and vendored-library files (app.services.scaffold_index)."""
+
+import argparse
+import sys
+
+from app.core.config import SCAFFOLD_INDEX
+from app.core.repo_limits import MAX_FILE_BYTES, is_text_candidate
+from app.services.analyzer import file_metrics
+from app.services.local_repo import LocalSourceError, open_tree
+from app.services.scaffold_index import ScaffoldIndex, ScaffoldIndexError
+
+
+def add_scaffold(index: ScaffoldIndex, name: str, source: str, ref: str | None = None) -> int:
+    """Index every text file of a template checkout (directory, zip or git repository) as scaffold name."""
+    tree, close = open_tree(source, ref)
+    try:
+        blobs = [b for b in tree.blobs if b["sha"] and is_text_candidate(b["path"])]
+        content = {
+            b["path"]: tree.read(b["sha"])[:MAX_FILE_BYTES].decode("utf-8", errors="replace")
+            for b in blobs if b["size"] <= MAX_FILE_BYTES
+        }
+    finally:
+        if close is not None:
+            close()
+    return index.add(name, source, blobs, file_metrics(content))
+
+
+def _index_path(args: argparse.Namespace) -> str | None:
+    path = args.index or SCAFFOLD_INDEX
+    if not path:
+        print("Set SCAFFOLD_INDEX or pass --index.", file=sys.stderr)
+    return path
+
+
+def _add_command(args: argparse.Namespace) -> int:
+    path = _index_path(args)
+    if not path:
+        return 2
+    try:
+        index = ScaffoldIndex.load(path)
+        count = add_scaffold(index, args.name, args.source, args.ref)
+    except (LocalSourceError, ScaffoldIndexError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    index.save(path)
+    print(f"Indexed {count} files as {args.name}; {len(index)} known blobs in {len(index.scaffolds)} scaffolds.")
+    return 0
+
+
+def _remove_command(args: argparse.Namespace) -> int:
+    path = _index_path(args)
+    if not path:
+        return 2
+    index = ScaffoldIndex.load(path)
+    if not index.remove(args.name):
+        print(f"No scaffold named {args.name!r}.", file=sys.stderr)
+        return 1
+    index.save(path)
+    return 0
+
+
+def _list_command(args: argparse.Namespace) -> int:
+    path = _index_path(args)
+    if not path:
+        return 2
+    index = ScaffoldIndex.load(path)
+    for name, meta in sorted(index.scaffolds.items()):
+        print(f"{name}\t{meta['files']}\t{meta['source']}\t{meta['added_at']}")
+    return 0
+
+
+def register(sub: argparse._SubParsersAction) -> None:
+    p = sub.add_parser("scaffold-add", help="Index a template or vendored library checkout as known files")
+    p.add_argument("name", help="Scaffold name, e.g. create-next-app@14")
+    p.add_argument("source", help="Directory, .zip or git repository of the unmodified template")
+    p.add_argument("--ref", help="For git repositories: index this commit, branch or tag")
+    p.add_argument("--index", help="Index file (default: $SCAFFOLD_INDEX)")
+    p.set_defaults(func=_add_command)
+
+    p = sub.add_parser("scaffold-remove", help="Drop a scaffold from the index")
+    p.add_argument("name")
+    p.add_argument("--index", help="Index file (default: $SCAFFOLD_INDEX)")
+    p.set_defaults(func=_remove_command)
+
+    p = sub.add_parser("scaffold-list", help="List indexed scaffolds: name, files, source, added at")
+    p.add_argument("--index", help="Index file (default: $SCAFFOLD_INDEX)")
+    p.set_defaults(func=_list_command)
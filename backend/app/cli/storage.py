@@ -0,0 +1,120 @@
+"""Report body compression: train a dictionary, (re)compress stored bodies."""
+
+import argparse
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models import CompressionDictionary, Report
+from app.services.report_storage import CODECS, decode_body, encode_body, train_dictionary
+
+DEFAULT_TRAINING_SAMPLES = 500
+DEFAULT_BATCH_SIZE = 200
+
+
+def _dictionaries(db: Session) -> dict[int, bytes]:
+    return dict(db.execute(select(CompressionDictionary.id, CompressionDictionary.data)).all())
+
+
+def train(db: Session, samples: int = DEFAULT_TRAINING_SAMPLES) -> CompressionDictionary | None:
+    """Train a dictionary on the newest stored bodies and store it. None if there are no bodies."""
+    dictionaries = _dictionaries(db)
+    rows = db.execute(
+        select(Report.body_v2, Report.body_encoding, Report.body_dict_id)
+        .where(Report.body_v2.is_not(None))
+        .order_by(Report.created_at.desc())
+        .limit(samples)
+    ).all()
+    if not rows:
+        return None
+    data = train_dictionary(
+        decode_body(r.body_v2, r.body_encoding, dictionaries.get(r.body_dict_id)) for r in rows
+    )
+    entry = CompressionDictionary(data=data, sample_count=len(rows))
+    db.add(entry)
+    db.commit()
+    return entry
+
+
+def compress_bodies(
+    db: Session, codec: str, batch_size: int = DEFAULT_BATCH_SIZE
+) -> tuple[int, int, int]:
+    """Re-encode every stored body not already in the target encoding.
+
+    "zdict" targets the newest dictionary (gzip if none exists yet). Walks
+    the table by id in batches, committing each, so it can be interrupted
+    and rerun. Returns (rows converted, stored bytes before, after).
+    """
+    dictionaries = _dictionaries(db)
+    target = None
+    if codec == "zdict" and dictionaries:
+        dict_id = max(dictionaries)
+        target = (dict_id, dictionaries[dict_id])
+
+    stmt = select(Report.id, Report.body_v2, Report.body_encoding, Report.body_dict_id).where(
+        Report.body_v2.is_not(None)
+    )
+    if codec == "none":
+        stmt = stmt.where(Report.body_encoding.is_not(None))
+    elif target is not None:
+        stmt = stmt.where(
+            or_(
+                Report.body_encoding.is_(None),
+                Report.body_encoding != "zdict",
+                Report.body_dict_id != target[0],
+            )
+        )
+    else:
+        stmt = stmt.where(or_(Report.body_encoding.is_(None), Report.body_encoding != "gzip"))
+
+    converted = before = after = 0
+    last_id = None
+    while True:
+        page = stmt if last_id is None else stmt.where(Report.id > last_id)
+        rows = db.execute(page.order_by(Report.id).limit(batch_size)).all()
+        if not rows:
+            break
+        for r in rows:
+            raw = decode_body(r.body_v2, r.body_encoding, dictionaries.get(r.body_dict_id))
+            stored, encoding, dict_id = encode_body(raw, codec, target)
+            db.execute(
+                update(Report)
+                .where(Report.id == r.id)
+                .values(body_v2=stored, body_encoding=encoding, body_dict_id=dict_id)
+            )
+            converted += 1
+            before += len(r.body_v2)
+            after += len(stored)
+        db.commit()
+        last_id = rows[-1].id
+    return converted, before, after
+
+
+def _train_command(args: argparse.Namespace) -> int:
+    with SessionLocal() as db:
+        entry = train(db, args.samples)
+        if entry is None:
+            print("No stored report bodies to train on.")
+            return 1
+        print(f"Stored dictionary {entry.id}: {len(entry.data)} bytes from {entry.sample_count} bodies.")
+    return 0
+
+
+def _compress_command(args: argparse.Namespace) -> int:
+    with SessionLocal() as db:
+        converted, before, after = compress_bodies(db, args.codec, args.batch_size)
+        total = db.execute(select(func.count()).where(Report.body_v2.is_not(None))).scalar()
+    print(f"Re-encoded {converted} of {total} bodies as {args.codec}: {before} -> {after} bytes.")
+    return 0
+
+
+def register(sub: argparse._SubParsersAction) -> None:
+    p = sub.add_parser("train-dictionary", help="Train a zdict dictionary from stored report bodies")
+    p.add_argument("--samples", type=int, default=DEFAULT_TRAINING_SAMPLES)
+    p.set_defaults(func=_train_command)
+
+    p = sub.add_parser("compress-bodies", help="Re-encode stored report bodies")
+    p.add_argument("--codec", choices=CODECS, required=True)
+    p.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    p.set_defaults(func=_compress_command)
@@ -0,0 +1,211 @@
+"""Global admission control for analyses: a concurrency limit with a bounded, cheapest-first wait queue.
+
+At most max_concurrent analyses run at once per process. Further requests
+wait, up to max_queue of them and for at most queue_timeout seconds each.
+A request that finds the queue full, or times out in it, is rejected with a
+Retry-After estimate: the time for the queue ahead of it to drain. The
+per-IP rate limit (app.core.rate_limit) bounds one client; this bounds all
+of them.
+
+Each request says what it is expected to cost, in seconds (see
+app.services.cost_model); without an estimate, the moving average of recent
+analysis durations stands in. A freed slot goes to the waiter with the
+lowest cost - aging * seconds waited, so small repositories are not stuck
+behind a large one, and a large one moves up the longer it waits. Because
+every waiter ages at the same rate, that order is fixed at enqueue time
+(cost + aging * enqueue time) and the queue is a heap.
+
+State lives on the event loop and is per process: with several workers,
+each admits its own max_concurrent.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.config import (
+    ANALYZE_MAX_CONCURRENCY,
+    ANALYZE_MAX_QUEUE,
+    ANALYZE_QUEUE_AGING,
+    ANALYZE_QUEUE_TIMEOUT,
+)
+from app.core.metrics import ADMISSION_REJECTIONS, ANALYSES_QUEUED
+
+# Moving average of analysis durations: starting guess and weight of each new one.
+INITIAL_DURATION_ESTIMATE = 5.0
+DURATION_SMOOTHING = 0.2
+MAX_RETRY_AFTER = 300
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass(order=True)
+class _Waiter:
+    key: float
+    seq: int
+    cost: float = field(compare=False)
+    future: asyncio.Future[None] = field(compare=False)
+    queued: bool = field(default=True, compare=False)
+
+
+class AdmissionController:
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float, aging: float = 1.0):
+        self.max_concurrent = max_concurrent  # <= 0 disables admission control
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.aging = aging
+        self.running = 0
+        self.admitted_total = 0
+        self.rejected_total = 0
+        self.avg_duration = INITIAL_DURATION_ESTIMATE
+        self._heap: list[_Waiter] = []
+        self._queued = 0
+        self._queued_cost = 0.0
+        self._seq = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    def _cost(self, cost: float | None) -> float:
+        return self.avg_duration if cost is None else max(0.0, cost)
+
+    def _key(self, cost: float) -> float:
+        return cost + self.aging * time.monotonic()
+
+    def _waiting_ahead(self, key: float) -> float:
+        """Predicted seconds of queued work that would run before a job with this key."""
+        return sum(w.cost for w in self._heap if w.queued and w.key <= key)
+
+    def retry_after(self, cost: float | None = None) -> int:
+        """Seconds until the current queue, plus one more request, should have drained."""
+        if self.max_concurrent <= 0:
+            return 1
+        drain = (self._queued_cost + self._cost(cost)) / self.max_concurrent
+        return max(1, min(MAX_RETRY_AFTER, math.ceil(drain)))
+
+    def eta(self, cost: float | None = None) -> float:
+        """Predicted seconds until a job of this cost, queued now, has finished."""
+        cost = self._cost(cost)
+        if self.max_concurrent <= 0 or (self.running < self.max_concurrent and not self._queued):
+            return round(cost, 1)
+        return round(self._waiting_ahead(self._key(cost)) / self.max_concurrent + cost, 1)
+
+    def saturated(self) -> bool:
+        """True when a new request would be rejected."""
+        return self.max_concurrent > 0 and self.running >= self.max_concurrent and self.queued >= self.max_queue
+
+    def check(self, cost: float | None = None) -> None:
+        """Raise AdmissionRejected now if a new request would find the queue full."""
+        if self.saturated():
+            raise self._reject("queue_full", "Analysis queue is full; retry later", cost)
+
+    def _reject(self, reason: str, message: str, cost: float | None) -> AdmissionRejected:
+        self.rejected_total += 1
+        ADMISSION_REJECTIONS.labels(reason).inc()
+        return AdmissionRejected(message, self.retry_after(cost))
+
+    async def acquire(self, block: bool = False, cost: float | None = None) -> None:
+        """Take a slot, waiting in the queue if all are busy.
+
+        cost is the predicted run time in seconds and orders the queue.
+        Raises AdmissionRejected when the queue is full or the wait exceeds
+        queue_timeout. block=True (background work that has already been
+        accepted) always queues and waits without a timeout.
+        """
+        if self.max_concurrent <= 0:
+            return
+        if self.running < self.max_concurrent and not self._queued:
+            self.running += 1
+            self.admitted_total += 1
+            return
+        if not block and self.queued >= self.max_queue:
+            raise self._reject("queue_full", "Analysis queue is full; retry later", cost)
+
+        waiter = _Waiter(
+            self._key(self._cost(cost)), next(self._seq), self._cost(cost),
+            asyncio.get_running_loop().create_future(),
+        )
+        heapq.heappush(self._heap, waiter)
+        self._queued += 1
+        self._queued_cost += waiter.cost
+        ANALYSES_QUEUED.inc()
+        try:
+            await asyncio.wait({waiter.future}, timeout=None if block else self.queue_timeout)
+        except BaseException:
+            self._leave(waiter)
+            if waiter.future.done() and not waiter.future.cancelled():
+                # The slot was handed over just as the wait was cancelled.
+                self.release()
+            raise
+        if not waiter.future.done():
+            self._leave(waiter)
+            raise self._reject("timeout", "Timed out waiting in the analysis queue; retry later", cost)
+        self.admitted_total += 1
+
+    def _dequeue(self, waiter: _Waiter) -> None:
+        if waiter.queued:
+            waiter.queued = False
+            self._queued -= 1
+            self._queued_cost -= waiter.cost
+            ANALYSES_QUEUED.dec()
+
+    def _leave(self, waiter: _Waiter) -> None:
+        # The entry stays in the heap; release() skips it.
+        self._dequeue(waiter)
+        waiter.future.cancel()
+
+    def release(self, duration: float | None = None) -> None:
+        """Free a slot, handing it straight to the cheapest (aged) waiter if there is one."""
+        if self.max_concurrent <= 0:
+            return
+        if duration is not None:
+            self.avg_duration += DURATION_SMOOTHING * (duration - self.avg_duration)
+        while self._heap:
+            waiter = heapq.heappop(self._heap)
+            if waiter.queued and not waiter.future.done():
+                self._dequeue(waiter)
+                waiter.future.set_result(None)
+                return
+        self.running -= 1
+
+    @asynccontextmanager
+    async def admitted(self, block: bool = False, cost: float | None = None) -> AsyncIterator[None]:
+        await self.acquire(block, cost)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - start)
+
+    def status(self) -> dict[str, Any]:
+        enabled = self.max_concurrent > 0
+        return {
+            "enabled": enabled,
+            "running": self.running,
+            "max_concurrent": self.max_concurrent,
+            "queued": self.queued,
+            "queued_seconds": round(self._queued_cost, 1),
+            "max_queue": self.max_queue,
+            "saturated": self.saturated(),
+            "utilization": round(self.running / self.max_concurrent, 3) if enabled else 0.0,
+            "avg_duration_s": round(self.avg_duration, 3),
+            "retry_after_s": self.retry_after(),
+            "admitted_total": self.admitted_total,
+            "rejected_total": self.rejected_total,
+        }
+
+
+ANALYSIS_ADMISSION = AdmissionController(
+    ANALYZE_MAX_CONCURRENCY, ANALYZE_MAX_QUEUE, ANALYZE_QUEUE_TIMEOUT, ANALYZE_QUEUE_AGING
+)
@@ -0,0 +1,108 @@
+"""Named analysis profiles: how much of a repository one analysis reads, and its thresholds.
+
+A profile bundles the sampling limits (how many blobs and bytes to
+download, how many plain code files to take after docs, CI, manifests,
+entry points and security files) with the complexity thresholds of the
+code analysis. Requests pick a profile by name and may override single
+limits, each checked against a server-side ceiling (PROFILE_CEILINGS), so a
+client can ask for less than "deep" but never for more than the server allows.
+
+The sampling mode decides which code files fill the budget: "priority"
+takes them in path order; "stratified" draws a random sample across
+directories and languages so per-file metrics can be extrapolated to the
+whole tree (app.services.sampling).
+"""
+
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Any
+
+from app.core.config import (
+    ANALYSIS_DEFAULT_PROFILE,
+    ANALYSIS_MAX_FILES_FETCH,
+    ANALYSIS_MAX_TOTAL_BYTES,
+)
+from app.core.repo_limits import MAX_FILES_FETCH, MAX_TOTAL_BYTES
+
+
+class InvalidProfileError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class AnalysisProfile:
+    name: str
+    max_files_fetch: int
+    max_total_bytes: int
+    max_bucket_f: int  # code files (bucket F of candidate_selector) among the candidates
+    complexity_high: int
+    complexity_very_high: int
+    sampling: str = "priority"  # one of SAMPLING_MODES
+
+    def as_dict(self) -> dict[str, Any]:
+        """The JSON stored on the report (reports.analysis_profile)."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> "AnalysisProfile":
+        """The profile stored on a report; STANDARD for rows written before profiles existed."""
+        if not data:
+            return STANDARD
+        known = {f.name for f in fields(cls)}
+        return replace(STANDARD, **{k: v for k, v in data.items() if k in known})
+
+
+QUICK = AnalysisProfile(
+    "quick", max_files_fetch=60, max_total_bytes=1024 * 1024, max_bucket_f=30,
+    complexity_high=10, complexity_very_high=20,
+)
+# The limits every analysis used before profiles existed.
+STANDARD = AnalysisProfile(
+    "standard", max_files_fetch=MAX_FILES_FETCH, max_total_bytes=MAX_TOTAL_BYTES, max_bucket_f=150,
+    complexity_high=10, complexity_very_high=20,
+)
+DEEP = AnalysisProfile(
+    "deep", max_files_fetch=1000, max_total_bytes=20 * 1024 * 1024, max_bucket_f=800,
+    complexity_high=10, complexity_very_high=20,
+)
+SAMPLING_MODES = ("priority", "stratified")
+PROFILES = {p.name: p for p in (QUICK, STANDARD, DEEP)}
+
+# Inclusive (min, max) for each overridable limit. The download limits are
+# capped by configuration so an operator can bound the cost of one analysis.
+PROFILE_CEILINGS: dict[str, tuple[int, int]] = {
+    "max_files_fetch": (1, ANALYSIS_MAX_FILES_FETCH),
+    "max_total_bytes": (1024, ANALYSIS_MAX_TOTAL_BYTES),
+    "max_bucket_f": (0, ANALYSIS_MAX_FILES_FETCH),
+    "complexity_high": (2, 100),
+    "complexity_very_high": (2, 200),
+}
+
+
+def resolve_profile(
+    name: str | None = None, overrides: dict[str, int] | None = None, sampling: str | None = None
+) -> AnalysisProfile:
+    """The named profile (default ANALYSIS_DEFAULT_PROFILE) with overrides and sampling mode applied.
+
+    Raises InvalidProfileError for an unknown profile, limit or sampling mode,
+    a value outside PROFILE_CEILINGS, or thresholds out of order. A named profile whose own
+    limits exceed the configured ceilings is clamped to them.
+    """
+    name = name or ANALYSIS_DEFAULT_PROFILE
+    base = PROFILES.get(name)
+    if base is None:
+        raise InvalidProfileError(f"Unknown profile {name!r}; expected one of: {', '.join(PROFILES)}")
+    limits = {
+        key: min(getattr(base, key), high) for key, (_, high) in PROFILE_CEILINGS.items()
+    }
+    for key, value in (overrides or {}).items():
+        if key not in PROFILE_CEILINGS:
+            raise InvalidProfileError(f"Unknown limit {key!r}; expected one of: {', '.join(PROFILE_CEILINGS)}")
+        low, high = PROFILE_CEILINGS[key]
+        if isinstance(value, bool) or not isinstance(value, int) or not low <= value <= high:
+            raise InvalidProfileError(f"{key} must be an integer between {low} and {high}")
+        limits[key] = value
+    if limits["complexity_very_high"] < limits["complexity_high"]:
+        raise InvalidProfileError("complexity_very_high must be at least complexity_high")
+    if sampling is not None and sampling not in SAMPLING_MODES:
+        raise InvalidProfileError(f"Unknown sampling {sampling!r}; expected one of: {', '.join(SAMPLING_MODES)}")
+    return replace(base, sampling=sampling or base.sampling, **limits)
@@ -1,22 +1,74 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-
-from app.core.config import DATABASE_URL, TESTING
-
-# Use SQLite in-memory for unit tests (fast, no setup)
-# Use Postgres for integration tests and production
-if TESTING and "sqlite" in DATABASE_URL.lower():
-    # Already using SQLite (test mode)
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-else:
-    engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import (
+    ASYNC_DATABASE_URL,
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_TIMEOUT_MS,
+    TESTING,
+)
+
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def async_url_for(url: str) -> str:
+    """Swap a sync driver URL for its async equivalent (psycopg2 -> asyncpg, pysqlite -> aiosqlite)."""
+    u = make_url(url)
+    driver = _ASYNC_DRIVERS.get(u.get_backend_name())
+    if driver is None:
+        return url
+    return u.set(drivername=driver).render_as_string(hide_password=False)
+
+
+# Use SQLite in-memory for unit tests (fast, no setup)
+# Use Postgres for integration tests and production
+if TESTING and "sqlite" in DATABASE_URL.lower():
+    # Already using SQLite (test mode)
+    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(ASYNC_DATABASE_URL or async_url_for(DATABASE_URL))
+else:
+    _pool_args = {
+        "pool_pre_ping": True,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+    }
+    _sync_connect_args = {}
+    _async_connect_args = {}
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        _sync_connect_args = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+        _async_connect_args = {"server_settings": {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}}
+    engine = create_engine(DATABASE_URL, connect_args=_sync_connect_args, **_pool_args)
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL or async_url_for(DATABASE_URL),
+        connect_args=_async_connect_args,
+        **_pool_args,
+    )
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: handlers keep reading attributes after commit, and
+# an expired attribute would need a lazy (blocking) refresh.
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """For handlers whose work outlives the request scope (streaming responses); they open their own sessions."""
+    return AsyncSessionLocal
@@ -0,0 +1,155 @@
+"""Prometheus metrics for the analysis pipeline, served at GET /metrics.
+
+Labelled children are bound once at import so the hot path is a dict lookup
+and a histogram observe, not a label resolution. The stage and analyzer
+timers also record a span in the current report trace (app.core.tracing).
+
+With several worker processes, set PROMETHEUS_MULTIPROC_DIR to an empty
+directory shared by the workers; /metrics then aggregates all of them.
+"""
+
+import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from app.core.tracing import span
+
+# Pipeline stages, in order. "analyze" is the whole analyzer; its parts are
+# in shipcheck_analyzer_seconds.
+STAGES = ("fetch_repo", "select_candidates", "batch_fetch_text", "snapshot", "quick_analyze", "analyze", "serialize", "db_commit")
+ANALYZERS = (
+    "runability",
+    "engineering",
+    "secrets",
+    "documentation",
+    "code_analysis",
+    "complexity",
+    "smells",
+    "dependencies",
+    "workspaces",
+    "architecture",
+    "sampling",
+    "scaffold",
+    "scoring",
+    "interview_pack",
+)
+CACHES = ("report_etag", "diff", "compression_dictionary", "blob")
+
+_SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+STAGE_SECONDS = Histogram(
+    "shipcheck_stage_seconds",
+    "Time spent in each analysis pipeline stage.",
+    ["stage"],
+    buckets=_SECONDS_BUCKETS,
+)
+ANALYZER_SECONDS = Histogram(
+    "shipcheck_analyzer_seconds",
+    "Time spent in each analyzer inside analyze().",
+    ["analyzer"],
+    buckets=_SECONDS_BUCKETS,
+)
+GITHUB_REQUESTS = Counter(
+    "shipcheck_github_requests_total",
+    "GitHub API responses by endpoint and HTTP status (\"error\" for transport failures).",
+    ["endpoint", "status"],
+)
+GITHUB_BYTES = Counter(
+    "shipcheck_github_downloaded_bytes_total",
+    "Response body bytes downloaded from the GitHub API.",
+    ["endpoint"],
+)
+CACHE_LOOKUPS = Counter(
+    "shipcheck_cache_lookups_total",
+    "Cache lookups by cache and result (hit | miss). Hit ratio: hit / (hit + miss).",
+    ["cache", "result"],
+)
+ANALYSES_IN_FLIGHT = Gauge(
+    "shipcheck_analyses_in_flight",
+    "POST /api/analyze requests currently running.",
+    multiprocess_mode="livesum",
+)
+ANALYSES_QUEUED = Gauge(
+    "shipcheck_analyses_queued",
+    "Analyses waiting for an admission slot.",
+    multiprocess_mode="livesum",
+)
+ADMISSION_REJECTIONS = Counter(
+    "shipcheck_admission_rejections_total",
+    "Analyses rejected with 503 by admission control, by reason (queue_full, timeout).",
+    ["reason"],
+)
+
+_stage = {name: STAGE_SECONDS.labels(name) for name in STAGES}
+_analyzer = {name: ANALYZER_SECONDS.labels(name) for name in ANALYZERS}
+_cache = {(c, r): CACHE_LOOKUPS.labels(c, r) for c in CACHES for r in ("hit", "miss")}
+
+
+@contextmanager
+def time_stage(name: str, timings: dict[str, float] | None = None) -> Iterator[None]:
+    """Observe the duration of one pipeline stage, and record it as a span of the current trace.
+
+    With timings, the seconds taken are also stored in timings[name].
+    """
+    start = time.perf_counter()
+    try:
+        with _stage[name].time(), span(name, "stage"):
+            yield
+    finally:
+        if timings is not None:
+            timings[name] = time.perf_counter() - start
+
+
+@contextmanager
+def time_analyzer(name: str) -> Iterator[None]:
+    with _analyzer[name].time(), span(name, "analyzer"):
+        yield
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    _cache[cache, "hit" if hit else "miss"].inc()
+
+
+def github_endpoint(url: str) -> str:
+    """Collapse a GitHub API URL to a low-cardinality endpoint name (repo, tree, blob, contents)."""
+    parts = urlparse(url).path.strip("/").split("/")
+    # /repos/{owner}/{repo}[/git/trees/...|/git/blobs/...|/contents/...]
+    if len(parts) < 3 or parts[0] != "repos":
+        return "other"
+    rest = parts[3:]
+    if not rest:
+        return "repo"
+    if rest[0] == "git" and len(rest) > 1:
+        return {"trees": "tree", "blobs": "blob"}.get(rest[1], "other")
+    if rest[0] == "contents":
+        return "contents"
+    return "other"
+
+
+def record_github_response(url: str, status: int | str, size: int) -> None:
+    endpoint = github_endpoint(url)
+    GITHUB_REQUESTS.labels(endpoint, str(status)).inc()
+    if size:
+        GITHUB_BYTES.labels(endpoint).inc(size)
+
+
+def render() -> tuple[bytes, str]:
+    """The exposition body and its content type."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
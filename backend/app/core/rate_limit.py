@@ -1,11 +1,32 @@
-"""Light per-IP rate limit for POST /api/analyze. In-memory only."""
+"""Light per-IP rate limit for POST /api/analyze.
 
+Sliding-window counter: each key keeps the request count of the current and
+previous fixed windows, and the previous count is weighted by how much of it
+still overlaps the sliding window. O(1) time and memory per key.
+
+Two stores:
+- "memory" (default): process-local, bounded, idle keys evicted after two
+  windows. With several workers each process enforces its own limit.
+- "database": a row per key in the app database, updated under a row lock,
+  so the limit holds across workers and nodes.
+"""
+
+import threading
 import time
+from collections import OrderedDict
+from typing import Protocol
 
-WINDOW_SECONDS = 60
-MAX_REQUESTS_PER_WINDOW = 10
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
-_store: dict[str, list[float]] = {}
+from app.core.config import ANALYZE_RATE_LIMIT, RATE_LIMIT_BACKEND
+from app.core.database import SessionLocal
+from app.models import RateLimitBucket
+
+WINDOW_SECONDS = 60
+MAX_REQUESTS_PER_WINDOW = ANALYZE_RATE_LIMIT
+MEMORY_MAX_KEYS = 100_000
 
 
 class RateLimitExceeded(Exception):
@@ -13,21 +34,131 @@ class RateLimitExceeded(Exception):
         super().__init__(message)
 
 
-def _prune(ts_list: list[float], window: int) -> None:
-    cutoff = time.monotonic() - window
-    while ts_list and ts_list[0] < cutoff:
-        ts_list.pop(0)
+class RateLimitStore(Protocol):
+    def hit(self, key: str, limit: int, window: int, now: float | None = None) -> bool:
+        """Record a request for key if it is within limit. Returns False (and records nothing) if not."""
+
+    def clear(self) -> None:
+        ...
+
+
+def _slide(
+    state: tuple[int, int, int] | None, now: float, window: int
+) -> tuple[int, int, int]:
+    """Advance (window_index, prev_count, curr_count) to the window containing now."""
+    w = int(now // window)
+    if state is None:
+        return w, 0, 0
+    w0, prev, curr = state
+    if w == w0:
+        return w, prev, curr
+    if w == w0 + 1:
+        return w, curr, 0
+    return w, 0, 0
+
+
+def _allowed(prev: int, curr: int, now: float, window: int, limit: int) -> bool:
+    overlap = 1.0 - (now % window) / window
+    return prev * overlap + curr < limit
+
+
+class MemoryRateLimitStore:
+    """Process-local store. Keys are kept in last-touched order so idle ones are evicted from the front."""
+
+    def __init__(self, max_keys: int = MEMORY_MAX_KEYS):
+        self._max_keys = max_keys
+        # key -> (window_index, prev_count, curr_count, last_seen)
+        self._buckets: OrderedDict[str, tuple[int, int, int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _evict(self, now: float, ttl: float) -> None:
+        while self._buckets:
+            _, state = next(iter(self._buckets.items()))
+            if now - state[3] < ttl and len(self._buckets) < self._max_keys:
+                break
+            self._buckets.popitem(last=False)
+
+    def hit(self, key: str, limit: int, window: int, now: float | None = None) -> bool:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            state = self._buckets.pop(key, None)
+            self._evict(now, 2 * window)
+            w, prev, curr = _slide(state[:3] if state else None, now, window)
+            allowed = _allowed(prev, curr, now, window, limit)
+            if allowed:
+                curr += 1
+            self._buckets[key] = (w, prev, curr, now)
+            return allowed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class DatabaseRateLimitStore:
+    """Shared store in the rate_limit_buckets table. Uses wall-clock time so nodes agree."""
+
+    def __init__(self, session_factory=SessionLocal):
+        self._session_factory = session_factory
+        self._last_purge = 0.0
+
+    def _insert_missing(self, db, key: str, w: int, expires_at: float) -> None:
+        insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        stmt = insert(RateLimitBucket).values(
+            key=key, window_index=w, prev_count=0, curr_count=0, expires_at=expires_at
+        )
+        db.execute(stmt.on_conflict_do_nothing(index_elements=["key"]))
+
+    def hit(self, key: str, limit: int, window: int, now: float | None = None) -> bool:
+        now = time.time() if now is None else now
+        expires_at = now + 2 * window
+        with self._session_factory() as db, db.begin():
+            self._insert_missing(db, key, int(now // window), expires_at)
+            row = db.execute(
+                select(
+                    RateLimitBucket.window_index,
+                    RateLimitBucket.prev_count,
+                    RateLimitBucket.curr_count,
+                )
+                .where(RateLimitBucket.key == key)
+                .with_for_update()
+            ).one()
+            w, prev, curr = _slide(tuple(row), now, window)
+            allowed = _allowed(prev, curr, now, window, limit)
+            if allowed:
+                curr += 1
+            db.execute(
+                update(RateLimitBucket)
+                .where(RateLimitBucket.key == key)
+                .values(window_index=w, prev_count=prev, curr_count=curr, expires_at=expires_at)
+            )
+            if now - self._last_purge >= window:
+                self._last_purge = now
+                db.execute(delete(RateLimitBucket).where(RateLimitBucket.expires_at < now))
+        return allowed
+
+    def clear(self) -> None:
+        with self._session_factory() as db, db.begin():
+            db.execute(delete(RateLimitBucket))
+
+
+def _make_store() -> RateLimitStore:
+    if RATE_LIMIT_BACKEND == "database":
+        return DatabaseRateLimitStore()
+    return MemoryRateLimitStore()
+
+
+_store: RateLimitStore = _make_store()
 
 
 def check_analyze_rate_limit(ip: str) -> None:
     """Raise RateLimitExceeded if ip has exceeded the limit. Otherwise record request."""
-    now = time.monotonic()
-    if ip not in _store:
-        _store[ip] = []
-    ts_list = _store[ip]
-    _prune(ts_list, WINDOW_SECONDS)
-    if len(ts_list) >= MAX_REQUESTS_PER_WINDOW:
+    if MAX_REQUESTS_PER_WINDOW <= 0:
+        return
+    if not _store.hit(ip, MAX_REQUESTS_PER_WINDOW, WINDOW_SECONDS):
         raise RateLimitExceeded(
             "Too many analyze requests. Try again in a minute."
         )
-    ts_list.append(now)
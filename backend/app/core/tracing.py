@@ -0,0 +1,108 @@
+"""Per-report trace spans, exported in Chrome trace event format.
+
+A Trace is made current for one analysis with recording(); span() then
+records a complete event (name, category, start, duration, thread, args)
+into it. Outside of recording(), span() costs a ContextVar lookup. The
+current trace follows the analysis into threadpool workers because
+run_in_threadpool copies the context.
+
+A trace keeps at most max_spans events; later ones are only counted, so a
+pathological repository cannot grow a trace without bound. The exported
+JSON opens in chrome://tracing and https://ui.perfetto.dev.
+"""
+
+import gzip
+import json
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any
+
+from app.core.config import REPORT_TRACE_MAX_SPANS
+
+
+class Trace:
+    def __init__(self, max_spans: int = REPORT_TRACE_MAX_SPANS):
+        self.max_spans = max_spans
+        self.started_at = datetime.now(timezone.utc)
+        self._t0 = time.perf_counter_ns()
+        # (name, category, start_ns, duration_ns, thread ident, args)
+        self.events: list[tuple[str, str, int, int, int, dict[str, Any]]] = []
+        self.dropped = 0
+
+    def add(self, name: str, cat: str, start_ns: int, end_ns: int, args: dict[str, Any]) -> None:
+        if len(self.events) >= self.max_spans:
+            self.dropped += 1
+            return
+        self.events.append(
+            (name, cat, start_ns - self._t0, end_ns - start_ns, threading.get_ident(), args)
+        )
+
+    def to_chrome(self, metadata: dict[str, Any] | None = None) -> dict[str, Any]:
+        """Chrome trace event JSON ("X" complete events, microsecond timestamps)."""
+        tids: dict[int, int] = {}
+        events: list[dict[str, Any]] = []
+        for name, cat, start, duration, ident, args in self.events:
+            tid = tids.setdefault(ident, len(tids) + 1)
+            event = {
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": start / 1000,
+                "dur": duration / 1000,
+                "pid": 1,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = args
+            events.append(event)
+        for tid in tids.values():
+            events.append({
+                "name": "thread_name", "ph": "M", "pid": 1, "tid": tid,
+                "args": {"name": f"thread {tid}"},
+            })
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                **(metadata or {}),
+                "started_at": self.started_at.isoformat(),
+                "span_count": len(self.events),
+                "dropped_spans": self.dropped,
+            },
+        }
+
+
+def encode_trace(trace: Trace, metadata: dict[str, Any] | None = None) -> bytes:
+    """gzip-compressed Chrome trace JSON, as stored in report_traces.data."""
+    body = json.dumps(trace.to_chrome(metadata), separators=(",", ":")).encode("utf-8")
+    return gzip.compress(body, mtime=0)
+
+
+_current: ContextVar[Trace | None] = ContextVar("shipcheck_trace", default=None)
+
+
+@contextmanager
+def recording(trace: Trace | None) -> Iterator[Trace | None]:
+    """Make trace current for the block. None records nothing."""
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str, cat: str = "stage", **args: Any) -> Iterator[None]:
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        trace.add(name, cat, start, time.perf_counter_ns(), args)
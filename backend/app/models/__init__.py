@@ -1,38 +1,134 @@
-import uuid
-from datetime import datetime
-
-from sqlalchemy import JSON, DateTime, Integer, Text, func
-from sqlalchemy.dialects.postgresql import JSONB, UUID
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-
-
-class Base(DeclarativeBase):
-    pass
-
-
-class Report(Base):
-    __tablename__ = "reports"
-
-    id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
-    )
-    repo_url: Mapped[str] = mapped_column(Text, nullable=False)
-    repo_owner: Mapped[str | None] = mapped_column(Text, nullable=True)
-    repo_name: Mapped[str | None] = mapped_column(Text, nullable=True)
-    commit_sha: Mapped[str | None] = mapped_column(Text, nullable=True)
-    status: Mapped[str | None] = mapped_column(Text, nullable=True)  # pending | done | failed
-    overall_score: Mapped[int | None] = mapped_column(Integer, nullable=True)
-    findings_json: Mapped[dict | list | None] = mapped_column(
-        JSONB().with_variant(JSON(), "sqlite"),
-        nullable=True,
-    )
-    findings_v2: Mapped[dict | list | None] = mapped_column(
-        JSONB().with_variant(JSON(), "sqlite"),
-        nullable=True,
-    )
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now()
-    )
-    updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
-    )
+import uuid
+from datetime import datetime
+
+from sqlalchemy import JSON, BigInteger, DateTime, Float, ForeignKey, Index, Integer, LargeBinary, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Report(Base):
+    __tablename__ = "reports"
+    __table_args__ = (
+        # Keyset pagination for GET /api/reports: ORDER BY created_at DESC, id DESC.
+        Index("ix_reports_created_at_id", "created_at", "id"),
+        # Search filters (GET /api/reports/search), each ending in created_at
+        # so the keyset ORDER BY stays index-ordered within the filter.
+        Index("ix_reports_status_created_at", "status", "created_at"),
+        Index("ix_reports_score_created_at", "overall_score", "created_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    repo_url: Mapped[str] = mapped_column(Text, nullable=False)
+    repo_owner: Mapped[str | None] = mapped_column(Text, nullable=True)
+    repo_name: Mapped[str | None] = mapped_column(Text, nullable=True)
+    commit_sha: Mapped[str | None] = mapped_column(Text, nullable=True)
+    status: Mapped[str | None] = mapped_column(Text, nullable=True)  # pending | done | failed
+    overall_score: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Legacy column: rows are compacted into findings_v2, which is the only one written.
+    findings_json: Mapped[dict | list | None] = mapped_column(
+        JSONB().with_variant(JSON(), "sqlite"),
+        nullable=True,
+    )
+    findings_v2: Mapped[dict | list | None] = mapped_column(
+        JSONB().with_variant(JSON(), "sqlite"),
+        nullable=True,
+    )
+    # Precomputed v2 response body for terminal reports (done | failed). Deferred
+    # so ordinary row loads never pull it; body_etag is the content digest.
+    body_v2: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True, deferred=True)
+    body_etag: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # How body_v2 is compressed: NULL (not), "gzip" or "zdict" (see
+    # app.services.report_storage). body_etag is always over the uncompressed body.
+    body_encoding: Mapped[str | None] = mapped_column(Text, nullable=True)
+    body_dict_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("compression_dictionaries.id"), nullable=True
+    )
+    # The analysis profile and limits the report was produced with
+    # (app.core.analysis_profiles); NULL on rows from before profiles.
+    analysis_profile: Mapped[dict | None] = mapped_column(
+        JSONB().with_variant(JSON(), "sqlite"),
+        nullable=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+    failed_checks: Mapped[list["ReportFailedCheck"]] = relationship(
+        back_populates="report", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+
+class ReportFailedCheck(Base):
+    """One row per check id with status "fail" in a report's findings.
+
+    Denormalized from findings_v2 so "reports where check X failed" is an
+    index lookup instead of a scan over every findings document.
+    """
+
+    __tablename__ = "report_failed_checks"
+
+    check_id: Mapped[str] = mapped_column(Text, primary_key=True)
+    report_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("reports.id", ondelete="CASCADE"), primary_key=True
+    )
+    report: Mapped[Report] = relationship(back_populates="failed_checks")
+
+
+class RateLimitBucket(Base):
+    """Sliding-window counter state for one rate-limited key (see app.core.rate_limit)."""
+
+    __tablename__ = "rate_limit_buckets"
+
+    key: Mapped[str] = mapped_column(Text, primary_key=True)
+    window_index: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    prev_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    curr_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    expires_at: Mapped[float] = mapped_column(Float, nullable=False, index=True)  # epoch seconds
+
+
+class ReportTrace(Base):
+    """Trace spans of one report's analysis: gzip-compressed Chrome trace JSON (see app.core.tracing)."""
+
+    __tablename__ = "report_traces"
+
+    report_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("reports.id", ondelete="CASCADE"), primary_key=True
+    )
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    span_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    dropped_spans: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+class CompressionDictionary(Base):
+    """A preset dictionary for "zdict" report bodies. Never modified once written."""
+
+    __tablename__ = "compression_dictionaries"
+    # Ids are never reused: bodies reference them and readers cache by id.
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    sample_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+# Case-insensitive owner/repo lookup; GitHub names are case-insensitive.
+Index(
+    "ix_reports_owner_repo_created_at",
+    func.lower(Report.repo_owner),
+    func.lower(Report.repo_name),
+    Report.created_at,
+)
@@ -1,10 +1,29 @@
 """Rules-based analyzer: fetch_result -> ReportResult (sections, checks, overall_score)."""
 
+import hashlib
 import os
 import re
 from dataclasses import dataclass, field
 from typing import Any, Literal
 
+from app.core.analysis_profiles import STANDARD, AnalysisProfile
+from app.core.metrics import time_analyzer
+from app.core.tracing import span
+from app.services.candidate_selector import known_code_blobs
+from app.services.generated_files import generated_summary
+from app.services.sampling import sampling_summary
+from app.services.scaffold_index import get_scaffold_index
+from app.services.workspaces import (
+    Package,
+    detect_packages,
+    merge_deps,
+    merge_graph,
+    package_deps,
+    run_shards,
+    shard_graph,
+    split_files,
+)
+
 EVIDENCE_SNIPPET_MAX = 200
 POINTS_PASS = 10
 POINTS_WARN = 5
@@ -48,7 +67,7 @@ CHECK_CATEGORY: dict[str, str] = {
     "architecture_circular":         "Architecture",
     "architecture_god_modules":      "Architecture",
     "architecture_orphans":          "Architecture",
-    # code_finding_{i} entries route via CheckResult.category set by the emitter.
+    # code_finding_<hash> entries route via CheckResult.category set by the emitter.
 }
 
 # Sentinel: when category equals this, fall back to CHECK_CATEGORY[id] lookup.
@@ -102,12 +121,30 @@ class SectionResult:
     score: int = 0
 
 
+@dataclass
+class PackageResult:
+    """One package of a monorepo, analyzed on its own (app.services.workspaces)."""
+    name: str
+    root: str
+    languages: list[str] = field(default_factory=list)
+    files: int = 0
+    sections: list[SectionResult] = field(default_factory=list)
+    score: int = 0
+
+
 @dataclass
 class ReportResult:
     overall_score: int
     sections: list[SectionResult] = field(default_factory=list)
     interview_pack: list[str] = field(default_factory=list)
     category_scores: dict[str, int] = field(default_factory=dict)
+    sampling: dict[str, Any] | None = None  # see app.services.sampling.sampling_summary
+    # Known scaffold / vendored code left out of the analysis (ScaffoldIndex.summary).
+    scaffold: dict[str, Any] | None = None
+    # Generated and minified files found while fetching, also left out (generated_summary).
+    generated: dict[str, Any] | None = None
+    # Monorepos: per-package dependency and architecture results; empty otherwise.
+    packages: list[PackageResult] = field(default_factory=list)
 
 
 def compute_scope_factor(occurrences: int) -> float:
@@ -921,6 +958,12 @@ def _generate_interview_pack(
     return out[:10]
 
 
+def _finding_id(title: str, path: str, line: int | None) -> str:
+    """A code finding's id from its content, so it survives findings added before it."""
+    digest = hashlib.sha1(f"{title}\0{path}\0{line}".encode("utf-8")).hexdigest()[:12]
+    return f"code_finding_{digest}"
+
+
 def _code_analysis_checks(
     content_by_path: dict[str, str] | None, stats: dict[str, Any] | None = None
 ) -> list[CheckResult]:
@@ -1087,7 +1130,7 @@ def _code_analysis_checks(
     )
 
     # Individual findings with evidence (path, line range, snippet)
-    for i, f in enumerate((code_analysis.get("findings") or [])[:15]):
+    for f in (code_analysis.get("findings") or [])[:15]:
         ev = f.get("evidence") or {}
         path = ev.get("path") or "—"
         snippet = (ev.get("snippet") or "")[:EVIDENCE_SNIPPET_MAX]
@@ -1129,7 +1172,7 @@ def _code_analysis_checks(
         )
         checks.append(
             CheckResult(
-                id=f"code_finding_{i}",
+                id=_finding_id(title, path, start_line),
                 name=title,
                 status=status,
                 evidence=evidence_dict,
@@ -1160,8 +1203,24 @@ def _file_language(path: str) -> str:
     return ""
 
 
-def _complexity_checks(content_by_path: dict[str, str]) -> list[CheckResult]:
-    """Surface high-complexity functions and TS `: any` density."""
+def _tally(metrics_by_path: dict[str, dict[str, int]] | None, path: str, metric: str, n: int = 1) -> None:
+    """Add n to one per-file metric count (see app.services.sampling.METRICS)."""
+    if metrics_by_path is not None and n:
+        counts = metrics_by_path.setdefault(path, {})
+        counts[metric] = counts.get(metric, 0) + n
+
+
+def _complexity_checks(
+    content_by_path: dict[str, str],
+    high: int = _COMPLEXITY_HIGH,
+    very_high: int = _COMPLEXITY_VERY_HIGH,
+    metrics_by_path: dict[str, dict[str, int]] | None = None,
+) -> list[CheckResult]:
+    """Surface high-complexity functions (>= high, >= very_high) and TS `: any` density.
+
+    When metrics_by_path is given, per-file counts are added to it for sampling
+    estimates: complex_functions, very_complex_functions and any_usages.
+    """
     from app.analyzers.code.complexity import (
         parse_js_complexity,
         parse_python_complexity,
@@ -1178,21 +1237,29 @@ def _complexity_checks(content_by_path: dict[str, str]) -> list[CheckResult]:
 
     for path, content in content_by_path.items():
         if path.endswith(".py"):
-            res = parse_python_complexity(path, content or "")
+            with span("complexity", "file", path=path, chars=len(content or "")):
+                res = parse_python_complexity(path, content or "")
             for fn in res.get("functions") or []:
                 cx = int(fn.get("complexity") or 0)
-                if cx >= _COMPLEXITY_VERY_HIGH:
+                if cx >= very_high:
                     very_high_funcs.append((path, fn.get("name") or "", cx, int(fn.get("start_line") or 0)))
-                elif cx >= _COMPLEXITY_HIGH:
+                elif cx >= high:
                     high_funcs.append((path, fn.get("name") or "", cx, int(fn.get("start_line") or 0)))
         else:
             lang = _file_language(path)
             if not lang:
                 continue
-            res = parse_js_complexity(path, content or "", lang)
+            with span("complexity", "file", path=path, chars=len(content or "")):
+                res = parse_js_complexity(path, content or "", lang)
             if lang in ("typescript", "tsx"):
                 ts_files_scanned += 1
                 any_total += int(res.get("any_count") or 0)
+                _tally(metrics_by_path, path, "any_usages", int(res.get("any_count") or 0))
+
+    for path, _, _, _ in high_funcs + very_high_funcs:
+        _tally(metrics_by_path, path, "complex_functions")
+    for path, _, _, _ in very_high_funcs:
+        _tally(metrics_by_path, path, "very_complex_functions")
 
     total_complex = len(high_funcs) + len(very_high_funcs)
     if total_complex == 0:
@@ -1223,7 +1290,7 @@ def _complexity_checks(content_by_path: dict[str, str]) -> list[CheckResult]:
             status="fail" if is_fail else "warn",
             evidence={"file": f"{path}:{line}" if line else path, "snippet": f"{name} complexity={cx}"},
             recommendation=_rec(
-                what=f"{total_complex} function(s) exceed the complexity threshold (>= {_COMPLEXITY_HIGH}); {len(very_high_funcs)} are very high (>= {_COMPLEXITY_VERY_HIGH}).",
+                what=f"{total_complex} function(s) exceed the complexity threshold (>= {high}); {len(very_high_funcs)} are very high (>= {very_high}).",
                 where=f"e.g. {path}:{line} ({name}, complexity={cx})",
                 why="Highly branchy functions are hard to reason about, hard to test, and hard to change without regressions. They become the slowest part of every PR review touching them.",
                 how="Extract guard clauses to early returns, pull each branch into a named helper, and add a test per branch as you split — the test surface grows with the design, not after.",
@@ -1273,8 +1340,13 @@ def _complexity_checks(content_by_path: dict[str, str]) -> list[CheckResult]:
     return results
 
 
-def _smells_checks(content_by_path: dict[str, str]) -> list[CheckResult]:
-    """Surface code smells (empty except, eval, console.log, etc.)."""
+def _smells_checks(
+    content_by_path: dict[str, str], metrics_by_path: dict[str, dict[str, int]] | None = None
+) -> list[CheckResult]:
+    """Surface code smells (empty except, eval, console.log, etc.).
+
+    When metrics_by_path is given, per-file smells and high_severity_smells counts are added to it.
+    """
     from app.analyzers.code.smells import detect_js_smells, detect_python_smells
 
     results: list[CheckResult] = []
@@ -1286,12 +1358,21 @@ def _smells_checks(content_by_path: dict[str, str]) -> list[CheckResult]:
 
     for path, content in content_by_path.items():
         if path.endswith(".py"):
-            for s in detect_python_smells(path, content or ""):
+            with span("smells", "file", path=path, chars=len(content or "")):
+                smells = detect_python_smells(path, content or "")
+            for s in smells:
                 (high_smells if s.get("severity") == "high" else low_smells).append((path, s))
         elif path.endswith((".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs")):
-            for s in detect_js_smells(path, content or ""):
+            with span("smells", "file", path=path, chars=len(content or "")):
+                smells = detect_js_smells(path, content or "")
+            for s in smells:
                 (high_smells if s.get("severity") == "high" else low_smells).append((path, s))
 
+    for path, _ in high_smells:
+        _tally(metrics_by_path, path, "high_severity_smells")
+    for path, _ in high_smells + low_smells:
+        _tally(metrics_by_path, path, "smells")
+
     total = len(high_smells) + len(low_smells)
     if total == 0:
         results.append(CheckResult(
@@ -1364,16 +1445,24 @@ def _smells_checks(content_by_path: dict[str, str]) -> list[CheckResult]:
     return results
 
 
-def _dependency_checks(content_by_path: dict[str, str]) -> list[CheckResult]:
-    """Surface unused / missing declared dependencies."""
+def _dependency_checks(
+    content_by_path: dict[str, str],
+    deps: tuple[dict[str, Any], dict[str, Any]] | None = None,
+) -> list[CheckResult]:
+    """Surface unused / missing declared dependencies.
+
+    deps is (python, js) as check_python_deps / check_js_deps return them,
+    e.g. rolled up over monorepo packages; by default they are computed
+    from content_by_path.
+    """
     from app.analyzers.code.dependencies import check_js_deps, check_python_deps
 
     results: list[CheckResult] = []
-    if not content_by_path:
-        return results
-
-    py_dep = check_python_deps(content_by_path)
-    js_dep = check_js_deps(content_by_path)
+    if deps is None:
+        if not content_by_path:
+            return results
+        deps = check_python_deps(content_by_path), check_js_deps(content_by_path)
+    py_dep, js_dep = deps
 
     unused = (py_dep.get("unused") or []) + (js_dep.get("unused") or [])
     missing = (py_dep.get("missing") or []) + (js_dep.get("missing") or [])
@@ -1388,7 +1477,7 @@ def _dependency_checks(content_by_path: dict[str, str]) -> list[CheckResult]:
             name="Unused dependencies",
             status="warn",
             evidence={
-                "file": "requirements.txt" if py_dep.get("unused") else "package.json",
+                "file": py_dep.get("manifest", "requirements.txt") if py_dep.get("unused") else js_dep.get("manifest", "package.json"),
                 "snippet": ", ".join(unused[:10]),
             },
             recommendation=_rec(
@@ -1461,8 +1550,11 @@ def _dependency_checks(content_by_path: dict[str, str]) -> list[CheckResult]:
     return results
 
 
-def _architecture_checks(content_by_path: dict[str, str]) -> list[CheckResult]:
-    """Surface circular imports, god modules, orphan modules from the import graph."""
+def _architecture_checks(content_by_path: dict[str, str], graph: Any = None) -> list[CheckResult]:
+    """Surface circular imports, god modules, orphan modules from the import graph.
+
+    graph defaults to the import graph of content_by_path.
+    """
     from app.analyzers.code.architecture import (
         build_import_graph,
         find_circular_imports,
@@ -1471,10 +1563,10 @@ def _architecture_checks(content_by_path: dict[str, str]) -> list[CheckResult]:
     )
 
     results: list[CheckResult] = []
-    if not content_by_path:
-        return results
-
-    graph = build_import_graph(content_by_path)
+    if graph is None:
+        if not content_by_path:
+            return results
+        graph = build_import_graph(content_by_path)
     if graph.number_of_nodes() == 0:
         return results
 
@@ -1593,10 +1685,70 @@ def _architecture_checks(content_by_path: dict[str, str]) -> list[CheckResult]:
     return results
 
 
+# Check id -> the sampling metric its count extrapolates.
+_ESTIMATED_CHECKS = {
+    "complexity_summary": "complex_functions",
+    "smells_summary": "smells",
+    "complexity_any_types": "any_usages",
+}
+
+
+def _note_estimates(checks: list[CheckResult], sampling: dict[str, Any] | None) -> None:
+    """Add the whole-tree estimate to the counted checks when only a stratified sample was read."""
+    if not sampling or not sampling.get("estimates") or sampling["fraction"] >= 1:
+        return
+    for check in checks:
+        metric = _ESTIMATED_CHECKS.get(check.id)
+        if metric is None:
+            continue
+        est = sampling["estimates"][metric]
+        check.recommendation.what += (
+            f" Extrapolated from {sampling['code_files_read']} of {sampling['code_files']} code files:"
+            f" about {est['estimate']:g} across the repo ({sampling['confidence']:.0%} CI"
+            f" {est['ci_low']:g}–{est['ci_high']:g})."
+        )
+
+
+def _package_results(packages: list[Package], shards: list[dict[str, Any]]) -> list[PackageResult]:
+    """Dependency and architecture sections for each package from its shard result, by root."""
+    results = []
+    for package, shard in zip(packages, shards):
+        sections = []
+        if shard["files"]:
+            deps = (
+                package_deps(package, shard["python_deps"], "requirements.txt"),
+                package_deps(package, shard["js_deps"], "package.json"),
+            )
+            for name, checks in (
+                ("Dependencies", _dependency_checks({}, deps)),
+                ("Architecture", _architecture_checks({}, shard_graph(package, shard))),
+            ):
+                if checks:
+                    sections.append(SectionResult(name=name, checks=checks, score=sum(c.points for c in checks)))
+        results.append(PackageResult(
+            name=package.name,
+            root=package.root,
+            languages=list(package.languages),
+            files=shard["files"],
+            sections=sections,
+            score=sum(section.score for section in sections),
+        ))
+    return sorted(results, key=lambda r: r.root)
+
+
+def file_metrics(content_by_path: dict[str, str], profile: AnalysisProfile = STANDARD) -> dict[str, dict[str, int]]:
+    """Per-file counts (app.services.sampling.METRICS) of the complexity and smell analyzers."""
+    metrics: dict[str, dict[str, int]] = {}
+    _complexity_checks(content_by_path, profile.complexity_high, profile.complexity_very_high, metrics)
+    _smells_checks(content_by_path, metrics)
+    return metrics
+
+
 def analyze(
     fetch_result: dict[str, Any],
     ingested: dict[str, Any] | None = None,
     content_by_path: dict[str, str] | None = None,
+    profile: AnalysisProfile = STANDARD,
 ) -> ReportResult:
     fetch_result = fetch_result or {}
     content = content_by_path
@@ -1604,48 +1756,92 @@ def analyze(
         content = ingested.get("files") or {}
     sections: list[SectionResult] = []
 
-    run_checks = _runability_checks(fetch_result, content)
+    with time_analyzer("runability"):
+        run_checks = _runability_checks(fetch_result, content)
     run_score = sum(c.points for c in run_checks)
     sections.append(SectionResult(name="Runability", checks=run_checks, score=run_score))
 
-    eng_checks = _engineering_checks(fetch_result, content)
+    with time_analyzer("engineering"):
+        eng_checks = _engineering_checks(fetch_result, content)
     eng_score = sum(c.points for c in eng_checks)
     sections.append(SectionResult(name="Engineering Quality", checks=eng_checks, score=eng_score))
 
-    sec_checks = _secrets_checks(fetch_result, content)
+    with time_analyzer("secrets"):
+        sec_checks = _secrets_checks(fetch_result, content)
     sec_score = sum(c.points for c in sec_checks)
     sections.append(SectionResult(name="Secrets Safety", checks=sec_checks, score=sec_score))
 
-    doc_checks = _documentation_checks(fetch_result, content)
+    with time_analyzer("documentation"):
+        doc_checks = _documentation_checks(fetch_result, content)
     doc_score = sum(c.points for c in doc_checks)
     sections.append(SectionResult(name="Documentation", checks=doc_checks, score=doc_score))
 
     code_checks: list[CheckResult] = []
     code_score = 0
     arch_checks: list[CheckResult] = []
+    sampling = None
+    package_results: list[PackageResult] = []
     if content:
+        metrics_by_path: dict[str, dict[str, int]] = {}
         code_stats = (ingested.get("stats") or {}) if ingested else {}
-        base_code_checks = _code_analysis_checks(content, code_stats)
-        complexity_checks = _complexity_checks(content)
-        smells_checks = _smells_checks(content)
-        deps_checks = _dependency_checks(content)
-        arch_checks = _architecture_checks(content)
+        with time_analyzer("code_analysis"):
+            base_code_checks = _code_analysis_checks(content, code_stats)
+        with time_analyzer("complexity"):
+            complexity_checks = _complexity_checks(
+                content, profile.complexity_high, profile.complexity_very_high, metrics_by_path
+            )
+        with time_analyzer("smells"):
+            smells_checks = _smells_checks(content, metrics_by_path)
+        deps = graph = None
+        packages = detect_packages(fetch_result.get("tree_paths") or list(content), content)
+        if packages:
+            with time_analyzer("workspaces"):
+                shards = run_shards(split_files(content, packages))
+                package_results = _package_results(packages, shards)
+            deps = (
+                merge_deps(packages, shards, "python_deps", "requirements.txt"),
+                merge_deps(packages, shards, "js_deps", "package.json"),
+            )
+            graph = merge_graph(packages, shards)
+        with time_analyzer("dependencies"):
+            deps_checks = _dependency_checks(content, deps)
+        with time_analyzer("architecture"):
+            arch_checks = _architecture_checks(content, graph)
         code_checks = base_code_checks + complexity_checks + smells_checks + deps_checks
+        with time_analyzer("sampling"):
+            # Generated files are excluded, not unread: keep them out of the population.
+            excluded = fetch_result.get("generated_files") or {}
+            population = [b for b in fetch_result.get("tree_blobs") or [] if b.get("path") not in excluded]
+            sampling = sampling_summary(population, content, metrics_by_path, profile)
+            _note_estimates(code_checks, sampling)
         code_score = sum(c.points for c in code_checks)
         sections.append(SectionResult(name="Code Analysis", checks=code_checks, score=code_score))
         if arch_checks:
             arch_score = sum(c.points for c in arch_checks)
             sections.append(SectionResult(name="Architecture", checks=arch_checks, score=arch_score))
 
+    scaffold = None
+    tree_blobs = fetch_result.get("tree_blobs") or []
+    index = get_scaffold_index()
+    if tree_blobs and len(index):
+        with time_analyzer("scaffold"):
+            scaffold = index.summary(known_code_blobs(tree_blobs, index))
+
     all_checks = run_checks + eng_checks + sec_checks + doc_checks + code_checks + arch_checks
-    overall_score, category_scores = compute_categorical_score(all_checks)
+    with time_analyzer("scoring"):
+        overall_score, category_scores = compute_categorical_score(all_checks)
 
-    stack = _detect_stack(fetch_result, content)
-    interview_pack = _generate_interview_pack(fetch_result, stack)
+    with time_analyzer("interview_pack"):
+        stack = _detect_stack(fetch_result, content)
+        interview_pack = _generate_interview_pack(fetch_result, stack)
 
     return ReportResult(
         overall_score=overall_score,
         sections=sections,
         interview_pack=interview_pack,
         category_scores=category_scores,
+        sampling=sampling,
+        scaffold=scaffold,
+        generated=generated_summary(fetch_result.get("generated_files")),
+        packages=package_results,
     )
@@ -2,9 +2,11 @@
 
 import fnmatch
 import os
+from collections.abc import Container
 from typing import Any
 
 from app.core.repo_limits import is_text_candidate, should_skip_path
+from app.services.scaffold_index import get_scaffold_index
 
 # Priority buckets: A (docs/config) -> B (CI) -> C (manifests) -> D (entry) -> E (security) -> F (code)
 MAX_BUCKET_F = 150  # cap bucket F so A-E get room
@@ -12,12 +14,13 @@ MAX_BUCKET_F = 150  # cap bucket F so A-E get room
 DOC_PATTERNS = ("README*", "CONTRIBUTING*", "SECURITY*", "CHANGELOG*", "LICENSE*")
 MANIFEST_NAMES = frozenset({
     "package.json", "pyproject.toml", "Pipfile", "poetry.lock",
-    "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "Pipfile.lock",
+    "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "Pipfile.lock", "pnpm-workspace.yaml",
 })
 MANIFEST_PREFIXES = ("requirements", "requirements-")
 ENTRY_NAMES = ("main.py", "app.py", "server.py", "server.js", "server.ts", "index.js", "index.ts", "index.tsx")
 ENTRY_PATH_PREFIXES = ("app/", "src/", "api/", "routes/", "routers/", "backend/", "services/")
-CODE_PREFIXES = ("src/", "app/", "backend/", "api/", "services/", "routes/", "routers/")
+# packages/, apps/ and libs/ hold the packages of most monorepos (app.services.workspaces).
+CODE_PREFIXES = ("src/", "app/", "backend/", "api/", "services/", "routes/", "routers/", "packages/", "apps/", "libs/")
 
 
 def _path_matches_doc(path: str) -> bool:
@@ -76,10 +79,30 @@ def _bucket(path: str) -> int:
     return -1
 
 
-def select_candidates(tree_blobs: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    """Return prioritized list of blobs to fetch. Order: A then B then C then D then E then F.
-    Skips paths that should_skip_path. Caps bucket F at MAX_BUCKET_F.
+def is_code_path(path: str) -> bool:
+    """True for paths in the code buckets, D (entry) and F (code)."""
+    return _bucket(path) in (3, 5)
+
+
+def known_code_blobs(
+    tree_blobs: list[dict[str, Any]], known: Container[str] | None = None
+) -> list[dict[str, Any]]:
+    """Code files whose blob sha is in known (default: the scaffold index); bucket_blobs leaves them out."""
+    known = get_scaffold_index() if known is None else known
+    return [
+        b for b in tree_blobs
+        if b.get("sha") in known and is_text_candidate(b.get("path") or "") and is_code_path(b["path"])
+    ]
+
+
+def bucket_blobs(
+    tree_blobs: list[dict[str, Any]], known: Container[str] | None = None
+) -> list[list[dict[str, Any]]]:
+    """Fetchable blobs in six lists, buckets A to F, each sorted by path.
+    Skips paths that should_skip_path, non-text files and blobs without a sha,
+    and code files (D, F) whose sha is in known (default: the scaffold index).
     """
+    known = get_scaffold_index() if known is None else known
     buckets: list[list[dict[str, Any]]] = [[] for _ in range(6)]
     for b in tree_blobs:
         path = b.get("path") or ""
@@ -89,18 +112,32 @@ def select_candidates(tree_blobs: list[dict[str, Any]]) -> list[dict[str, Any]]:
         if not sha:
             continue
         bucket = _bucket(path)
-        if bucket < 0:
+        if bucket < 0 or (bucket in (3, 5) and sha in known):
             continue
         buckets[bucket].append(b)
 
     for lst in buckets:
         lst.sort(key=lambda x: (x.get("path") or ""))
+    return buckets
 
+
+def is_entry_name(path: str) -> bool:
+    return os.path.basename(path).lower() in {x.lower() for x in ENTRY_NAMES}
+
+
+def select_candidates(
+    tree_blobs: list[dict[str, Any]], max_bucket_f: int = MAX_BUCKET_F, known: Container[str] | None = None
+) -> list[dict[str, Any]]:
+    """Return prioritized list of blobs to fetch. Order: A then B then C then D then E then F.
+    Skips paths that should_skip_path and known scaffold code (see bucket_blobs).
+    Caps bucket F at max_bucket_f.
+    """
+    buckets = bucket_blobs(tree_blobs, known)
     out: list[dict[str, Any]] = []
     for i in range(5):
         out.extend(buckets[i])
     f_list = buckets[5]
-    if len(f_list) > MAX_BUCKET_F:
-        f_list = f_list[:MAX_BUCKET_F]
+    if len(f_list) > max_bucket_f:
+        f_list = f_list[:max_bucket_f]
     out.extend(f_list)
     return out
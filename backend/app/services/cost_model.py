@@ -0,0 +1,153 @@
+"""Predicted cost of one analysis, from the repository tree, for scheduling and ETAs.
+
+RepoStats summarizes what an analysis will read: how many blobs and bytes
+batch_fetch_text() will download under the profile's limits, and the
+language mix of those bytes. It is computed from the recursive tree
+(path and size of every blob) in one pass. The count of fetchable files
+approximates select_candidates() without its sorting and bucket patterns.
+
+CostModel turns the stats into seconds for the two stages that grow with
+the repository: downloading blobs ("batch_fetch_text") and running the
+analyzer ("analyze"). Each stage is a linear model whose per-unit priors
+come from benchmarks/README.md. After every analysis the API calls
+observe() with the measured stage times. That moves a per-stage correction
+factor towards measured / predicted, so the model follows the real GitHub
+latency and CPU of the deployment. The calibration is per process and
+starts from the priors on restart.
+"""
+
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.analysis_profiles import STANDARD, AnalysisProfile
+from app.core.repo_limits import MAX_FILE_BYTES, is_text_candidate
+from app.services.candidate_selector import CODE_PREFIXES, is_code_path
+from app.services.scaffold_index import get_scaffold_index
+
+LANGUAGE_GROUPS = {
+    ".py": "python",
+    ".js": "javascript", ".jsx": "javascript", ".mjs": "javascript", ".cjs": "javascript",
+    ".ts": "javascript", ".tsx": "javascript",
+}
+
+# Priors, in seconds. Blob downloads are sequential GitHub calls.
+FETCH_SECONDS_PER_FILE = 0.08
+FETCH_SECONDS_PER_MB = 0.5
+ANALYZE_BASE_SECONDS = 0.1
+ANALYZE_SECONDS_PER_TREE_FILE = 0.00002  # path checks and candidate selection over the whole tree
+ANALYZE_SECONDS_PER_KB = {"python": 0.004, "javascript": 0.002, "other": 0.0005}
+
+# Weight of each observation in the correction factor, and its clamp.
+CALIBRATION_SMOOTHING = 0.1
+MIN_RATIO, MAX_RATIO = 0.05, 20.0
+
+
+@dataclass(frozen=True)
+class RepoStats:
+    tree_files: int
+    fetch_files: int
+    fetch_bytes: int
+    bytes_by_language: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_tree(cls, tree_blobs: list[dict[str, Any]], profile: AnalysisProfile = STANDARD) -> "RepoStats":
+        """Expected download for tree_blobs under profile: fetchable files scaled down to its limits.
+
+        Known scaffold code is not fetched, so it is not counted.
+        """
+        known = get_scaffold_index()
+        files = 0
+        total = 0
+        by_language: dict[str, int] = {}
+        for b in tree_blobs:
+            path = b.get("path") or ""
+            if not b.get("sha") or not is_text_candidate(path):
+                continue
+            if "/" in path and not path.startswith(CODE_PREFIXES + (".github/",)):
+                continue
+            if b["sha"] in known and is_code_path(path):
+                continue
+            size = min(int(b.get("size") or 0), MAX_FILE_BYTES)
+            files += 1
+            total += size
+            group = LANGUAGE_GROUPS.get(os.path.splitext(path)[1].lower(), "other")
+            by_language[group] = by_language.get(group, 0) + size
+        fetch_files = min(files, profile.max_files_fetch)
+        share = fetch_files / files if files else 0.0
+        fetch_bytes = min(int(total * share), profile.max_total_bytes)
+        scale = fetch_bytes / total if total else 0.0
+        return cls(
+            tree_files=len(tree_blobs),
+            fetch_files=fetch_files,
+            fetch_bytes=fetch_bytes,
+            bytes_by_language={k: int(v * scale) for k, v in by_language.items()},
+        )
+
+
+@dataclass(frozen=True)
+class CostEstimate:
+    fetch_seconds: float
+    analyze_seconds: float
+
+    @property
+    def total_seconds(self) -> float:
+        return self.fetch_seconds + self.analyze_seconds
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "fetch_seconds": round(self.fetch_seconds, 2),
+            "analyze_seconds": round(self.analyze_seconds, 2),
+            "total_seconds": round(self.total_seconds, 2),
+        }
+
+
+def _prior(stats: RepoStats) -> CostEstimate:
+    fetch = stats.fetch_files * FETCH_SECONDS_PER_FILE + stats.fetch_bytes / 1e6 * FETCH_SECONDS_PER_MB
+    analyze = (
+        ANALYZE_BASE_SECONDS
+        + stats.tree_files * ANALYZE_SECONDS_PER_TREE_FILE
+        + sum(n / 1000 * ANALYZE_SECONDS_PER_KB.get(k, ANALYZE_SECONDS_PER_KB["other"])
+              for k, n in stats.bytes_by_language.items())
+    )
+    return CostEstimate(fetch, analyze)
+
+
+class CostModel:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.fetch_scale = 1.0
+        self.analyze_scale = 1.0
+        self.observations = 0
+
+    def predict(self, stats: RepoStats) -> CostEstimate:
+        prior = _prior(stats)
+        return CostEstimate(prior.fetch_seconds * self.fetch_scale, prior.analyze_seconds * self.analyze_scale)
+
+    def observe(self, stats: RepoStats, fetch_seconds: float | None, analyze_seconds: float | None) -> None:
+        """Calibrate with the measured stage times of one analysis of a tree with these stats."""
+        prior = _prior(stats)
+        with self._lock:
+            if fetch_seconds is not None and prior.fetch_seconds > 0:
+                ratio = min(MAX_RATIO, max(MIN_RATIO, fetch_seconds / prior.fetch_seconds))
+                self.fetch_scale += CALIBRATION_SMOOTHING * (ratio - self.fetch_scale)
+            if analyze_seconds is not None and prior.analyze_seconds > 0:
+                ratio = min(MAX_RATIO, max(MIN_RATIO, analyze_seconds / prior.analyze_seconds))
+                self.analyze_scale += CALIBRATION_SMOOTHING * (ratio - self.analyze_scale)
+            self.observations += 1
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "fetch_scale": round(self.fetch_scale, 3),
+            "analyze_scale": round(self.analyze_scale, 3),
+            "observations": self.observations,
+        }
+
+
+COST_MODEL = CostModel()
+
+
+def estimate_cost(fetch: dict[str, Any], profile: AnalysisProfile = STANDARD) -> CostEstimate:
+    """The predicted remaining cost of analyzing a fetch_repo() result."""
+    return COST_MODEL.predict(RepoStats.from_tree(fetch.get("tree_blobs") or [], profile))
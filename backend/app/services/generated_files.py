@@ -0,0 +1,113 @@
+"""Recognize generated, bundled and minified files from their first few KB.
+
+should_skip_path() only knows generated code by its path (.min.js, dist/,
+build/). A bundle committed under src/, protobuf or OpenAPI client output,
+framework migrations and lockfiles look like ordinary source files there,
+but they are large and were not written by hand. Running radon, the
+tree-sitter parsers and the regex scans on them dominates analysis time
+and skews the scores.
+
+batch_fetch_text() calls classify_path() before downloading a blob and
+classify_text() on each text as it arrives. Both look only at the path and
+the first HEAD_BYTES characters:
+
+- "lockfile": a dependency lockfile, by name. It is never downloaded.
+- "marker": a generator banner in a comment line near the top, such as
+  "// Code generated by protoc-gen-go. DO NOT EDIT." or "# Generated by
+  Django", an Alembic autogenerate comment, or the webpack runtime. Only
+  comment lines count, so docstrings and prose that talk about generated
+  code do not.
+- "minified": most of the head is in very long lines.
+- "encoded": the head has almost no whitespace and high character entropy
+  (embedded base64, data tables).
+
+A file with a reason is left out of content_by_path, so no analyzer reads
+it. Its path, reason and size go to fetch_result["generated_files"] and
+the analyzer reports them under findings.generated (generated_summary).
+"""
+
+import math
+import os
+import re
+from collections import Counter
+from typing import Any
+
+HEAD_BYTES = 4096
+HEADER_LINES = 10
+
+LOCKFILE_NAMES = frozenset({
+    "package-lock.json", "npm-shrinkwrap.json", "yarn.lock", "pnpm-lock.yaml", "bun.lockb",
+    "poetry.lock", "pipfile.lock", "pdm.lock", "uv.lock", "cargo.lock", "composer.lock",
+    "gemfile.lock", "go.sum",
+})
+
+# Lines anywhere in the head.
+_MARKER_RE = re.compile(r"^\s*# ### commands auto generated by Alembic|^/\*{6}/", re.MULTILINE)
+COMMENT_PREFIXES = ("#", "//", "/*", "*", "<!--", "--", ";")
+# Generator phrases, matched only in comment lines among the first HEADER_LINES.
+_BANNER_RE = re.compile(
+    r"@generated\b"
+    r"|\bCode generated\b.*\bDO NOT EDIT\b"
+    r"|\bGenerated by the protocol buffer compiler\b"
+    r"|\bGenerated by Django \d"
+    r"|\b(?:Autogenerated|Auto-generated|Automatically generated) by\b"
+    r"|<auto-generated"
+    r"|\bThis file (?:is|was|has been) (?:auto-?generated|automatically generated|generated)\b"
+    r"|\b[Gg]enerated\b.*\bDO NOT EDIT\b"
+    r"|\bDO NOT EDIT\b.*\b[Gg]enerated\b"
+)
+
+LONG_LINE = 500
+MINIFIED_LONG_SHARE = 0.5  # share of head characters in lines of LONG_LINE or more
+ENCODED_MIN_ENTROPY = 5.5  # bits per character; hand-written code is around 4.5 - 5
+ENCODED_MAX_WHITESPACE = 0.02
+ENCODED_MIN_CHARS = 1024
+
+SUMMARY_PATHS = 20
+
+
+def classify_path(path: str) -> str | None:
+    """'lockfile' if path is a dependency lockfile, else None."""
+    return "lockfile" if os.path.basename(path).lower() in LOCKFILE_NAMES else None
+
+
+def _entropy(text: str) -> float:
+    counts = Counter(text)
+    n = len(text)
+    return -sum(c / n * math.log2(c / n) for c in counts.values())
+
+
+def classify_text(text: str) -> str | None:
+    """Why text looks generated ('marker', 'minified' or 'encoded'), or None for hand-written code."""
+    head = text[:HEAD_BYTES]
+    if not head:
+        return None
+    if _MARKER_RE.search(head):
+        return "marker"
+    lines = head.split("\n")
+    for line in lines[:HEADER_LINES]:
+        stripped = line.strip()
+        if stripped.startswith(COMMENT_PREFIXES) and _BANNER_RE.search(stripped):
+            return "marker"
+    if sum(len(line) for line in lines if len(line) >= LONG_LINE) >= MINIFIED_LONG_SHARE * len(head):
+        return "minified"
+    if len(head) >= ENCODED_MIN_CHARS:
+        whitespace = sum(head.count(c) for c in " \t\n\r") / len(head)
+        if whitespace <= ENCODED_MAX_WHITESPACE and _entropy(head) >= ENCODED_MIN_ENTROPY:
+            return "encoded"
+    return None
+
+
+def generated_summary(generated: dict[str, dict[str, Any]] | None) -> dict[str, Any] | None:
+    """findings.generated: counts and bytes by reason and the first paths; None when nothing was excluded."""
+    if not generated:
+        return None
+    reasons: dict[str, int] = {}
+    for entry in generated.values():
+        reasons[entry["reason"]] = reasons.get(entry["reason"], 0) + 1
+    return {
+        "files": len(generated),
+        "bytes": sum(int(entry.get("size") or 0) for entry in generated.values()),
+        "reasons": reasons,
+        "paths": sorted(generated)[:SUMMARY_PATHS],
+    }
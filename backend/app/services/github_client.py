@@ -6,9 +6,10 @@ from urllib.parse import urlparse
 
 import requests
 
-from app.core.config import GITHUB_TOKEN
+from app.core.config import GITHUB_API_BASE, GITHUB_TOKEN
+from app.core.metrics import record_github_response
 
-API_BASE = "https://api.github.com"
+API_BASE = GITHUB_API_BASE
 MAX_FILE_BYTES = 200_000
 SNIPPET_CHARS = 4096
 TIMEOUT = 20
@@ -83,11 +84,16 @@ def parse_repo_url(url: str) -> dict[str, str | None]:
     return {"owner": owner, "repo": repo, "ref": ref}
 
 
+def _record_response(resp: requests.Response, *args: Any, **kwargs: Any) -> None:
+    record_github_response(resp.url, resp.status_code, len(resp.content))
+
+
 def _session() -> requests.Session:
     sess = requests.Session()
     sess.headers["Accept"] = "application/vnd.github.v3+json"
     if GITHUB_TOKEN:
         sess.headers["Authorization"] = f"Bearer {GITHUB_TOKEN}"
+    sess.hooks["response"].append(_record_response)
     return sess
 
 
@@ -152,6 +158,7 @@ def _get_with_retry(sess: requests.Session, url: str) -> requests.Response:
                 continue
             return r
         except (requests.Timeout, requests.ConnectionError) as e:
+            record_github_response(url, "error", 0)
             last_exc = e
             if attempt < RETRIES:
                 time.sleep(RETRY_BACKOFF)
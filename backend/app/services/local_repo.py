@@ -0,0 +1,322 @@
+"""Analyzer inputs from disk: a directory, a zip archive or a git repository. No code execution.
+
+load_source() builds the same (fetch_result, content_by_path) pair the API
+builds from GitHub: the tree with git blob shas, key files, workflows and
+test folders as in github_client.fetch_repo, then the contents of
+select_for_profile() read through batch_fetch_text() with the same limits.
+A GitHub URL is fetched from GitHub as usual.
+
+- Directory: the working tree as it is on disk, without SKIP_DIRS
+  (.git, node_modules, ...). Uncommitted files count.
+- Zip archive: its files, with a single top-level folder stripped.
+- Git repository (bare, or any repository when a ref is given): the tree
+  of ref (default HEAD), read with `git ls-tree` and `git cat-file --batch`.
+"""
+
+import hashlib
+import os
+import subprocess
+import zipfile
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from app.core.analysis_profiles import STANDARD, AnalysisProfile
+from app.core.repo_limits import MAX_FILE_BYTES, SKIP_DIRS, should_skip_path
+from app.services.analyzer import ReportResult, analyze
+from app.services.github_client import (
+    KEY_FILES_ROOT,
+    SNIPPET_CHARS,
+    TEST_FOLDER_PREFIXES,
+    fetch_repo,
+)
+from app.services.repo_content import batch_fetch_text
+from app.services.sampling import select_for_profile
+
+LOCAL_OWNER = "local"
+_HASH_BLOCK_BYTES = 1024 * 1024
+
+
+class LocalSourceError(ValueError):
+    pass
+
+
+@dataclass
+class LocalTree:
+    name: str
+    default_branch: str | None
+    blobs: list[dict[str, Any]]  # {path, sha, size}, as in a GitHub tree; sha None if never read
+    read: Callable[[str], bytes]  # sha -> file bytes
+
+
+def git_blob_sha(data: bytes) -> str:
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def _hash_file(path: Path, size: int) -> str:
+    """git_blob_sha of a file, read in blocks so large binaries are not loaded whole."""
+    h = hashlib.sha1(b"blob %d\0" % size)
+    with open(path, "rb") as f:
+        while block := f.read(_HASH_BLOCK_BYTES):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _hash_member(archive: zipfile.ZipFile, member: zipfile.ZipInfo) -> str:
+    """git_blob_sha of a zip member, decompressed in blocks."""
+    h = hashlib.sha1(b"blob %d\0" % member.file_size)
+    with archive.open(member) as f:
+        while block := f.read(_HASH_BLOCK_BYTES):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8", errors="replace")
+
+
+def is_github_url(source: str) -> bool:
+    return source.startswith(("http://", "https://"))
+
+
+def is_bare_git(path: Path) -> bool:
+    return path.is_dir() and (path / "HEAD").is_file() and (path / "objects").is_dir()
+
+
+def _directory_tree(root: Path) -> LocalTree:
+    """The working tree under root. Files that would never be read (skipped
+    paths, or larger than MAX_FILE_BYTES) are listed without a sha and not
+    hashed, so videos, datasets and build output cost one stat each.
+    """
+    files: dict[str, Path] = {}
+    blobs = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d.lower() not in SKIP_DIRS)
+        for filename in sorted(filenames):
+            full = Path(dirpath) / filename
+            if full.is_symlink() or not full.is_file():
+                continue
+            rel = full.relative_to(root).as_posix()
+            size = full.stat().st_size
+            if should_skip_path(rel) or size > MAX_FILE_BYTES:
+                blobs.append({"path": rel, "sha": None, "size": size})
+                continue
+            sha = _hash_file(full, size)
+            files[sha] = full
+            blobs.append({"path": rel, "sha": sha, "size": size})
+    return LocalTree(root.resolve().name, None, blobs, lambda sha: files[sha].read_bytes())
+
+
+def _zip_tree(path: Path) -> tuple[LocalTree, zipfile.ZipFile]:
+    """The tree of a zip archive, and the open archive it reads from.
+
+    Members that would never be read (skipped paths, or larger than
+    MAX_FILE_BYTES by their declared size) are listed without a sha and not
+    decompressed, so a zip bomb costs nothing.
+    """
+    archive = zipfile.ZipFile(path)
+    try:
+        return _zip_members(path, archive), archive
+    except BaseException:
+        archive.close()
+        raise
+
+
+def _zip_members(path: Path, archive: zipfile.ZipFile) -> LocalTree:
+    members = [m for m in archive.infolist() if not m.is_dir()]
+    tops = {m.filename.split("/", 1)[0] for m in members}
+    prefix = ""
+    if len(tops) == 1 and all("/" in m.filename for m in members):
+        prefix = next(iter(tops)) + "/"
+    by_sha: dict[str, zipfile.ZipInfo] = {}
+    blobs = []
+    for m in members:
+        rel = m.filename[len(prefix):]
+        if not rel or any(part.lower() in SKIP_DIRS for part in rel.split("/")[:-1]):
+            continue
+        if should_skip_path(rel) or m.file_size > MAX_FILE_BYTES:
+            blobs.append({"path": rel, "sha": None, "size": m.file_size})
+            continue
+        try:
+            sha = _hash_member(archive, m)
+        except (zipfile.BadZipFile, EOFError) as e:
+            raise LocalSourceError(f"{path}: {m.filename}: {e}") from e
+        by_sha[sha] = m
+        blobs.append({"path": rel, "sha": sha, "size": m.file_size})
+    name = prefix.rstrip("/") or path.stem
+    return LocalTree(name, None, blobs, lambda sha: archive.read(by_sha[sha]))
+
+
+def _git(path: Path, *args: str) -> bytes:
+    try:
+        return subprocess.run(
+            ["git", "-C", str(path), *args], check=True, capture_output=True
+        ).stdout
+    except FileNotFoundError as e:
+        raise LocalSourceError("git is not installed") from e
+    except subprocess.CalledProcessError as e:
+        raise LocalSourceError(_decode(e.stderr).strip() or f"git {args[0]} failed") from e
+
+
+class _CatFile:
+    """One `git cat-file --batch` process, reading blobs by sha."""
+
+    def __init__(self, path: Path):
+        self._proc = subprocess.Popen(
+            ["git", "-C", str(path), "cat-file", "--batch"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        )
+
+    def __call__(self, sha: str) -> bytes:
+        assert self._proc.stdin and self._proc.stdout
+        self._proc.stdin.write(sha.encode("ascii") + b"\n")
+        self._proc.stdin.flush()
+        header = self._proc.stdout.readline().split()
+        if len(header) != 3:
+            raise LocalSourceError(f"git object {sha} not found")
+        data = self._proc.stdout.read(int(header[2]))
+        self._proc.stdout.read(1)
+        return data
+
+    def close(self) -> None:
+        if self._proc.stdin:
+            self._proc.stdin.close()
+        self._proc.wait()
+
+
+def _git_tree(path: Path, ref: str) -> tuple[LocalTree, _CatFile]:
+    out = _git(path, "ls-tree", "-r", "-l", "--full-tree", "-z", ref)
+    blobs = []
+    for entry in out.split(b"\0"):
+        if not entry:
+            continue
+        meta, _, rel = entry.partition(b"\t")
+        _mode, kind, sha, size = meta.split()
+        if kind != b"blob":
+            continue
+        blobs.append({"path": _decode(rel), "sha": sha.decode("ascii"), "size": int(size)})
+    branch = None
+    if ref == "HEAD":
+        branch = _decode(_git(path, "rev-parse", "--abbrev-ref", "HEAD")).strip() or None
+    name = path.resolve().name
+    if name.endswith(".git"):
+        name = name[:-4]
+    if name == "":
+        name = "repo"
+    reader = _CatFile(path)
+    return LocalTree(name, branch if branch != "HEAD" else None, blobs, reader), reader
+
+
+def _file_entry(path: str, data: bytes, workflow: bool, size: int | None = None) -> dict[str, Any]:
+    """A key_files / workflows entry, shaped like github_client's. size overrides len(data) for unread files."""
+    size = len(data) if size is None else size
+    if size > MAX_FILE_BYTES:
+        return {"path": path, "found": True, "skipped": True, "reason": "exceeds 200KB", "size": size}
+    decoded = _decode(data)
+    truncated = len(decoded) > SNIPPET_CHARS
+    entry = {"path": path, "snippet": decoded[:SNIPPET_CHARS], "size": size, "truncated": truncated}
+    return entry if workflow else {"path": path, "found": True, **entry}
+
+
+def fetch_result(tree: LocalTree, owner: str = LOCAL_OWNER) -> dict[str, Any]:
+    """The fetch_repo() result for a local tree."""
+    blob_by_path = {b["path"]: b for b in tree.blobs}
+    paths = list(blob_by_path)
+
+    def entry(p: str, workflow: bool) -> dict[str, Any]:
+        blob = blob_by_path[p]
+        if blob["sha"] is None:  # listed but never read (see _directory_tree, _zip_tree)
+            return _file_entry(p, b"", workflow, size=blob["size"])
+        return _file_entry(p, tree.read(blob["sha"]), workflow)
+
+    workflows = [
+        p for p in paths
+        if p.startswith(".github/workflows/") and (p.endswith(".yml") or p.endswith(".yaml"))
+    ][:3]
+    return {
+        "owner": owner,
+        "name": tree.name,
+        "default_branch": tree.default_branch,
+        "tree_blobs": tree.blobs,
+        "tree_paths": paths,
+        "key_files": [entry(p, workflow=False) for p in KEY_FILES_ROOT if p in blob_by_path],
+        "workflows": [entry(p, workflow=True) for p in workflows],
+        "test_folders_detected": [
+            prefix.rstrip("/") for prefix in TEST_FOLDER_PREFIXES
+            if any(p == prefix.rstrip("/") or p.startswith(prefix) for p in paths)
+        ],
+    }
+
+
+def read_contents(
+    tree: LocalTree, fetch: dict[str, Any], profile: AnalysisProfile = STANDARD
+) -> dict[str, str]:
+    """content_by_path for the tree: select_for_profile, read under the profile's limits as in the API."""
+    def read_blob(owner: str, repo: str, sha: str) -> str:
+        return _decode(tree.read(sha)[:MAX_FILE_BYTES])
+
+    return batch_fetch_text(
+        fetch["owner"], fetch["name"], select_for_profile(tree.blobs, profile),
+        max_files=profile.max_files_fetch, max_total_bytes=profile.max_total_bytes, read_blob=read_blob,
+        generated=fetch.setdefault("generated_files", {}),
+    )
+
+
+def open_tree(source: str, ref: str | None = None) -> tuple[LocalTree, Callable[[], None] | None]:
+    """The tree of a directory, zip or git repository, and a close function for its reader (or None)."""
+    path = Path(source)
+    if not path.exists():
+        raise LocalSourceError(f"No such file or directory: {source}")
+    if path.is_file() and zipfile.is_zipfile(path):
+        tree, archive = _zip_tree(path)
+        return tree, archive.close
+    if is_bare_git(path) or (ref is not None and path.is_dir()):
+        tree, reader = _git_tree(path, ref or "HEAD")
+        return tree, reader.close
+    if path.is_dir():
+        return _directory_tree(path), None
+    raise LocalSourceError(f"Not a directory, zip archive or git repository: {source}")
+
+
+def load_source(
+    source: str, ref: str | None = None, profile: AnalysisProfile = STANDARD
+) -> tuple[dict[str, Any], dict[str, str]]:
+    """(fetch_result, content_by_path) for a directory, zip, git repository or GitHub URL."""
+    if is_github_url(source):
+        fetch = fetch_repo(source)
+        content = batch_fetch_text(
+            fetch.get("owner") or "", fetch.get("name") or "",
+            select_for_profile(fetch.get("tree_blobs") or [], profile),
+            max_files=profile.max_files_fetch, max_total_bytes=profile.max_total_bytes,
+            generated=fetch.setdefault("generated_files", {}),
+        )
+        return fetch, content
+
+    tree, closer = open_tree(source, ref)
+    try:
+        fetch = fetch_result(tree)
+        return fetch, read_contents(tree, fetch, profile)
+    finally:
+        if closer is not None:
+            closer()
+
+
+def analyze_source(source: str, ref: str | None = None, profile: AnalysisProfile = STANDARD) -> ReportResult:
+    fetch, content = load_source(source, ref, profile)
+    return analyze(fetch, content_by_path=content, profile=profile)
+
+
+def report_json(source: str, ref: str | None = None, profile: AnalysisProfile = STANDARD) -> dict[str, Any]:
+    """The analysis of source as a JSON-ready dict: the findings document plus where it came from."""
+    fetch, content = load_source(source, ref, profile)
+    result = analyze(fetch, content_by_path=content, profile=profile)
+    return {
+        "source": source,
+        "ref": ref,
+        "analysis_profile": profile.as_dict(),
+        "repo": f"{fetch.get('owner')}/{fetch.get('name')}",
+        "files": len(fetch.get("tree_blobs") or []),
+        "files_read": len(content),
+        **asdict(result),
+    }
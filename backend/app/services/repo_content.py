@@ -1,8 +1,12 @@
 """Selective content fetch by blob SHA with caching. Read-only, no code execution."""
 
+from collections.abc import Callable
 from typing import Any
 
+from app.core.metrics import record_cache
+from app.core.tracing import span
 from app.core.repo_limits import MAX_FILES_FETCH, MAX_TOTAL_BYTES, should_skip_path
+from app.services.generated_files import classify_path, classify_text
 from app.services.github_client import get_blob_text
 
 
@@ -17,16 +21,25 @@ def batch_fetch_text(
     blobs: list[dict[str, Any]],
     max_files: int = MAX_FILES_FETCH,
     max_total_bytes: int = MAX_TOTAL_BYTES,
+    read_blob: Callable[[str, str, str], str] | None = None,
+    generated: dict[str, dict[str, Any]] | None = None,
 ) -> dict[str, str]:
     """Fetch content for prioritized blobs until limits. Returns {path: decoded_text}.
     In-memory sha->text cache per request. Skips paths that should_skip_path.
+    read_blob(owner, repo, sha) replaces the GitHub blob fetch (local sources).
+    Lockfiles are not downloaded, and texts that look generated or minified
+    (app.services.generated_files) are left out of the result. They were
+    downloaded, so they count towards max_files and max_total_bytes like any
+    other file. Each is recorded in generated as {path: {"reason", "size"}}.
     """
+    read = read_blob or get_blob_text
     cache: dict[str, str] = {}
     result: dict[str, str] = {}
     total_bytes = 0
+    files = 0  # read, whether kept or left out as generated
 
     for b in blobs:
-        if len(result) >= max_files or total_bytes >= max_total_bytes:
+        if files >= max_files or total_bytes >= max_total_bytes:
             break
         path = b.get("path") or ""
         if should_skip_path(path):
@@ -34,15 +47,30 @@ def batch_fetch_text(
         sha = b.get("sha")
         if not sha:
             continue
-        if sha in cache:
+        reason = classify_path(path)
+        if reason:
+            if generated is not None:
+                generated[path] = {"reason": reason, "size": int(b.get("size") or 0)}
+            continue
+        hit = sha in cache
+        record_cache("blob", hit)
+        if hit:
             text = cache[sha]
         else:
             try:
-                text = get_blob_text(owner, repo, sha)
+                with span("fetch_blob", "file", path=path, bytes=b.get("size")):
+                    text = read(owner, repo, sha)
                 cache[sha] = text
             except Exception:
                 continue
+        files += 1
         n = len(text.encode("utf-8"))
+        reason = classify_text(text)
+        if reason:
+            total_bytes += n
+            if generated is not None:
+                generated[path] = {"reason": reason, "size": n}
+            continue
         if total_bytes + n > max_total_bytes:
             take = max_total_bytes - total_bytes
             if take > 0:
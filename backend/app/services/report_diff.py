@@ -0,0 +1,165 @@
+"""Diff two stored findings documents of the same repository.
+
+Both documents are indexed once: checks by key, non-passing findings by
+(check key, evidence file). Every comparison is then a dict lookup, so a
+diff costs O(checks) regardless of how the sections are ordered.
+
+A check's key is its id, except for individual code findings
+(code_finding_*), which are keyed by name, evidence file and snippet:
+older reports numbered them by position, so one inserted finding
+renumbered all that followed.
+
+Reports never change once finished, so a diff of two finished reports is
+cached by their body digests (DiffCache).
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any
+
+DIFF_CACHE_MAX_ENTRIES = 256
+
+_CHECK_FIELDS = ("status", "points")
+CODE_FINDING_PREFIX = "code_finding_"
+
+
+def _check_key(check: dict[str, Any]) -> str:
+    """The check's id; for a code finding, its name, evidence file and snippet."""
+    check_id = check["id"]
+    if not check_id.startswith(CODE_FINDING_PREFIX):
+        return check_id
+    evidence = check.get("evidence") if isinstance(check.get("evidence"), dict) else {}
+    parts = (check.get("name"), evidence.get("file"), evidence.get("snippet"))
+    return "\0".join((CODE_FINDING_PREFIX, *map(str, parts)))
+
+
+def _checks_by_id(findings: Any) -> dict[str, tuple[str, dict[str, Any]]]:
+    """check key (_check_key) -> (section name, check). Later duplicates of a key win."""
+    index: dict[str, tuple[str, dict[str, Any]]] = {}
+    if not isinstance(findings, dict):
+        return index
+    for section in findings.get("sections") or []:
+        name = section.get("name") if isinstance(section, dict) else None
+        for check in (section.get("checks") or []) if isinstance(section, dict) else []:
+            if isinstance(check, dict) and check.get("id"):
+                index[_check_key(check)] = (name, check)
+    return index
+
+
+def _evidence_file(check: dict[str, Any]) -> str | None:
+    evidence = check.get("evidence")
+    return evidence.get("file") if isinstance(evidence, dict) else None
+
+
+def _findings_by_key(
+    checks: dict[str, tuple[str, dict[str, Any]]]
+) -> dict[tuple[str, str | None], tuple[str, dict[str, Any]]]:
+    """(check key, evidence file) -> (section, check) for every check that did not pass."""
+    return {
+        (key, _evidence_file(check)): (section, check)
+        for key, (section, check) in checks.items()
+        if check.get("status") != "pass"
+    }
+
+
+def _check_summary(section: str | None, check: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "id": check.get("id"),
+        "name": check.get("name"),
+        "section": section,
+        "status": check.get("status"),
+        "points": check.get("points"),
+    }
+
+
+def _finding(section: str | None, check: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "check_id": check.get("id"),
+        "name": check.get("name"),
+        "section": section,
+        "status": check.get("status"),
+        "evidence": check.get("evidence"),
+    }
+
+
+def _delta(base: Any, head: Any) -> dict[str, Any]:
+    numeric = isinstance(base, (int, float)) and isinstance(head, (int, float))
+    return {"base": base, "head": head, "delta": head - base if numeric else None}
+
+
+def diff_findings(base: Any, head: Any) -> dict[str, Any]:
+    """What changed from base to head: checks, category scores and findings.
+
+    - checks.added / checks.removed: check ids present on only one side.
+    - checks.changed: ids on both sides whose status or points differ.
+    - new_findings / resolved_findings: non-passing checks keyed by
+      (check id, evidence file), so a check that keeps failing on a different
+      file counts as one resolved and one new finding.
+    """
+    base_checks = _checks_by_id(base)
+    head_checks = _checks_by_id(head)
+
+    added = [_check_summary(*head_checks[i]) for i in head_checks if i not in base_checks]
+    removed = [_check_summary(*base_checks[i]) for i in base_checks if i not in head_checks]
+    changed = []
+    for check_id, (section, check) in head_checks.items():
+        old = base_checks.get(check_id)
+        if old is None:
+            continue
+        fields = {
+            f: {"base": old[1].get(f), "head": check.get(f)}
+            for f in _CHECK_FIELDS
+            if old[1].get(f) != check.get(f)
+        }
+        if fields:
+            changed.append({"id": check.get("id"), "name": check.get("name"), "section": section, **fields})
+
+    base_findings = _findings_by_key(base_checks)
+    head_findings = _findings_by_key(head_checks)
+
+    base_scores = (base.get("category_scores") if isinstance(base, dict) else None) or {}
+    head_scores = (head.get("category_scores") if isinstance(head, dict) else None) or {}
+    categories = list(dict.fromkeys([*base_scores, *head_scores]))
+
+    return {
+        "overall_score": _delta(
+            base.get("overall_score") if isinstance(base, dict) else None,
+            head.get("overall_score") if isinstance(head, dict) else None,
+        ),
+        "category_scores": {
+            c: _delta(base_scores.get(c), head_scores.get(c)) for c in categories
+        },
+        "checks": {"added": added, "removed": removed, "changed": changed},
+        "new_findings": [_finding(*v) for k, v in head_findings.items() if k not in base_findings],
+        "resolved_findings": [_finding(*v) for k, v in base_findings.items() if k not in head_findings],
+    }
+
+
+class DiffCache:
+    """Bounded LRU of encoded diff bodies, keyed by the two reports' body digests."""
+
+    def __init__(self, max_entries: int = DIFF_CACHE_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple[str, str]) -> bytes | None:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def put(self, key: tuple[str, str], body: bytes) -> None:
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
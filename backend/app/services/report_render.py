@@ -0,0 +1,100 @@
+"""Render stored findings into the legacy (v1) API shape on read. No copying of findings trees.
+
+Only the structured (v2) findings are stored. The v1 shape differs solely in
+that each check's `recommendation` is a flat string, so instead of building a
+second document we walk the stored one and emit JSON text, collapsing
+recommendations as they pass by.
+"""
+
+import json
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+STREAM_CHUNK_BYTES = 16 * 1024
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def legacy_recommendation(rec: Any) -> Any:
+    """Collapse a structured recommendation to '{what} {how}'; strings pass through."""
+    if isinstance(rec, dict):
+        return f"{rec.get('what') or ''} {rec.get('how') or ''}".strip()
+    return rec
+
+
+def _iter_value(value: Any) -> Iterator[str]:
+    return _encoder.iterencode(value)
+
+
+def _iter_object(obj: dict[str, Any], child: Callable[[str, Any], Iterable[str]]) -> Iterator[str]:
+    yield "{"
+    for i, (key, value) in enumerate(obj.items()):
+        if i:
+            yield ","
+        yield _encoder.encode(key)
+        yield ":"
+        yield from child(key, value)
+    yield "}"
+
+
+def _iter_array(items: Any, child: Callable[[Any], Iterable[str]]) -> Iterator[str]:
+    if not isinstance(items, list):
+        yield from _iter_value(items)
+        return
+    yield "["
+    for i, item in enumerate(items):
+        if i:
+            yield ","
+        yield from child(item)
+    yield "]"
+
+
+def _iter_check(check: Any) -> Iterator[str]:
+    if not isinstance(check, dict):
+        return _iter_value(check)
+    return _iter_object(
+        check,
+        lambda k, v: _iter_value(legacy_recommendation(v) if k == "recommendation" else v),
+    )
+
+
+def iter_legacy_section(section: Any) -> Iterator[str]:
+    """JSON text of one findings section with its checks' recommendations in v1 form."""
+    if not isinstance(section, dict):
+        return _iter_value(section)
+    return _iter_object(
+        section,
+        lambda k, v: _iter_array(v, _iter_check) if k == "checks" else _iter_value(v),
+    )
+
+
+def iter_legacy_findings(findings: Any) -> Iterator[str]:
+    """JSON text of findings with every sections[].checks[].recommendation in v1 form."""
+    if not isinstance(findings, dict):
+        return _iter_value(findings)
+    return _iter_object(
+        findings,
+        lambda k, v: _iter_array(v, iter_legacy_section) if k == "sections" else _iter_value(v),
+    )
+
+
+def iter_legacy_detail(detail: dict[str, Any]) -> Iterator[str]:
+    """JSON text of a report detail dict whose `findings_json` is rendered via iter_legacy_findings."""
+    return _iter_object(
+        detail,
+        lambda k, v: iter_legacy_findings(v) if k == "findings_json" else _iter_value(v),
+    )
+
+
+def buffered(chunks: Iterable[str], size: int = STREAM_CHUNK_BYTES) -> Iterator[bytes]:
+    """Coalesce many small text chunks into UTF-8 blocks of roughly `size` bytes."""
+    buf: list[str] = []
+    n = 0
+    for chunk in chunks:
+        buf.append(chunk)
+        n += len(chunk)
+        if n >= size:
+            yield "".join(buf).encode("utf-8")
+            buf, n = [], 0
+    if buf:
+        yield "".join(buf).encode("utf-8")
@@ -0,0 +1,148 @@
+"""Optional compression of stored report bodies (reports.body_v2).
+
+Encodings (reports.body_encoding):
+- None: the JSON bytes as served.
+- "gzip": a gzip member. Served as-is with Content-Encoding: gzip to clients
+  that accept it, and decompressed while streaming to those that don't.
+- "zdict": raw deflate primed with a preset dictionary trained on past
+  report bodies (reports.body_dict_id -> compression_dictionaries). Report
+  bodies repeat the same keys, check ids and recommendation texts, so a
+  dictionary of those compresses small bodies much better than gzip alone.
+  Browsers cannot decode it, so it is always decompressed server-side.
+
+Dictionaries are immutable once stored: rows keep pointing at the one they
+were compressed with, and a newly trained dictionary only affects new writes.
+"""
+
+import gzip
+import zlib
+from collections import Counter
+from collections.abc import Iterable, Iterator
+
+CODECS = ("none", "gzip", "zdict")
+COMPRESSION_LEVEL = 6
+# zlib uses at most the last 32 KiB of a preset dictionary.
+MAX_DICTIONARY_BYTES = 32 * 1024
+DECOMPRESS_CHUNK_BYTES = 64 * 1024
+
+_RAW_DEFLATE = -zlib.MAX_WBITS
+_GZIP = 16 + zlib.MAX_WBITS
+
+
+class UnknownEncodingError(ValueError):
+    pass
+
+
+def encode_body(
+    raw: bytes, codec: str, dictionary: tuple[int, bytes] | None = None
+) -> tuple[bytes, str | None, int | None]:
+    """Compress raw for storage. Returns (stored bytes, body_encoding, body_dict_id).
+
+    "zdict" without a trained dictionary falls back to gzip.
+    """
+    if codec == "none":
+        return raw, None, None
+    if codec == "zdict" and dictionary is not None:
+        dict_id, zdict = dictionary
+        c = zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, _RAW_DEFLATE, zdict=zdict)
+        return c.compress(raw) + c.flush(), "zdict", dict_id
+    if codec in ("gzip", "zdict"):
+        return gzip.compress(raw, compresslevel=COMPRESSION_LEVEL, mtime=0), "gzip", None
+    raise UnknownEncodingError(f"Unknown report body codec: {codec}")
+
+
+def _decompressor(encoding: str | None, zdict: bytes | None):
+    if encoding == "gzip":
+        return zlib.decompressobj(_GZIP)
+    if encoding == "zdict":
+        if zdict is None:
+            raise UnknownEncodingError("zdict body without its dictionary")
+        return zlib.decompressobj(_RAW_DEFLATE, zdict=zdict)
+    raise UnknownEncodingError(f"Unknown report body encoding: {encoding}")
+
+
+def iter_decoded(
+    stored: bytes, encoding: str | None, zdict: bytes | None = None,
+    chunk_size: int = DECOMPRESS_CHUNK_BYTES,
+) -> Iterator[bytes]:
+    """Yield the uncompressed body in pieces of at most about chunk_size bytes."""
+    if encoding is None:
+        yield stored
+        return
+    d = _decompressor(encoding, zdict)
+    view = memoryview(stored)
+    for start in range(0, len(view), chunk_size):
+        data = view[start:start + chunk_size]
+        while data:
+            out = d.decompress(data, chunk_size)
+            if out:
+                yield out
+            data = d.unconsumed_tail
+    tail = d.flush()
+    if tail:
+        yield tail
+
+
+def decode_body(stored: bytes, encoding: str | None, zdict: bytes | None = None) -> bytes:
+    if encoding is None:
+        return stored
+    return b"".join(iter_decoded(stored, encoding, zdict))
+
+
+def _fragments(body: bytes) -> set[bytes]:
+    """The distinct quoted JSON strings (keys and values) in one body, with their quotes."""
+    out = set()
+    for i, part in enumerate(body.split(b'"')):
+        if i % 2 and 2 <= len(part) <= 512:
+            out.add(b'"' + part + b'"')
+    return out
+
+
+def train_dictionary(samples: Iterable[bytes], size: int = MAX_DICTIONARY_BYTES) -> bytes:
+    """Build a preset dictionary from sample bodies.
+
+    Keeps the quoted strings that occur in at least two samples, scored by
+    how many bytes they would save (document frequency x length). zlib
+    matches nearer the end of the dictionary with shorter distances, so the
+    most valuable fragments go last.
+    """
+    df: Counter[bytes] = Counter()
+    n = 0
+    for body in samples:
+        df.update(_fragments(body))
+        n += 1
+    if n == 0:
+        return b""
+    ranked = sorted(
+        (f for f, count in df.items() if count >= 2 or n == 1),
+        key=lambda f: (df[f] * len(f), f),
+        reverse=True,
+    )
+    picked: list[bytes] = []
+    total = 0
+    for fragment in ranked:
+        if total + len(fragment) > size:
+            continue
+        picked.append(fragment)
+        total += len(fragment)
+    return b"".join(reversed(picked))
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """Whether an Accept-Encoding header allows gzip (explicitly or via *) with q > 0."""
+    if not accept_encoding:
+        return False
+    allowed = {}
+    for item in accept_encoding.split(","):
+        token, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        allowed[token.strip().lower()] = q
+    if "gzip" in allowed:
+        return allowed["gzip"] > 0
+    return allowed.get("*", 0.0) > 0
@@ -0,0 +1,210 @@
+"""Stratified sampling of code files, and extrapolation of per-file metrics to the whole tree.
+
+The code files of a tree are every fetchable blob in candidate_selector
+buckets D and F. Files named like an entry point (main.py, index.ts, ...)
+are always read. The rest are split into strata by directory (two levels,
+or one when that gives more than MAX_STRATA) and extension.
+
+With profile.sampling == "stratified", select_for_profile() spends the
+budget left after the docs, CI, manifest, entry and security files on a
+random sample of each stratum. Each stratum gets at least one file, and the
+rest is split in proportion to stratum size. The seed comes from the tree's
+blob shas, so the same tree always gives the same sample. The sample is
+shuffled so a byte limit in batch_fetch_text() cuts it at random rather
+than by path.
+
+sampling_summary() then turns per-file metric counts of the files actually
+read into whole-tree totals with the stratified estimator:
+T = sum(N_h * mean_h), Var(T) = sum(N_h^2 * (1 - n_h/N_h) * s_h^2 / n_h).
+A stratum with a single file read borrows the variance of its extension
+across strata. A stratum with none read (the byte limit ran out) borrows
+that extension's mean as well. Intervals are normal approximations at
+CONFIDENCE and never go below what was observed.
+"""
+
+import hashlib
+import math
+import os
+import random
+from collections import defaultdict
+from typing import Any
+
+from app.core.analysis_profiles import AnalysisProfile
+from app.services.candidate_selector import bucket_blobs, is_entry_name, select_candidates
+
+MAX_STRATA = 48
+CONFIDENCE = 0.95
+_Z = 1.96  # two-sided normal quantile for CONFIDENCE
+ENTRY_STRATUM = "(entry points)"
+# Extensions the complexity and smell analyzers read; other code files carry no metrics.
+METRIC_EXTENSIONS = frozenset({".py", ".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx"})
+# Per-file counts the analyzer records (see analyzer._complexity_checks and _smells_checks).
+METRICS = ("complex_functions", "very_complex_functions", "smells", "high_severity_smells", "any_usages")
+
+Stratum = tuple[str, str]  # (directory, extension)
+
+
+def _extension(path: str) -> str:
+    return os.path.splitext(path)[1].lower()
+
+
+def _directory(path: str, depth: int) -> str:
+    return "/".join(path.split("/")[:-1][:depth]) or "."
+
+
+def code_population(tree_blobs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Blobs in buckets D and F: the code files sampling chooses from, in path order."""
+    buckets = bucket_blobs(tree_blobs)
+    return sorted(buckets[3] + buckets[5], key=lambda b: b["path"])
+
+
+def stratify(blobs: list[dict[str, Any]]) -> dict[Stratum, list[dict[str, Any]]]:
+    """Group blobs by (directory, extension); entry points form one stratum per extension.
+
+    The directory depth is chosen from the other files alone, so selection
+    (which leaves entry points out) and estimation agree on the strata.
+    """
+    strata: dict[Stratum, list[dict[str, Any]]] = defaultdict(list)
+    entries = [b for b in blobs if is_entry_name(b["path"])]
+    others = [b for b in blobs if not is_entry_name(b["path"])]
+    for depth in (2, 1):
+        strata = defaultdict(list)
+        for b in others:
+            strata[(_directory(b["path"], depth), _extension(b["path"]))].append(b)
+        if len(strata) <= MAX_STRATA:
+            break
+    for b in entries:
+        strata[(ENTRY_STRATUM, _extension(b["path"]))].append(b)
+    return dict(strata)
+
+
+def _tree_seed(blobs: list[dict[str, Any]]) -> int:
+    digest = hashlib.sha1("\n".join(sorted(b["sha"] for b in blobs)).encode("ascii")).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def allocate(sizes: dict[Stratum, int], budget: int) -> dict[Stratum, int]:
+    """Files to draw per stratum: one each (largest strata first), the rest by largest remainder."""
+    total = sum(sizes.values())
+    if budget >= total:
+        return dict(sizes)
+    order = sorted(sizes, key=lambda k: (-sizes[k], k))
+    alloc = {k: 0 for k in sizes}
+    for k in order[:budget]:
+        alloc[k] = 1
+    spare = budget - len(order)
+    if spare <= 0:
+        return alloc
+    rest = total - len(order)
+    shares = {k: spare * (sizes[k] - 1) / rest for k in order}
+    for k in order:
+        alloc[k] += int(shares[k])
+    left = budget - sum(alloc.values())
+    for k in sorted(order, key=lambda k: (-(shares[k] - int(shares[k])), k))[:left]:
+        alloc[k] += 1
+    return alloc
+
+
+def stratified_candidates(tree_blobs: list[dict[str, Any]], max_files: int) -> list[dict[str, Any]]:
+    """Buckets A, B, C, E and entry points in full, then a stratified sample of the other code files."""
+    buckets = bucket_blobs(tree_blobs)
+    code = buckets[3] + buckets[5]
+    entries = [b for b in buckets[3] if is_entry_name(b["path"])]
+    fixed = buckets[0] + buckets[1] + buckets[2] + entries + buckets[4]
+    strata = stratify([b for b in code if not is_entry_name(b["path"])])
+    alloc = allocate({k: len(v) for k, v in strata.items()}, max(0, max_files - len(fixed)))
+    rng = random.Random(_tree_seed(code))
+    sample = [b for k in sorted(strata) for b in rng.sample(strata[k], alloc[k])]
+    rng.shuffle(sample)
+    return fixed + sample
+
+
+def select_for_profile(tree_blobs: list[dict[str, Any]], profile: AnalysisProfile) -> list[dict[str, Any]]:
+    """The blobs to fetch, in order, under the profile's sampling mode."""
+    if profile.sampling == "stratified":
+        return stratified_candidates(tree_blobs, profile.max_files_fetch)
+    return select_candidates(tree_blobs, profile.max_bucket_f)
+
+
+def _mean_var(values: list[int]) -> tuple[float, float]:
+    n = len(values)
+    mean = sum(values) / n
+    var = sum((v - mean) ** 2 for v in values) / (n - 1) if n > 1 else 0.0
+    return mean, var
+
+
+def _estimate_total(
+    strata: dict[Stratum, list[str]], values: dict[str, int], by_extension: dict[str, list[int]]
+) -> tuple[float, float]:
+    """Stratified estimate of the total and its variance. values holds the files read."""
+    overall = [v for vs in by_extension.values() for v in vs]
+    total = 0.0
+    variance = 0.0
+    for (_, ext), paths in strata.items():
+        big_n = len(paths)
+        seen = [values[p] for p in paths if p in values]
+        pooled = by_extension.get(ext) or overall
+        pooled_mean, pooled_var = _mean_var(pooled)
+        n = len(seen)
+        if n == 0:
+            total += big_n * pooled_mean
+            variance += big_n ** 2 * pooled_var / len(pooled)
+            continue
+        mean, var = _mean_var(seen)
+        if n == 1:
+            var = pooled_var
+        total += big_n * mean
+        variance += big_n ** 2 * (1 - n / big_n) * var / n
+    return total, variance
+
+
+def sampling_summary(
+    tree_blobs: list[dict[str, Any]],
+    content_by_path: dict[str, str],
+    file_metrics: dict[str, dict[str, int]],
+    profile: AnalysisProfile,
+) -> dict[str, Any] | None:
+    """How much of the tree's code was read and, for a stratified sample, whole-tree metric estimates.
+
+    Returns None when the tree has no code files with metrics. Otherwise
+    {mode, code_files, code_files_read, fraction} and, in stratified mode,
+    {strata, confidence, estimates: {metric: {observed, estimate, ci_low, ci_high}}}.
+    A priority sample is not random, so it gets no estimates.
+    """
+    code = code_population(tree_blobs)
+    population = [b for b in code if _extension(b["path"]) in METRIC_EXTENSIONS]
+    if not population:
+        return None
+    read = [b["path"] for b in population if b["path"] in content_by_path]
+    summary: dict[str, Any] = {
+        "mode": profile.sampling,
+        "code_files": len(population),
+        "code_files_read": len(read),
+        "fraction": round(len(read) / len(population), 4),
+    }
+    if profile.sampling != "stratified":
+        return summary
+
+    strata = {k: [b["path"] for b in v] for k, v in stratify(code).items() if k[1] in METRIC_EXTENSIONS}
+    summary["strata"] = len(strata)
+    summary["confidence"] = CONFIDENCE
+    if not read:
+        summary["estimates"] = None
+        return summary
+    estimates = {}
+    for metric in METRICS:
+        values = {p: (file_metrics.get(p) or {}).get(metric, 0) for p in read}
+        by_extension: dict[str, list[int]] = defaultdict(list)
+        for p, v in values.items():
+            by_extension[_extension(p)].append(v)
+        total, variance = _estimate_total(strata, values, by_extension)
+        observed = sum(values.values())
+        margin = _Z * math.sqrt(variance)
+        estimates[metric] = {
+            "observed": observed,
+            "estimate": round(total, 1),
+            "ci_low": round(max(observed, total - margin), 1),
+            "ci_high": round(total + margin, 1),
+        }
+    summary["estimates"] = estimates
+    return summary
@@ -0,0 +1,145 @@
+"""Index of known scaffold and vendored-library files, by git blob sha.
+
+Many repositories start from create-next-app, Vite, the FastAPI templates
+and the like, or vendor a library. A GitHub tree gives every file's blob
+sha, so an unmodified template file can be recognized without downloading
+it. candidate_selector leaves known code files out of the fetch, and the
+analyzer leaves them out of scoring and reports them separately. It uses
+the per-file metrics stored here, computed when the file was indexed.
+
+The index is one JSON file (SCAFFOLD_INDEX), built from local checkouts of
+templates with `python -m app.cli scaffold-add NAME PATH`:
+
+    {"version": 1,
+     "scaffolds": {name: {"source": ..., "files": n, "added_at": ...}},
+     "blobs": {sha: {"path": ..., "size": n, "scaffolds": [name, ...], "metrics": {...}}}}
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from app.core.config import SCAFFOLD_INDEX
+
+INDEX_VERSION = 1
+
+
+class ScaffoldIndexError(ValueError):
+    pass
+
+
+class ScaffoldIndex:
+    def __init__(
+        self,
+        scaffolds: dict[str, dict[str, Any]] | None = None,
+        blobs: dict[str, dict[str, Any]] | None = None,
+    ):
+        self.scaffolds = scaffolds or {}
+        self.blobs = blobs or {}
+
+    def __contains__(self, sha: object) -> bool:
+        return sha in self.blobs
+
+    def __len__(self) -> int:
+        return len(self.blobs)
+
+    def get(self, sha: str) -> dict[str, Any] | None:
+        return self.blobs.get(sha)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ScaffoldIndex":
+        """The index in path; an empty one if the file does not exist yet."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        except ValueError as e:
+            raise ScaffoldIndexError(f"{path} is not a scaffold index: {e}") from e
+        if data.get("version") != INDEX_VERSION:
+            raise ScaffoldIndexError(f"{path}: unsupported index version {data.get('version')!r}")
+        return cls(data.get("scaffolds"), data.get("blobs"))
+
+    def save(self, path: str | Path) -> None:
+        """Write the index atomically."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": INDEX_VERSION, "scaffolds": self.scaffolds, "blobs": self.blobs},
+                f, separators=(",", ":"), sort_keys=True,
+            )
+        os.replace(tmp, path)
+
+    def add(
+        self,
+        name: str,
+        source: str,
+        blobs: list[dict[str, Any]],
+        metrics: dict[str, dict[str, int]] | None = None,
+    ) -> int:
+        """Record a scaffold's files ({path, sha, size}), replacing an earlier version of it.
+
+        metrics maps path to that file's per-file counts. Returns the number of files.
+        """
+        self.remove(name)
+        for b in blobs:
+            entry = self.blobs.setdefault(b["sha"], {
+                "path": b["path"],
+                "size": int(b.get("size") or 0),
+                "scaffolds": [],
+                "metrics": (metrics or {}).get(b["path"], {}),
+            })
+            entry["scaffolds"].append(name)
+        self.scaffolds[name] = {
+            "source": source,
+            "files": len(blobs),
+            "added_at": datetime.now(timezone.utc).isoformat(),
+        }
+        return len(blobs)
+
+    def remove(self, name: str) -> bool:
+        """Drop a scaffold, and every blob no other scaffold has. False if it was not indexed."""
+        if self.scaffolds.pop(name, None) is None:
+            return False
+        for sha in list(self.blobs):
+            names = self.blobs[sha]["scaffolds"]
+            if name in names:
+                names.remove(name)
+                if not names:
+                    del self.blobs[sha]
+        return True
+
+    def summary(self, blobs: list[dict[str, Any]]) -> dict[str, Any] | None:
+        """What the known blobs among blobs add up to: file and byte counts, per scaffold, and metrics.
+
+        None when none is known.
+        """
+        files = 0
+        size = 0
+        by_scaffold: dict[str, int] = {}
+        metrics: dict[str, int] = {}
+        for b in blobs:
+            entry = self.blobs.get(b.get("sha") or "")
+            if entry is None:
+                continue
+            files += 1
+            size += int(b.get("size") or entry["size"])
+            for name in entry["scaffolds"]:
+                by_scaffold[name] = by_scaffold.get(name, 0) + 1
+            for metric, n in entry["metrics"].items():
+                metrics[metric] = metrics.get(metric, 0) + n
+        if not files:
+            return None
+        return {"files": files, "bytes": size, "scaffolds": by_scaffold, "metrics": metrics}
+
+
+@lru_cache(maxsize=1)
+def get_scaffold_index() -> ScaffoldIndex:
+    """The process-wide index in SCAFFOLD_INDEX; empty when it is not configured."""
+    if not SCAFFOLD_INDEX:
+        return ScaffoldIndex()
+    return ScaffoldIndex.load(SCAFFOLD_INDEX)
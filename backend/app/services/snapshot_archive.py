@@ -0,0 +1,239 @@
+"""Append-only archive of analysis inputs, for re-running analyze() without GitHub.
+
+Each analysis saves a snapshot: the fetch_repo() result (tree, key files,
+workflows, test folders) and the sampled file contents it was analyzed with.
+Two files live in the archive directory:
+
+- snapshots.dat: records, each a header (magic, kind, 20-byte key, length)
+  followed by the payload. A "b" record is one file's UTF-8 text, keyed by
+  the SHA-1 of those bytes, and is written once however many snapshots use
+  it. An "s" record is a snapshot manifest, keyed by report id: zlib JSON of
+  {repo_url, saved_at, profile, fetch, content: {path: blob key}}.
+- snapshots.idx: fixed-size entries (kind, key, payload offset, length), one
+  per record, in write order.
+
+Writers append data before index entries under an exclusive flock, so
+several API workers can share one archive and a reader never sees an index
+entry without its data. A torn tail (a crash mid-write) is ignored by
+readers and cut off by the next writer. Readers
+mmap snapshots.dat and decode file texts straight from the mapping.
+"""
+
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import uuid
+import zlib
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from app.core.config import SNAPSHOT_DIR
+
+DATA_FILE = "snapshots.dat"
+INDEX_FILE = "snapshots.idx"
+MAGIC = b"SCS1"
+BLOB = b"b"
+SNAPSHOT = b"s"
+
+_HEADER = struct.Struct("<4sc20sQ")  # magic, kind, key, payload length
+_ENTRY = struct.Struct("<c20sQQ")  # kind, key, payload offset, payload length
+_KEY_BYTES = 20
+
+
+class SnapshotNotFoundError(KeyError):
+    pass
+
+
+class CorruptArchiveError(ValueError):
+    pass
+
+
+class Snapshot(NamedTuple):
+    repo_url: str
+    fetch: dict[str, Any]
+    content: dict[str, str]
+    profile: dict[str, Any] | None  # AnalysisProfile.as_dict() of the analysis
+
+
+def _snapshot_key(report_id: uuid.UUID) -> bytes:
+    return report_id.bytes.ljust(_KEY_BYTES, b"\0")
+
+
+class SnapshotArchive:
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._data_path = self.directory / DATA_FILE
+        self._index_path = self.directory / INDEX_FILE
+        if self._data_path.exists() and not self._index_path.exists():
+            rebuild_index(self.directory)
+        self._data_path.touch()
+        self._index_path.touch()
+        self._lock = threading.Lock()
+        # kind + key -> (payload offset, length)
+        self._entries: dict[bytes, tuple[int, int]] = {}
+        self._snapshots: list[bytes] = []
+        self._index_pos = 0
+        self._end = 0  # end of the last indexed record in snapshots.dat
+        self._map: mmap.mmap | None = None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+
+    def __enter__(self) -> "SnapshotArchive":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _refresh(self) -> None:
+        """Read index entries appended since the last refresh (by any process)."""
+        with open(self._index_path, "rb") as f:
+            f.seek(self._index_pos)
+            tail = f.read()
+        usable = len(tail) - len(tail) % _ENTRY.size
+        for kind, key, offset, length in _ENTRY.iter_unpack(tail[:usable]):
+            if kind + key not in self._entries and kind == SNAPSHOT:
+                self._snapshots.append(key)
+            self._entries[kind + key] = (offset, length)
+            self._end = max(self._end, offset + length)
+        self._index_pos += usable
+
+    def _view(self, offset: int, length: int) -> memoryview:
+        if self._map is None or offset + length > len(self._map):
+            if self._map is not None:
+                self._map.close()
+            with open(self._data_path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if offset + length > len(self._map):
+                raise CorruptArchiveError(f"Index points past the end of {self._data_path}")
+        return memoryview(self._map)[offset:offset + length]
+
+    def report_ids(self) -> list[uuid.UUID]:
+        """Report ids with a snapshot, oldest first."""
+        with self._lock:
+            self._refresh()
+            return [uuid.UUID(bytes=key[:16]) for key in self._snapshots]
+
+    def __contains__(self, report_id: uuid.UUID) -> bool:
+        with self._lock:
+            self._refresh()
+            return SNAPSHOT + _snapshot_key(report_id) in self._entries
+
+    def save(
+        self,
+        report_id: uuid.UUID,
+        repo_url: str,
+        fetch: dict[str, Any],
+        content: dict[str, str],
+        profile: dict[str, Any] | None = None,
+    ) -> int:
+        """Append a snapshot, writing only file texts not already archived. Returns bytes appended."""
+        blobs: dict[bytes, bytes] = {}
+        refs: dict[str, str] = {}
+        for path, text in content.items():
+            data = text.encode("utf-8", errors="surrogatepass")
+            key = hashlib.sha1(data).digest()
+            blobs[key] = data
+            refs[path] = key.hex()
+        manifest = zlib.compress(json.dumps({
+            "repo_url": repo_url,
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+            "profile": profile,
+            "fetch": fetch,
+            "content": refs,
+        }, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+        with self._lock, open(self._index_path, "ab") as index, open(self._data_path, "ab") as data_file:
+            fcntl.flock(index.fileno(), fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                records = [(BLOB, key, data) for key, data in blobs.items() if BLOB + key not in self._entries]
+                records.append((SNAPSHOT, _snapshot_key(report_id), manifest))
+                # Bytes past the last indexed record are a torn or unindexed
+                # write; drop them so every record stays reachable by a scan.
+                if os.fstat(data_file.fileno()).st_size > self._end:
+                    os.ftruncate(data_file.fileno(), self._end)
+                offset = start = self._end
+                entries = []
+                for kind, key, payload in records:
+                    data_file.write(_HEADER.pack(MAGIC, kind, key, len(payload)))
+                    data_file.write(payload)
+                    offset += _HEADER.size
+                    entries.append(_ENTRY.pack(kind, key, offset, len(payload)))
+                    offset += len(payload)
+                data_file.flush()
+                os.fsync(data_file.fileno())
+                index.write(b"".join(entries))
+                index.flush()
+            finally:
+                fcntl.flock(index.fileno(), fcntl.LOCK_UN)
+        return offset - start
+
+    def load(self, report_id: uuid.UUID) -> Snapshot:
+        """The inputs saved for report_id."""
+        with self._lock:
+            self._refresh()
+            found = self._entries.get(SNAPSHOT + _snapshot_key(report_id))
+            if found is None:
+                raise SnapshotNotFoundError(f"No snapshot for report {report_id}")
+            with self._view(*found) as view:
+                manifest = json.loads(zlib.decompress(view))
+            content = {}
+            for path, key in manifest["content"].items():
+                blob = self._entries.get(BLOB + bytes.fromhex(key))
+                if blob is None:
+                    raise CorruptArchiveError(f"Snapshot {report_id} references missing blob {key}")
+                with self._view(*blob) as view:
+                    content[path] = str(view, "utf-8", "surrogatepass")
+        return Snapshot(manifest["repo_url"], manifest["fetch"], content, manifest.get("profile"))
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            self._refresh()
+            return {
+                "snapshots": len(self._snapshots),
+                "blobs": sum(1 for k in self._entries if k[:1] == BLOB),
+                "data_bytes": self._data_path.stat().st_size,
+                "index_bytes": self._index_pos,
+            }
+
+
+def rebuild_index(directory: str | Path) -> int:
+    """Rewrite snapshots.idx by scanning snapshots.dat, dropping a torn tail. Returns entries written."""
+    directory = Path(directory)
+    entries = []
+    with open(directory / DATA_FILE, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        offset = 0
+        while offset + _HEADER.size <= size:
+            f.seek(offset)
+            magic, kind, key, length = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != MAGIC:
+                raise CorruptArchiveError(f"Bad record header at offset {offset}")
+            payload_at = offset + _HEADER.size
+            if payload_at + length > size:
+                break
+            entries.append(_ENTRY.pack(kind, key, payload_at, length))
+            offset = payload_at + length
+    tmp = directory / (INDEX_FILE + ".tmp")
+    tmp.write_bytes(b"".join(entries))
+    os.replace(tmp, directory / INDEX_FILE)
+    return len(entries)
+
+
+@lru_cache(maxsize=1)
+def get_archive() -> SnapshotArchive | None:
+    """The process-wide archive in SNAPSHOT_DIR, or None when snapshots are disabled."""
+    if not SNAPSHOT_DIR:
+        return None
+    return SnapshotArchive(SNAPSHOT_DIR)
@@ -0,0 +1,263 @@
+"""Monorepo workspace detection and per-package (sharded) analysis.
+
+The dependency checks read one requirements.txt and one package.json at the
+repository root, and the import graph treats every file as one module tree.
+In a monorepo that is wrong: each package declares its own dependencies and
+resolves imports from its own root.
+
+detect_packages() finds the packages from the tree: every directory with a
+package.json, pyproject.toml, setup.py or requirements*.txt is one, and
+when the root package.json ("workspaces") or pnpm-workspace.yaml declares
+workspaces, only the JS packages they match count. A repository with fewer
+than two packages is not a monorepo and is analyzed as before.
+
+Each file belongs to the package with the deepest root above it. When no
+manifest sits at the repository root, detect_packages() adds a "(root)"
+package without manifests, so files outside every package (scripts/,
+top-level modules) are still analyzed and in the repository graph.
+split_files() gives each package its files with paths relative to its root,
+and analyze_shard() runs the dependency and import-graph analyzers on one
+package. A shard's input and output are plain JSON-ready data, so shards
+can run on other workers; run_shards() uses a process pool when
+ANALYZE_SHARD_WORKERS > 1. The pool is created once per process and kept;
+its workers are started with forkserver (spawn where that is missing),
+never forked from the API process, whose threads may hold locks.
+merge_deps() and merge_graph() roll the shard results up for the
+repository-level checks.
+"""
+
+import fnmatch
+import json
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any
+
+import networkx as nx
+
+from app.analyzers.code.architecture import build_import_graph
+from app.analyzers.code.dependencies import check_js_deps, check_python_deps
+from app.core.config import ANALYZE_SHARD_WORKERS
+from app.core.repo_limits import should_skip_path
+
+JS_MANIFESTS = frozenset({"package.json"})
+PYTHON_MANIFESTS = frozenset({"pyproject.toml", "setup.py"})
+# Manifests under these directories are fixtures and examples, not packages.
+IGNORED_DIRS = frozenset({"test", "tests", "__tests__", "fixtures", "example", "examples", "e2e"})
+
+DEP_LISTS = ("declared", "imported", "unused", "missing", "unpinned")
+
+_PYPROJECT_NAME_RE = re.compile(r"""^name\s*=\s*["']([^"']+)["']""", re.MULTILINE)
+_PNPM_PACKAGE_RE = re.compile(r"""^\s*-\s*["']?([^"'#\s]+)["']?""")
+
+
+@dataclass(frozen=True)
+class Package:
+    name: str
+    root: str  # "" for the repository root
+    languages: tuple[str, ...]
+    manifests: tuple[str, ...]
+
+    def path(self, rel: str) -> str:
+        """The repository path of rel, a path relative to the package root."""
+        return f"{self.root}/{rel}" if self.root else rel
+
+
+def _manifest_language(base: str) -> str | None:
+    if base in JS_MANIFESTS:
+        return "javascript"
+    if base in PYTHON_MANIFESTS or (base.startswith("requirements") and base.endswith(".txt")):
+        return "python"
+    return None
+
+
+def workspace_globs(content_by_path: dict[str, str]) -> list[str]:
+    """Workspace patterns declared in the root package.json or pnpm-workspace.yaml."""
+    globs: list[str] = []
+    try:
+        data = json.loads(content_by_path.get("package.json") or "{}")
+    except ValueError:
+        data = {}
+    declared = data.get("workspaces") if isinstance(data, dict) else None
+    if isinstance(declared, dict):
+        declared = declared.get("packages")
+    if isinstance(declared, list):
+        globs.extend(g for g in declared if isinstance(g, str))
+    in_packages = False
+    for line in (content_by_path.get("pnpm-workspace.yaml") or "").splitlines():
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        if not line[0].isspace() and not line.startswith("-"):
+            in_packages = line.rstrip().startswith("packages:")
+            continue
+        m = _PNPM_PACKAGE_RE.match(line)
+        if in_packages and m:
+            globs.append(m.group(1))
+    return globs
+
+
+def _segments_match(parts: list[str], pattern: list[str]) -> bool:
+    if not pattern:
+        return not parts
+    if pattern[0] == "**":
+        return any(_segments_match(parts[i:], pattern[1:]) for i in range(len(parts) + 1))
+    return bool(parts) and fnmatch.fnmatchcase(parts[0], pattern[0]) and _segments_match(parts[1:], pattern[1:])
+
+
+def matches_workspace(directory: str, globs: list[str]) -> bool:
+    """True if directory matches a workspace pattern and no later "!pattern" excludes it."""
+    matched = False
+    parts = directory.split("/")
+    for glob in globs:
+        negate = glob.startswith("!")
+        pattern = glob.lstrip("!").strip().removeprefix("./").strip("/")
+        if pattern and _segments_match(parts, pattern.split("/")):
+            matched = not negate
+    return matched
+
+
+def _package_name(root: str, manifests: list[str], content_by_path: dict[str, str]) -> str:
+    for manifest in manifests:
+        text = content_by_path.get(manifest) or ""
+        if manifest.endswith("package.json"):
+            try:
+                name = json.loads(text or "{}").get("name")
+            except (ValueError, AttributeError):
+                name = None
+            if isinstance(name, str) and name:
+                return name
+        elif manifest.endswith("pyproject.toml"):
+            m = _PYPROJECT_NAME_RE.search(text)
+            if m:
+                return m.group(1)
+    return root or "(root)"
+
+
+def detect_packages(tree_paths: list[str], content_by_path: dict[str, str]) -> list[Package]:
+    """The packages of a monorepo, deepest roots first; [] when there are fewer than two.
+
+    The last one is always the repository root, a "(root)" package without
+    manifests if none is declared there.
+    """
+    manifests: dict[str, list[str]] = {}
+    for path in tree_paths:
+        if should_skip_path(path):
+            continue
+        directory, base = os.path.split(path)
+        if _manifest_language(base) is None or IGNORED_DIRS & set(directory.lower().split("/")):
+            continue
+        manifests.setdefault(directory, []).append(path)
+
+    globs = workspace_globs(content_by_path)
+    packages: list[Package] = []
+    for root, paths in manifests.items():
+        languages = sorted({_manifest_language(os.path.basename(p)) or "" for p in paths})
+        if root and globs and languages == ["javascript"] and not matches_workspace(root, globs):
+            continue
+        paths.sort()
+        packages.append(Package(_package_name(root, paths, content_by_path), root, tuple(languages), tuple(paths)))
+    if len(packages) < 2:
+        return []
+    if "" not in manifests:
+        packages.append(Package("(root)", "", (), ()))
+    return sorted(packages, key=lambda p: (-p.root.count("/") - bool(p.root), p.root))
+
+
+def owner(path: str, packages: list[Package]) -> Package | None:
+    """The package with the deepest root above path (packages as detect_packages returns them)."""
+    for package in packages:
+        if not package.root or path.startswith(package.root + "/"):
+            return package
+    return None
+
+
+def split_files(content_by_path: dict[str, str], packages: list[Package]) -> list[dict[str, str]]:
+    """Each package's files, keyed by path relative to its root, in the order of packages."""
+    shards: list[dict[str, str]] = [{} for _ in packages]
+    index = {p.root: i for i, p in enumerate(packages)}
+    for path, text in content_by_path.items():
+        package = owner(path, packages)
+        if package is not None:
+            rel = path[len(package.root) + 1:] if package.root else path
+            shards[index[package.root]][rel] = text
+    return shards
+
+
+def analyze_shard(files: dict[str, str]) -> dict[str, Any]:
+    """Dependency and import-graph analysis of one package's files (paths relative to its root)."""
+    graph = build_import_graph(files)
+    return {
+        "files": len(files),
+        "python_deps": check_python_deps(files),
+        "js_deps": check_js_deps(files),
+        "modules": sorted(graph.nodes()),
+        "imports": sorted([a, b] for a, b in graph.edges()),
+    }
+
+
+@lru_cache(maxsize=None)
+def shard_pool(workers: int) -> ProcessPoolExecutor:
+    """The process-wide pool of that many shard workers, started on first use."""
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+
+
+def run_shards(shards: list[dict[str, str]], workers: int = ANALYZE_SHARD_WORKERS) -> list[dict[str, Any]]:
+    """analyze_shard() for each shard, on shard_pool(workers) when workers > 1.
+
+    If a worker died and broke the pool, the pool is replaced on the next
+    call and these shards run in this thread.
+    """
+    if workers > 1 and len(shards) > 1:
+        try:
+            return list(shard_pool(workers).map(analyze_shard, shards))
+        except BrokenProcessPool:
+            shard_pool.cache_clear()
+    return [analyze_shard(files) for files in shards]
+
+
+def shard_graph(package: Package, result: dict[str, Any]) -> nx.DiGraph:
+    """A shard's import graph with repository paths as nodes."""
+    graph: nx.DiGraph = nx.DiGraph()
+    graph.add_nodes_from(package.path(m) for m in result["modules"])
+    graph.add_edges_from((package.path(a), package.path(b)) for a, b in result["imports"])
+    return graph
+
+
+def merge_graph(packages: list[Package], results: list[dict[str, Any]]) -> nx.DiGraph:
+    """The union of the packages' import graphs; imports across packages are not edges."""
+    graph: nx.DiGraph = nx.DiGraph()
+    for package, result in zip(packages, results):
+        graph.update(shard_graph(package, result))
+    return graph
+
+
+def package_deps(package: Package, deps: dict[str, Any], manifest: str) -> dict[str, Any]:
+    """A shard's check_*_deps result, pointing at the package's manifest."""
+    return {**deps, "manifest": package.path(manifest)}
+
+
+def merge_deps(packages: list[Package], results: list[dict[str, Any]], key: str, manifest: str) -> dict[str, Any]:
+    """Roll up one language's check_*_deps results (key) over the packages.
+
+    Names are suffixed with the package, e.g. "react (web)". "manifest" is the
+    first manifest with an unused dependency, for the check's evidence.
+    """
+    merged: dict[str, Any] = {name: [] for name in DEP_LISTS}
+    declared = unpinned = 0
+    first_unused = None
+    for package, result in zip(packages, results):
+        deps = result[key]
+        for name in DEP_LISTS:
+            merged[name].extend(f"{dep} ({package.name})" for dep in deps.get(name) or [])
+        declared += len(deps.get("declared") or [])
+        unpinned += len(deps.get("unpinned") or [])
+        if deps.get("unused") and first_unused is None:
+            first_unused = package.path(manifest)
+    merged["pinning_ratio"] = round((declared - unpinned) / declared, 2) if declared else 0.0
+    merged["manifest"] = first_unused or manifest
+    return merged
@@ -0,0 +1,231 @@
+"""Timing and peak memory of the analysis engine over synthetic repositories.
+
+Each scenario generates a repository (benchmarks.synthetic_repos), then
+times select_candidates over the whole tree, analyze() over the selected
+content (capped exactly as in production by batch_fetch_text, with blobs
+served from memory), and every _*_checks function on its own:
+
+    cd backend && python -m benchmarks.analysis_engine [--only 'mixed-*'] [--repeat 3] [--json out.json]
+    cd backend && python -m benchmarks.analysis_engine --json new.json --compare baseline.json
+
+Timings are medians over --repeat runs, in milliseconds. Peak memory is the
+tracemalloc peak of one select_candidates + analyze() run, in KiB. A call
+that runs past --timeout seconds is abandoned and recorded as null, and
+listed under "timed_out". With --compare, a timing or memory figure that
+grew by more than --threshold (and by more than --min-ms for timings) is a
+regression, as is a new timeout, and the exit status is 1.
+"""
+
+import argparse
+import json
+import platform
+import signal
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from fnmatch import fnmatch
+from typing import Any
+from unittest.mock import patch
+
+from app.core.repo_limits import MAX_FILE_BYTES, MAX_FILES_FETCH, MAX_TOTAL_BYTES
+from app.services import analyzer
+from app.services.candidate_selector import select_candidates
+from app.services.repo_content import batch_fetch_text
+from benchmarks.synthetic_repos import RepoSpec, SyntheticRepo, generate
+
+RESULTS_VERSION = 1
+SIZES = (50, 500, 5_000, 50_000)
+MIXES = {"py": 0.0, "mixed": 0.5, "ts": 1.0}
+ADVERSARIAL = (
+    RepoSpec("deep_nesting", 2_000, kind="deep_nesting"),
+    RepoSpec("huge_files", 60, kind="huge_files"),
+    RepoSpec("import_cycles", 2_000, kind="import_cycles"),
+    RepoSpec("magic_numbers", 2_000, kind="magic_numbers"),
+)
+
+# name -> call(fetch, content); the same arguments analyze() passes.
+CHECKS: dict[str, Callable[[dict, dict[str, str]], Any]] = {
+    "_runability_checks": lambda f, c: analyzer._runability_checks(f, c),
+    "_engineering_checks": lambda f, c: analyzer._engineering_checks(f, c),
+    "_secrets_checks": lambda f, c: analyzer._secrets_checks(f, c),
+    "_documentation_checks": lambda f, c: analyzer._documentation_checks(f, c),
+    "_code_analysis_checks": lambda f, c: analyzer._code_analysis_checks(c, {}),
+    "_complexity_checks": lambda f, c: analyzer._complexity_checks(c),
+    "_smells_checks": lambda f, c: analyzer._smells_checks(c),
+    "_dependency_checks": lambda f, c: analyzer._dependency_checks(c),
+    "_architecture_checks": lambda f, c: analyzer._architecture_checks(c),
+}
+
+
+def scenarios(seed: int = 0) -> list[RepoSpec]:
+    specs = [RepoSpec(f"{mix}-{size}", size, ts_ratio, seed=seed) for size in SIZES for mix, ts_ratio in MIXES.items()]
+    return specs + [RepoSpec(s.name, s.files, s.ts_ratio, s.kind, seed) for s in ADVERSARIAL]
+
+
+def _content(repo: SyntheticRepo, fetch: dict, candidates: list[dict]) -> dict[str, str]:
+    """What batch_fetch_text would download for these candidates."""
+    by_sha = {b["sha"]: repo.files[b["path"]][:MAX_FILE_BYTES] for b in fetch["tree_blobs"]}
+    with patch("app.services.repo_content.get_blob_text", lambda owner, name, sha: by_sha[sha]):
+        return batch_fetch_text(
+            fetch["owner"], fetch["name"], candidates,
+            max_files=MAX_FILES_FETCH, max_total_bytes=MAX_TOTAL_BYTES,
+        )
+
+
+class _Timeout(BaseException):
+    """Not an Exception, so analyzers that catch Exception cannot swallow it."""
+
+
+def _alarm(signum, frame):
+    raise _Timeout
+
+
+@contextmanager
+def _deadline(seconds: float) -> Iterator[None]:
+    """Raise _Timeout in the block after seconds (SIGALRM; main thread, Unix only)."""
+    previous = signal.signal(signal.SIGALRM, _alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _median_ms(fn: Callable[[], Any], repeat: int, timeout: float) -> float | None:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        try:
+            with _deadline(timeout):
+                fn()
+        except _Timeout:
+            return None
+        samples.append(time.perf_counter() - t0)
+    return round(statistics.median(samples) * 1000, 3)
+
+
+def run_scenario(spec: RepoSpec, repeat: int, timeout: float) -> dict[str, Any]:
+    repo = generate(spec)
+    fetch = repo.fetch_result()
+    candidates = select_candidates(fetch["tree_blobs"])
+    content = _content(repo, fetch, candidates)
+
+    timings = {
+        "select_candidates": _median_ms(lambda: select_candidates(fetch["tree_blobs"]), repeat, timeout),
+        "analyze": _median_ms(lambda: analyzer.analyze(fetch, content_by_path=content), repeat, timeout),
+    }
+    for name, call in CHECKS.items():
+        timings[name] = _median_ms(lambda: call(fetch, content), repeat, timeout)
+
+    peak = None
+    if timings["analyze"] is not None:
+        tracemalloc.start()
+        try:
+            analyzer.analyze(fetch, content_by_path=_content(repo, fetch, select_candidates(fetch["tree_blobs"])))
+            peak = round(tracemalloc.get_traced_memory()[1] / 1024)
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "kind": spec.kind,
+        "files": len(repo.files),
+        "ts_ratio": spec.ts_ratio,
+        "tree_bytes": sum(b["size"] for b in fetch["tree_blobs"]),
+        "content_files": len(content),
+        "content_bytes": sum(len(c.encode("utf-8")) for c in content.values()),
+        "timings_ms": timings,
+        "timed_out": [name for name, ms in timings.items() if ms is None],
+        "peak_memory_kib": peak,
+    }
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], threshold: float, min_ms: float
+) -> list[dict[str, Any]]:
+    """Figures in results that regressed against baseline, for scenarios present in both."""
+    regressions = []
+    for name, current in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        figures = [(f"timings_ms.{k}", v, base.get("timings_ms", {}).get(k), min_ms)
+                   for k, v in current["timings_ms"].items()]
+        figures.append(("peak_memory_kib", current["peak_memory_kib"], base.get("peak_memory_kib"), 0))
+        for metric, value, old, floor in figures:
+            if old is None:
+                continue
+            if value is None or value > old * (1 + threshold) and value - old > floor:
+                regressions.append({
+                    "scenario": name, "metric": metric, "baseline": old, "current": value,
+                    "change": round(value / old - 1, 3) if old and value is not None else None,
+                })
+    return regressions
+
+
+def _fmt(value: float | None) -> str:
+    return "timeout" if value is None else f"{value:.1f}"
+
+
+def _print(name: str, r: dict[str, Any]) -> None:
+    t = r["timings_ms"]
+    slowest = max(CHECKS, key=lambda k: float("inf") if t[k] is None else t[k])
+    print(f"{name:<16}{r['files']:>8}{r['content_files']:>6}{_fmt(t['select_candidates']):>11}"
+          f"{_fmt(t['analyze']):>11}{r['peak_memory_kib'] or '-':>10}  {slowest} {_fmt(t[slowest])}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", action="append", help="Run scenarios matching this glob, e.g. 'mixed-*' (repeatable)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds before a call is abandoned (default 60)")
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="Flag regressions against a results file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative growth (default 0.25)")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="Ignore timing growth below this (default 1.0)")
+    args = parser.parse_args(argv)
+
+    specs = [s for s in scenarios(args.seed) if not args.only or any(fnmatch(s.name, o) for o in args.only)]
+    results: dict[str, Any] = {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "timeout_s": args.timeout,
+        },
+        "scenarios": {},
+    }
+    print(f"{'scenario':<16}{'files':>8}{'read':>6}{'select ms':>11}{'analyze ms':>11}{'peak KiB':>10}  slowest check ms")
+    for spec in specs:
+        r = run_scenario(spec, args.repeat, args.timeout)
+        results["scenarios"][spec.name] = r
+        _print(spec.name, r)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_ms)
+        for r in regressions:
+            change = "timeout" if r["change"] is None else f"+{r['change']:.0%}"
+            print(f"REGRESSION {r['scenario']} {r['metric']}: {r['baseline']} -> {r['current']} ({change})",
+                  file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""A local stand-in for the GitHub REST API, serving synthetic repositories.
+
+Serves the endpoints app.services.github_client uses (repo, recursive tree,
+contents, blobs) for any owner and repositories named after a synthetic
+repo: "<mix>-<files>" with mix py, mixed or ts (e.g. "mixed-500"), or
+"<kind>-<files>" for an adversarial kind of benchmarks.synthetic_repos
+(e.g. "import_cycles-2000"). Other names are 404.
+
+Knobs (FakeGitHubConfig): fixed latency plus uniform jitter per response; a
+request budget per window with GitHub's X-RateLimit-* headers and a 403
+"API rate limit exceeded" once it is spent; and a fraction of requests
+failing with a chosen 5xx status. Response counts and bytes are kept per
+endpoint and status, at GET /_stats (POST /_reset clears them).
+
+Run it alone, then start the API with GITHUB_API_BASE pointing at it:
+
+    cd backend && python -m benchmarks.fake_github --port 9100 --latency-ms 40 --error-rate 0.01
+"""
+
+import argparse
+import base64
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+
+from benchmarks.synthetic_repos import KINDS, RepoSpec, SyntheticRepo, generate
+
+MIXES = {"py": 0.0, "mixed": 0.5, "ts": 1.0}
+_NAME = re.compile(r"^(?P<kind>[a-z_]+)-(?P<files>\d+)$")
+_ROUTES = (
+    ("repo", re.compile(r"^/repos/(?P<owner>[^/]+)/(?P<name>[^/]+)$")),
+    ("tree", re.compile(r"^/repos/(?P<owner>[^/]+)/(?P<name>[^/]+)/git/trees/(?P<ref>.+)$")),
+    ("blob", re.compile(r"^/repos/(?P<owner>[^/]+)/(?P<name>[^/]+)/git/blobs/(?P<sha>[0-9a-f]{40})$")),
+    ("contents", re.compile(r"^/repos/(?P<owner>[^/]+)/(?P<name>[^/]+)/contents/(?P<path>.+)$")),
+)
+
+
+@dataclass
+class FakeGitHubConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 502
+    rate_limit: int = 0  # requests per rate_window_s; 0 means unlimited
+    rate_window_s: float = 3600.0
+    max_files: int = 50_000
+    seed: int = 0
+
+
+class _Repo:
+    def __init__(self, repo: SyntheticRepo):
+        self.repo = repo
+        self.tree = [
+            {"path": p, "mode": "100644", "type": "blob", "sha": repo.blob_sha(p), "size": len(c.encode("utf-8"))}
+            for p, c in repo.files.items()
+        ]
+        self.by_sha = {entry["sha"]: entry["path"] for entry in self.tree}
+
+
+@lru_cache(maxsize=16)
+def _load(name: str, max_files: int) -> _Repo | None:
+    m = _NAME.match(name)
+    if not m:
+        return None
+    kind, files = m["kind"], int(m["files"])
+    if files > max_files:
+        return None
+    if kind in MIXES:
+        spec = RepoSpec(name, files, MIXES[kind])
+    elif kind in KINDS:
+        spec = RepoSpec(name, files, kind=kind)
+    else:
+        return None
+    return _Repo(generate(spec))
+
+
+class FakeGitHub:
+    """The server state: config, rate-limit budget and response counters."""
+
+    def __init__(self, config: FakeGitHubConfig | None = None):
+        self.config = config or FakeGitHubConfig()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self.requests: Counter[tuple[str, int]] = Counter()
+        self.bytes: Counter[str] = Counter()
+        self._window_start = time.time()
+        self._used = 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.bytes.clear()
+            self._window_start = time.time()
+            self._used = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": [
+                    {"endpoint": e, "status": s, "count": n} for (e, s), n in sorted(self.requests.items())
+                ],
+                "total": sum(self.requests.values()),
+                "bytes": dict(self.bytes),
+                "config": asdict(self.config),
+            }
+
+    def _admit(self) -> tuple[bool, dict[str, str], float, bool]:
+        """(within rate limit, rate-limit headers, delay seconds, inject error) for one request."""
+        c = self.config
+        with self._lock:
+            now = time.time()
+            if now - self._window_start >= c.rate_window_s:
+                self._window_start, self._used = now, 0
+            allowed = c.rate_limit <= 0 or self._used < c.rate_limit
+            if allowed:
+                self._used += 1
+            reset = int(self._window_start + c.rate_window_s)
+            headers = {}
+            if c.rate_limit > 0:
+                headers = {
+                    "X-RateLimit-Limit": str(c.rate_limit),
+                    "X-RateLimit-Remaining": str(max(0, c.rate_limit - self._used)),
+                    "X-RateLimit-Used": str(self._used),
+                    "X-RateLimit-Reset": str(reset),
+                }
+                if not allowed:
+                    headers["Retry-After"] = str(max(1, reset - int(now)))
+            delay = (c.latency_ms + self._rng.uniform(0, c.jitter_ms)) / 1000
+            error = self._rng.random() < c.error_rate
+        return allowed, headers, delay, error
+
+    def record(self, endpoint: str, status: int, size: int) -> None:
+        with self._lock:
+            self.requests[endpoint, status] += 1
+            self.bytes[endpoint] += size
+
+    def respond(self, path: str) -> tuple[str, int, dict, dict[str, str]]:
+        """(endpoint, status, JSON body, extra headers) for a GET of path."""
+        for endpoint, pattern in _ROUTES:
+            m = pattern.match(path)
+            if m:
+                break
+        else:
+            return "other", 404, {"message": "Not Found"}, {}
+
+        allowed, headers, delay, error = self._admit()
+        if delay:
+            time.sleep(delay)
+        if not allowed:
+            return endpoint, 403, {"message": "API rate limit exceeded"}, headers
+        if error:
+            return endpoint, self.config.error_status, {"message": "Injected error"}, headers
+
+        repo = _load(m["name"], self.config.max_files)
+        if repo is None:
+            return endpoint, 404, {"message": "Not Found"}, headers
+        files = repo.repo.files
+        if endpoint == "repo":
+            body = {"name": m["name"], "full_name": f"{m['owner']}/{m['name']}", "default_branch": "main"}
+        elif endpoint == "tree":
+            body = {"sha": "0" * 40, "tree": repo.tree, "truncated": False}
+        elif endpoint == "blob":
+            file_path = repo.by_sha.get(m["sha"])
+            if file_path is None:
+                return endpoint, 404, {"message": "Not Found"}, headers
+            data = files[file_path].encode("utf-8")
+            body = {"sha": m["sha"], "size": len(data), "encoding": "base64",
+                    "content": base64.b64encode(data).decode("ascii")}
+        else:
+            file_path = unquote(m["path"])
+            if file_path not in files:
+                return endpoint, 404, {"message": "Not Found"}, headers
+            data = files[file_path].encode("utf-8")
+            body = {"type": "file", "path": file_path, "size": len(data), "encoding": "base64",
+                    "content": base64.b64encode(data).decode("ascii")}
+        return endpoint, 200, body, headers
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "FakeGitHubServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: dict, headers: dict[str, str] | None = None) -> int:
+        data = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+        return len(data)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        fake = self.server.fake
+        if path == "/_stats":
+            self._send(200, fake.stats())
+            return
+        endpoint, status, body, headers = fake.respond(path)
+        size = self._send(status, body, headers)
+        fake.record(endpoint, status, size)
+
+    def do_POST(self):
+        if urlparse(self.path).path == "/_reset":
+            self.server.fake.reset()
+            self._send(200, {"ok": True})
+        else:
+            self._send(404, {"message": "Not Found"})
+
+
+class FakeGitHubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], fake: FakeGitHub):
+        super().__init__(address, _Handler)
+        self.fake = fake
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> threading.Thread:
+        """Serve on a daemon thread; stop with shutdown()."""
+        thread = threading.Thread(target=self.serve_forever, name="fake-github", daemon=True)
+        thread.start()
+        return thread
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=502)
+    parser.add_argument("--rate-limit", type=int, default=0, help="Requests per --rate-window; 0 is unlimited")
+    parser.add_argument("--rate-window", type=float, default=3600.0, help="Rate-limit window in seconds")
+
+
+def config_from_args(args: argparse.Namespace) -> FakeGitHubConfig:
+    return FakeGitHubConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        rate_limit=args.rate_limit,
+        rate_window_s=args.rate_window,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    add_arguments(parser)
+    args = parser.parse_args()
+    server = FakeGitHubServer((args.host, args.port), FakeGitHub(config_from_args(args)))
+    print(f"Fake GitHub API on {server.url} (GITHUB_API_BASE={server.url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""End-to-end load test of the API against a fake GitHub (benchmarks.fake_github).
+
+Concurrent workers run a mix of POST /api/analyze (on synthetic repositories
+served by the fake GitHub), GET /api/reports/{id} on reports created so far,
+and GET /api/reports, for a fixed duration. The report has throughput,
+p50/p95/p99 latency and status counts per operation. It also has the GitHub
+calls the API made, by endpoint and status.
+
+Against an API that is already running (its GITHUB_API_BASE must point at
+the fake GitHub):
+
+    cd backend && python -m benchmarks.loadtest --api-url http://localhost:8000 --github-url http://localhost:9100
+
+Or let the harness start both: the fake GitHub in-process, and uvicorn with
+GITHUB_API_BASE, GITHUB_TOKEN and ANALYZE_RATE_LIMIT=0 set, on the
+database in DATABASE_URL (run `alembic upgrade head` first):
+
+    cd backend && python -m benchmarks.loadtest --fake-github --spawn-api --workers 4 --concurrency 32 --duration 60
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from benchmarks.fake_github import FakeGitHub, FakeGitHubServer, add_arguments, config_from_args
+
+OPERATIONS = ("analyze", "report", "list")
+DEFAULT_REPOS = ("py-50", "mixed-500", "ts-500", "mixed-5000")
+
+
+@dataclass
+class OpStats:
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter[str] = field(default_factory=Counter)
+
+    def add(self, seconds: float, status: int | str) -> None:
+        self.latencies.append(seconds)
+        self.statuses[str(status)] += 1
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(stats: dict[str, OpStats], elapsed: float) -> dict[str, Any]:
+    ops = {}
+    for name, s in stats.items():
+        ordered = sorted(s.latencies)
+        ops[name] = {
+            "count": len(ordered),
+            "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+            "statuses": dict(s.statuses),
+            "latency_ms": {
+                f"p{p}": round(percentile(ordered, p) * 1000, 1) for p in (50, 95, 99)
+            } | {"max": round((ordered[-1] if ordered else 0.0) * 1000, 1)},
+        }
+    total = sum(len(s.latencies) for s in stats.values())
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "requests": total,
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "operations": ops,
+    }
+
+
+async def _timed(stats: OpStats, call) -> httpx.Response | None:
+    t0 = time.perf_counter()
+    try:
+        resp = await call()
+    except httpx.HTTPError as e:
+        stats.add(time.perf_counter() - t0, type(e).__name__)
+        return None
+    stats.add(time.perf_counter() - t0, resp.status_code)
+    return resp
+
+
+async def _worker(
+    client: httpx.AsyncClient, deadline: float, weights: list[float], repos: list[str],
+    report_ids: list[str], stats: dict[str, OpStats], rng: random.Random,
+) -> None:
+    while time.perf_counter() < deadline:
+        op = rng.choices(OPERATIONS, weights)[0]
+        if op == "report" and not report_ids:
+            op = "analyze"
+        if op == "analyze":
+            repo_url = f"https://github.com/bench/{rng.choice(repos)}"
+            resp = await _timed(stats[op], lambda: client.post("/api/analyze", json={"repo_url": repo_url}))
+            if resp is not None and resp.status_code == 200:
+                report_ids.append(resp.json()["report_id"])
+        elif op == "report":
+            report_id = rng.choice(report_ids)
+            await _timed(stats[op], lambda: client.get(f"/api/reports/{report_id}"))
+        else:
+            await _timed(stats[op], lambda: client.get("/api/reports", params={"limit": 20}))
+
+
+async def run_load(
+    api_url: str, concurrency: int, duration: float, weights: list[float], repos: list[str],
+    seed: int = 0, timeout: float = 120.0,
+) -> dict[str, Any]:
+    stats = {name: OpStats() for name in OPERATIONS}
+    report_ids: list[str] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=api_url, timeout=timeout, limits=limits) as client:
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(
+            _worker(client, deadline, weights, repos, report_ids, stats, random.Random(seed * 1000 + i))
+            for i in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - start
+    return summarize(stats, elapsed)
+
+
+def _wait_ready(url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{url}/health", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"API at {url} did not become ready in {timeout:.0f}s")
+
+
+def spawn_api(port: int, workers: int, github_url: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "GITHUB_API_BASE": github_url,
+        # With a token, a GitHub rate limit fails the analysis instead of
+        # falling back to the demo fixture.
+        "GITHUB_TOKEN": os.environ.get("GITHUB_TOKEN") or "loadtest",
+        "ANALYZE_RATE_LIMIT": "0",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+    )
+
+
+def _github_stats(github_url: str | None, fake: FakeGitHub | None) -> dict[str, Any] | None:
+    if fake is not None:
+        return fake.stats()
+    if github_url:
+        try:
+            return httpx.get(f"{github_url}/_stats", timeout=5).json()
+        except httpx.HTTPError:
+            return None
+    return None
+
+
+def _print(results: dict[str, Any]) -> None:
+    print(f"{results['requests']} requests in {results['elapsed_s']}s: {results['throughput_rps']} req/s")
+    print(f"{'operation':<10}{'count':>8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}  statuses")
+    for name, op in results["operations"].items():
+        lat = op["latency_ms"]
+        statuses = " ".join(f"{k}:{v}" for k, v in sorted(op["statuses"].items()))
+        print(f"{name:<10}{op['count']:>8}{op['throughput_rps']:>9}{lat['p50']:>10}{lat['p95']:>10}{lat['p99']:>10}  {statuses}")
+    github = results.get("github")
+    if github:
+        print(f"GitHub calls: {github['total']} "
+              f"({github['total'] / max(1, results['operations']['analyze']['count']):.1f} per analyze)")
+        for row in github["requests"]:
+            print(f"  {row['endpoint']:<10}{row['status']:>5}{row['count']:>8}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--api-url", default=os.getenv("SHIPCHECK_API_URL", "http://localhost:8000"))
+    parser.add_argument("--github-url", help="A running fake GitHub, for call counts (GET /_stats)")
+    parser.add_argument("--fake-github", action="store_true", help="Start the fake GitHub in this process")
+    parser.add_argument("--github-port", type=int, default=9100)
+    parser.add_argument("--spawn-api", action="store_true", help="Start uvicorn on --api-port against the fake GitHub")
+    parser.add_argument("--api-port", type=int, default=8100)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for --spawn-api")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds")
+    parser.add_argument("--mix", default="1,4,1", help="Relative weights of analyze,report,list (default 1,4,1)")
+    parser.add_argument("--repos", default=",".join(DEFAULT_REPOS), help="Synthetic repo names to analyze")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write results to this file")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    weights = [float(w) for w in args.mix.split(",")]
+    if len(weights) != len(OPERATIONS) or sum(weights) <= 0:
+        parser.error("--mix needs three non-negative weights: analyze,report,list")
+
+    fake = server = api = None
+    github_url = args.github_url
+    api_url = args.api_url
+    try:
+        if args.fake_github:
+            fake = FakeGitHub(config_from_args(args))
+            server = FakeGitHubServer(("127.0.0.1", args.github_port), fake)
+            server.start()
+            github_url = server.url
+        if args.spawn_api:
+            if not github_url:
+                parser.error("--spawn-api needs --fake-github or --github-url")
+            api = spawn_api(args.api_port, args.workers, github_url)
+            api_url = f"http://127.0.0.1:{args.api_port}"
+        _wait_ready(api_url)
+        if fake is not None:
+            fake.reset()
+        elif github_url:
+            httpx.post(f"{github_url}/_reset", timeout=5)
+
+        results = asyncio.run(run_load(
+            api_url, args.concurrency, args.duration, weights, args.repos.split(","), args.seed,
+        ))
+        results["config"] = {
+            "api_url": api_url, "concurrency": args.concurrency, "duration_s": args.duration,
+            "mix": dict(zip(OPERATIONS, weights)), "repos": args.repos.split(","),
+            "workers": args.workers if args.spawn_api else None,
+        }
+        results["github"] = _github_stats(github_url, fake)
+    finally:
+        if api is not None:
+            api.terminate()
+            api.wait(timeout=30)
+        if server is not None:
+            server.shutdown()
+
+    _print(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
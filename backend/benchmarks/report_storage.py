@@ -0,0 +1,145 @@
+"""Storage and latency of report body encodings (app.services.report_storage).
+
+Builds report bodies by running the real analyzer over synthetic repositories
+of varying size, trains a dictionary on one half and measures the other half:
+
+    cd backend && python -m benchmarks.report_storage [--reports 200] [--json out.json]
+
+Latencies are per body, in milliseconds; "decode" is a full decompression,
+"first chunk" is the time until the streaming decoder yields its first block,
+which is when a GET can start sending.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from dataclasses import asdict
+
+from app.services.analyzer import analyze
+from app.services.report_storage import decode_body, encode_body, iter_decoded, train_dictionary
+
+_PY_TEMPLATE = '''import os
+from fastapi import APIRouter, HTTPException
+
+router = APIRouter()
+API_KEY = "sk_live_{n:08d}abcdef"
+
+
+@router.get("/items/{{item_id}}")
+def get_item_{n}(item_id: int):
+    try:
+        return {{"id": item_id, "n": {n}}}
+    except:
+        pass
+    {body}
+'''
+
+
+def _synthetic_fetch(rng: random.Random, i: int) -> tuple[dict, dict[str, str]]:
+    files = rng.randint(5, 120)
+    content = {}
+    for n in range(files):
+        depth = "/".join(f"pkg{rng.randint(0, 5)}" for _ in range(rng.randint(1, 3)))
+        body = "\n    ".join(f"x{k} = os.getenv('V{k}')" for k in range(rng.randint(1, 40)))
+        content[f"{depth}/mod_{n}.py"] = _PY_TEMPLATE.format(n=n, body=body)
+    fetch = {
+        "owner": f"owner{i}",
+        "name": f"repo{i}",
+        "default_branch": "main",
+        "key_files": [
+            {"path": "README.md", "found": rng.random() < 0.8, "snippet": "## Install\npip install -e ."},
+            {"path": "Dockerfile", "found": rng.random() < 0.5, "snippet": "FROM python:3.11"},
+            {"path": ".env.example", "found": rng.random() < 0.5, "snippet": "API_KEY="},
+        ],
+        "workflows": [
+            {"path": ".github/workflows/ci.yml", "snippet": "on: [push]\njobs:\n  test:\n    steps:\n      - run: pytest"}
+        ] if rng.random() < 0.6 else [],
+        "test_folders_detected": ["tests"] if rng.random() < 0.6 else [],
+        "tree_paths": list(content),
+        "tree_blobs": [{"path": p, "sha": f"{n:040x}", "size": len(c)} for n, (p, c) in enumerate(content.items())],
+    }
+    return fetch, content
+
+
+def build_bodies(count: int, seed: int = 0) -> list[bytes]:
+    rng = random.Random(seed)
+    bodies = []
+    for i in range(count):
+        fetch, content = _synthetic_fetch(rng, i)
+        findings = asdict(analyze(fetch, content_by_path=content))
+        detail = {"id": f"{i:032x}", "repo_url": f"https://github.com/owner{i}/repo{i}",
+                  "status": "done", "overall_score": findings["overall_score"], "findings_json": findings}
+        bodies.append(json.dumps(detail, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+    return bodies
+
+
+def _ms(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "p50": round(statistics.median(ordered) * 1000, 3),
+        "p95": round(ordered[int(len(ordered) * 0.95) - 1] * 1000, 3),
+    }
+
+
+def measure(bodies: list[bytes], codec: str, dictionary: tuple[int, bytes] | None) -> dict:
+    stored_total = 0
+    encode, decode, first = [], [], []
+    for raw in bodies:
+        t0 = time.perf_counter()
+        stored, encoding, _ = encode_body(raw, codec, dictionary)
+        encode.append(time.perf_counter() - t0)
+        stored_total += len(stored)
+        zdict = dictionary[1] if encoding == "zdict" else None
+        t0 = time.perf_counter()
+        assert decode_body(stored, encoding, zdict) == raw
+        decode.append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        next(iter_decoded(stored, encoding, zdict))
+        first.append(time.perf_counter() - t0)
+    raw_total = sum(len(b) for b in bodies)
+    return {
+        "codec": codec,
+        "stored_bytes": stored_total,
+        "ratio": round(raw_total / stored_total, 2),
+        "encode_ms": _ms(encode),
+        "decode_ms": _ms(decode),
+        "first_chunk_ms": _ms(first),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reports", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write results to this file")
+    args = parser.parse_args()
+
+    bodies = build_bodies(args.reports, args.seed)
+    train_set, test_set = bodies[::2], bodies[1::2]
+    t0 = time.perf_counter()
+    zdict = train_dictionary(train_set)
+    train_ms = (time.perf_counter() - t0) * 1000
+
+    results = {
+        "reports": len(test_set),
+        "raw_bytes": sum(len(b) for b in test_set),
+        "mean_raw_bytes": round(statistics.mean(len(b) for b in test_set)),
+        "dictionary_bytes": len(zdict),
+        "dictionary_train_ms": round(train_ms, 1),
+        "codecs": [measure(test_set, c, (1, zdict)) for c in ("none", "gzip", "zdict")],
+    }
+    print(f"{results['reports']} bodies, {results['raw_bytes']} bytes raw "
+          f"(mean {results['mean_raw_bytes']}); dictionary {len(zdict)} bytes in {train_ms:.0f} ms")
+    print(f"{'codec':<8}{'stored':>12}{'ratio':>8}{'enc p50':>10}{'dec p50':>10}{'first p50':>11}")
+    for r in results["codecs"]:
+        print(f"{r['codec']:<8}{r['stored_bytes']:>12}{r['ratio']:>8}"
+              f"{r['encode_ms']['p50']:>10}{r['decode_ms']['p50']:>10}{r['first_chunk_ms']['p50']:>11}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""Deterministic synthetic repositories for benchmarks and load tests.
+
+generate(spec) builds the files of a repository (a Python/TypeScript mix
+around a README, manifests, CI workflow and tests), and fetch_result()
+turns them into what app.services.github_client.fetch_repo returns, so the
+analyzer can run on them without GitHub. Blob shas are real git blob ids,
+so the same files can be served by a fake GitHub API.
+
+Kinds (RepoSpec.kind):
+- "normal": modules of a few functions importing a few earlier modules.
+- "deep_nesting": 30-level directory paths and 40-level nested branches.
+- "huge_files": every source file close to MAX_FILE_BYTES.
+- "import_cycles": modules in clusters of 50 where each imports all others.
+- "magic_numbers": functions made of hundreds of numeric literals.
+"""
+
+import hashlib
+import posixpath
+import random
+from dataclasses import dataclass, field
+
+from app.core.repo_limits import MAX_FILE_BYTES
+from app.services.github_client import KEY_FILES_ROOT, SNIPPET_CHARS, TEST_FOLDER_PREFIXES
+
+KINDS = ("normal", "deep_nesting", "huge_files", "import_cycles", "magic_numbers")
+_CYCLE_CLUSTER = 50
+
+
+@dataclass(frozen=True)
+class RepoSpec:
+    name: str
+    files: int
+    ts_ratio: float = 0.5
+    kind: str = "normal"
+    seed: int = 0
+
+
+@dataclass
+class SyntheticRepo:
+    spec: RepoSpec
+    owner: str
+    files: dict[str, str] = field(default_factory=dict)
+
+    def blob_sha(self, path: str) -> str:
+        return git_blob_sha(self.files[path].encode("utf-8"))
+
+    def fetch_result(self) -> dict:
+        """The fetch_repo() result for this repository."""
+        tree_blobs = [
+            {"path": p, "sha": self.blob_sha(p), "size": len(c.encode("utf-8"))}
+            for p, c in self.files.items()
+        ]
+        key_files = []
+        for path in KEY_FILES_ROOT:
+            if path in self.files:
+                text = self.files[path]
+                key_files.append({
+                    "path": path,
+                    "found": True,
+                    "snippet": text[:SNIPPET_CHARS],
+                    "size": len(text.encode("utf-8")),
+                    "truncated": len(text) > SNIPPET_CHARS,
+                })
+        workflows = [
+            {"path": p, "snippet": c[:SNIPPET_CHARS], "size": len(c), "truncated": len(c) > SNIPPET_CHARS}
+            for p, c in self.files.items()
+            if p.startswith(".github/workflows/") and p.endswith((".yml", ".yaml"))
+        ][:3]
+        return {
+            "owner": self.owner,
+            "name": self.spec.name,
+            "default_branch": "main",
+            "tree_blobs": tree_blobs,
+            "tree_paths": list(self.files),
+            "key_files": key_files,
+            "workflows": workflows,
+            "test_folders_detected": [
+                prefix.rstrip("/") for prefix in TEST_FOLDER_PREFIXES
+                if any(p.startswith(prefix) for p in self.files)
+            ],
+        }
+
+
+def git_blob_sha(data: bytes) -> str:
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+_README = """# {name}
+
+Synthetic repository for benchmarks.
+
+## Install
+
+```bash
+pip install -e .
+npm install
+```
+
+## Run
+
+```bash
+uvicorn app.main:app --reload
+npm run dev
+```
+
+## Test
+
+```bash
+pytest
+npm test
+```
+"""
+
+_SUPPORT_FILES = {
+    "pyproject.toml": '[project]\nname = "{name}"\ndependencies = ["fastapi>=0.109", "requests==2.31.0", "sqlalchemy"]\n',
+    "package.json": '{"name": "{name}", "scripts": {"dev": "vite", "test": "vitest"}, '
+                    '"dependencies": {"react": "^18.2.0", "lodash": "4.17.21"}}\n',
+    "Dockerfile": "FROM python:3.11-slim\nCOPY . /app\nRUN pip install -e /app\nCMD [\"uvicorn\", \"app.main:app\"]\n",
+    ".env.example": "DATABASE_URL=\nAPI_KEY=\n",
+    ".github/workflows/ci.yml": "on: [push]\njobs:\n  test:\n    runs-on: ubuntu-latest\n    steps:\n"
+                                "      - uses: actions/checkout@v4\n      - run: pytest\n      - run: npm test\n",
+    "app/main.py": "from fastapi import FastAPI\n\napp = FastAPI()\n\n\n@app.get(\"/health\")\ndef health():\n"
+                   "    return {\"status\": \"ok\"}\n",
+    "tests/test_main.py": "def test_health():\n    assert True\n",
+}
+
+
+def _dirs(rng: random.Random, kind: str, ts: bool, i: int) -> str:
+    root = "src" if ts else "app"
+    if kind == "deep_nesting":
+        return root + "".join(f"/level{d}" for d in range(30))
+    return f"{root}/pkg{rng.randint(0, max(1, i // 200))}"
+
+
+def _py_function(rng: random.Random, kind: str, name: str) -> str:
+    if kind == "magic_numbers":
+        terms = " + ".join(f"x * {rng.randint(2, 99999)}" for _ in range(60))
+        lines = [f"def {name}(x):", f"    y = {terms}"]
+        lines += [f"    if y > {rng.randint(1000, 9999)}:\n        y -= {rng.randint(3, 999)}" for _ in range(20)]
+        return "\n".join(lines + ["    return y\n"])
+    if kind == "deep_nesting":
+        body = [f"def {name}(x):"]
+        for d in range(40):
+            body.append("    " * (d + 1) + f"if x > {d}:")
+        body.append("    " * 41 + "return x")
+        body.append("    return 0\n")
+        return "\n".join(body)
+    branches = "\n".join(
+        f"    {'if' if k == 0 else 'elif'} x == {k}:\n        return {k} * factor"
+        for k in range(rng.randint(1, 12))
+    )
+    return f"def {name}(x, factor=1):\n{branches}\n    return x\n"
+
+
+def _ts_function(rng: random.Random, kind: str, name: str) -> str:
+    if kind == "magic_numbers":
+        terms = " + ".join(f"x * {rng.randint(2, 99999)}" for _ in range(60))
+        return f"export function {name}(x: number): number {{\n  return {terms};\n}}\n"
+    if kind == "deep_nesting":
+        opens = "".join(f"{'  ' * (d + 1)}if (x > {d}) {{\n" for d in range(40))
+        closes = "".join(f"{'  ' * (d + 1)}}}\n" for d in reversed(range(40)))
+        return f"export function {name}(x: any): number {{\n{opens}{'  ' * 41}return x;\n{closes}  return 0;\n}}\n"
+    cases = "".join(f"    case {k}: return {k} * factor;\n" for k in range(rng.randint(1, 12)))
+    return (
+        f"export function {name}(x: number, factor: any = 1): number {{\n"
+        f"  switch (x) {{\n{cases}  }}\n  console.log(x);\n  return x;\n}}\n"
+    )
+
+
+def _module(rng: random.Random, spec: RepoSpec, i: int, ts: bool, imports: list[tuple[str, str]]) -> str:
+    functions = 40 if spec.kind == "huge_files" else rng.randint(2, 6)
+    parts: list[str] = []
+    for target, symbol in imports:
+        parts.append(f"import {{ {symbol} }} from \"{target}\";" if ts else f"from {target} import {symbol}")
+    parts.append("")
+    make = _ts_function if ts else _py_function
+    size = 0
+    k = 0
+    while k < functions or (spec.kind == "huge_files" and size < MAX_FILE_BYTES * 0.9):
+        parts.append(make(rng, spec.kind, f"f{i}_{k}"))
+        size += len(parts[-1]) + 1
+        k += 1
+    return "\n".join(parts)
+
+
+def _import_targets(rng: random.Random, spec: RepoSpec, i: int, count: int) -> list[int]:
+    if spec.kind == "import_cycles":
+        start = i - i % _CYCLE_CLUSTER
+        return [j for j in range(start, min(start + _CYCLE_CLUSTER, count)) if j != i]
+    if i == 0:
+        return []
+    return sorted({rng.randrange(i) for _ in range(min(i, 3))})
+
+
+def generate(spec: RepoSpec) -> SyntheticRepo:
+    if spec.kind not in KINDS:
+        raise ValueError(f"Unknown synthetic repo kind: {spec.kind}")
+    rng = random.Random(f"{spec.seed}:{spec.name}")
+    repo = SyntheticRepo(spec=spec, owner="bench")
+    repo.files["README.md"] = _README.replace("{name}", spec.name)
+    for path, text in _SUPPORT_FILES.items():
+        repo.files[path] = text.replace("{name}", spec.name)
+
+    source_files = max(0, spec.files - len(repo.files))
+    modules: list[tuple[str, bool]] = []
+    for i in range(source_files):
+        ts = rng.random() < spec.ts_ratio
+        ext = rng.choice((".ts", ".tsx")) if ts else ".py"
+        modules.append((f"{_dirs(rng, spec.kind, ts, i)}/mod_{i}{ext}", ts))
+
+    for i, (path, ts) in enumerate(modules):
+        imports = []
+        for j in _import_targets(rng, spec, i, len(modules)):
+            target, target_ts = modules[j]
+            if target_ts != ts:
+                continue
+            if ts:
+                rel = posixpath.relpath(target.rsplit(".", 1)[0], posixpath.dirname(path))
+                imports.append((rel if rel.startswith(".") else "./" + rel, f"f{j}_0"))
+            else:
+                imports.append((target[:-3].replace("/", "."), f"f{j}_0"))
+        repo.files[path] = _module(rng, spec, i, ts, imports)
+    return repo
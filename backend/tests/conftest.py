@@ -2,36 +2,44 @@
 
 import json
 import os
+import tempfile
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
-from app.core.config import DATABASE_URL
-from app.core.database import get_db
+from app.core.config import ASYNC_DATABASE_URL, DATABASE_URL
+from app.core.database import async_url_for, get_async_db, get_async_sessionmaker, get_db
+from app.api import reports as reports_api
 from app.main import app
-from app.models import Base, Report
+from app.models import Base, CompressionDictionary, Report, ReportTrace
 
 # Use SQLite in-memory for tests if TESTING is set
 TESTING = os.getenv("TESTING", "0").lower() in ("1", "true", "yes")
 if TESTING and "sqlite" not in DATABASE_URL.lower():
     # Override DATABASE_URL for tests to use SQLite.
-    # StaticPool keeps a single shared connection so the in-memory DB is visible
-    # across FastAPI's sync-route threadpool workers (without it, each worker
-    # gets its own empty :memory: DB and queries fail with "no such table").
-    test_db_url = "sqlite:///:memory:"
+    # A temp-file DB (not :memory:) so the sync session used by tests and the
+    # async (aiosqlite) session used by the API see the same tables. NullPool
+    # on the async side: TestClient may run each request on a fresh event loop.
+    _test_db_path = Path(tempfile.gettempdir()) / f"shipcheck-test-{os.getpid()}.db"
     test_engine = create_engine(
-        test_db_url,
+        f"sqlite:///{_test_db_path}",
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
     )
     TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+    test_async_engine = create_async_engine(f"sqlite+aiosqlite:///{_test_db_path}", poolclass=NullPool)
+    TestAsyncSessionLocal = async_sessionmaker(test_async_engine, autoflush=False, expire_on_commit=False)
 else:
     from app.core.database import engine, SessionLocal as TestSessionLocal
+    # Not the app's pooled AsyncSessionLocal: TestClient runs each request on
+    # a fresh event loop, and an asyncpg connection cannot outlive its loop.
+    test_async_engine = create_async_engine(ASYNC_DATABASE_URL or async_url_for(DATABASE_URL), poolclass=NullPool)
+    TestAsyncSessionLocal = async_sessionmaker(test_async_engine, autoflush=False, expire_on_commit=False)
 
 
 def _mock_fetch_result():
@@ -71,8 +79,12 @@ def db() -> Session:
 @pytest.fixture
 def client(db: Session):
     """Create a test client with database override."""
+    db.query(ReportTrace).delete()
     db.query(Report).delete()
+    db.query(CompressionDictionary).delete()
     db.commit()
+    # Tables are recreated per test, so dictionary ids repeat across tests.
+    reports_api._dictionaries.clear()
 
     def override_get_db():
         try:
@@ -80,7 +92,13 @@ def client(db: Session):
         finally:
             pass
 
+    async def override_get_async_db():
+        async with TestAsyncSessionLocal() as async_db:
+            yield async_db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_sessionmaker] = lambda: TestAsyncSessionLocal
 
     with patch("app.api.reports.fetch_repo", return_value=_mock_fetch_result()):
         with patch("app.api.reports.batch_fetch_text", return_value={}):
@@ -94,3 +112,11 @@ def client(db: Session):
 def github_fixture():
     """Fixture loader for GitHub API responses."""
     return _load_github_fixture
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _remove_test_db_file():
+    yield
+    if TESTING and "sqlite" not in DATABASE_URL.lower():
+        test_engine.dispose()
+        _test_db_path.unlink(missing_ok=True)
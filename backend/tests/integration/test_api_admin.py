@@ -0,0 +1,129 @@
+"""Integration tests for /api/admin."""
+
+import gzip
+import json
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.models import ReportTrace
+
+TOKEN = "s3cret"
+AUTH = {"Authorization": f"Bearer {TOKEN}"}
+
+
+def _analyze(client: TestClient) -> str:
+    resp = client.post("/api/analyze", json={"repo_url": "https://github.com/test/repo"})
+    assert resp.status_code == 200
+    return resp.json()["report_id"]
+
+
+def test_admin_api_is_hidden_without_a_token(client: TestClient):
+    report_id = _analyze(client)
+    with patch("app.api.admin.ADMIN_TOKEN", None):
+        resp = client.get(f"/api/admin/reports/{report_id}/trace", headers=AUTH)
+    assert resp.status_code == 404
+
+
+def test_admin_api_rejects_a_wrong_token(client: TestClient):
+    report_id = _analyze(client)
+    with patch("app.api.admin.ADMIN_TOKEN", TOKEN):
+        missing = client.get(f"/api/admin/reports/{report_id}/trace")
+        wrong = client.get(
+            f"/api/admin/reports/{report_id}/trace", headers={"Authorization": "Bearer nope"}
+        )
+    assert missing.status_code == wrong.status_code == 401
+    assert missing.headers["www-authenticate"] == "Bearer"
+
+
+def test_report_trace_is_stored_and_served(client: TestClient, db):
+    report_id = _analyze(client)
+    row = db.get(ReportTrace, uuid.UUID(report_id))
+    assert row is not None and row.span_count > 0 and row.dropped_spans == 0
+
+    with patch("app.api.admin.ADMIN_TOKEN", TOKEN):
+        resp = client.get(f"/api/admin/reports/{report_id}/trace", headers=AUTH)
+    assert resp.status_code == 200
+    doc = resp.json()
+    assert doc == json.loads(gzip.decompress(row.data))
+    assert doc["otherData"]["report_id"] == report_id
+    stages = {e["name"] for e in doc["traceEvents"] if e.get("cat") == "stage"}
+    assert {"fetch_repo", "analyze", "serialize", "db_commit"} <= stages
+    analyzers = {e["name"] for e in doc["traceEvents"] if e.get("cat") == "analyzer"}
+    assert "runability" in analyzers
+
+
+def test_report_trace_not_found(client: TestClient):
+    with patch("app.api.admin.ADMIN_TOKEN", TOKEN):
+        resp = client.get(f"/api/admin/reports/{uuid.uuid4()}/trace", headers=AUTH)
+    assert resp.status_code == 404
+
+
+def test_tracing_can_be_disabled(client: TestClient, db):
+    with patch("app.api.reports.REPORT_TRACE_MAX_SPANS", 0):
+        report_id = _analyze(client)
+    assert db.get(ReportTrace, uuid.UUID(report_id)) is None
+
+
+def _sample_fixture() -> dict:
+    with open(Path(__file__).parent.parent / "fixtures" / "sample_repo.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_profile_fixture_returns_collapsed_stacks(client: TestClient):
+    fixture = _sample_fixture()
+    fixture["content_by_path"] = {"app/main.py": "def f(x):\n    if x:\n        return 1\n    return 2\n" * 200}
+    with patch("app.api.admin.ADMIN_TOKEN", TOKEN):
+        resp = client.post(
+            "/api/admin/profile", json={"fixture": fixture, "repeat": 5, "interval_ms": 0.1}, headers=AUTH
+        )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert resp.headers["x-profile-source"] == "fixture"
+    samples = int(resp.headers["x-profile-samples"])
+    lines = resp.text.splitlines()
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == samples
+    assert all(line.startswith("app.services.analyzer:analyze") for line in lines)
+
+
+def test_profile_report_refetches_its_repository(client: TestClient):
+    report_id = _analyze(client)
+    with patch("app.api.admin.ADMIN_TOKEN", TOKEN):
+        resp = client.post("/api/admin/profile", json={"report_id": report_id}, headers=AUTH)
+        missing = client.post("/api/admin/profile", json={"report_id": str(uuid.uuid4())}, headers=AUTH)
+    assert resp.status_code == 200
+    assert resp.headers["x-profile-source"] == f"report:{report_id}"
+    assert missing.status_code == 404
+
+
+def test_profile_report_uses_its_snapshot_and_profile(client: TestClient, tmp_path):
+    from app.api import admin
+    from app.services.snapshot_archive import SnapshotArchive
+
+    archive = SnapshotArchive(tmp_path)
+    with patch("app.api.reports.get_archive", return_value=archive):
+        resp = client.post("/api/analyze", json={"repo_url": "https://github.com/test/repo", "profile": "quick"})
+    report_id = resp.json()["report_id"]
+    snapshot = archive.load(uuid.UUID(report_id))
+
+    with patch("app.api.admin.ADMIN_TOKEN", TOKEN), \
+            patch("app.api.admin.get_archive", return_value=archive), \
+            patch("app.api.admin._fetch", side_effect=AssertionError("re-fetched")), \
+            patch("app.api.admin._profile", wraps=admin._profile) as profile:
+        resp = client.post("/api/admin/profile", json={"report_id": report_id}, headers=AUTH)
+    assert resp.status_code == 200
+    assert resp.headers["x-profile-source"] == f"snapshot:{report_id}"
+    fetch, content, _, used = profile.call_args.args
+    assert fetch == snapshot.fetch and content == snapshot.content
+    assert used.name == "quick"
+
+
+def test_profile_needs_exactly_one_source(client: TestClient):
+    with patch("app.api.admin.ADMIN_TOKEN", TOKEN):
+        neither = client.post("/api/admin/profile", json={}, headers=AUTH)
+        both = client.post(
+            "/api/admin/profile", json={"report_id": str(uuid.uuid4()), "fixture": {}}, headers=AUTH
+        )
+    assert neither.status_code == both.status_code == 400
@@ -6,7 +6,10 @@ from unittest.mock import patch
 import pytest
 from fastapi.testclient import TestClient
 
+from app.core.admission import AdmissionController
 from app.models import Report
+from app.services.cost_model import CostModel
+from app.services.repo_content import batch_fetch_text
 
 
 def test_analyze_creates_report_with_pending_status(client: TestClient, db):
@@ -112,7 +115,8 @@ def test_analyze_handles_fetch_error(client: TestClient, db):
         report_id = uuid.UUID(resp.json()["report_id"])
         report = db.query(Report).filter(Report.id == report_id).first()
         assert report.status == "failed"
-        assert "error" in report.findings_json
+        assert "error" in report.findings_v2
+        assert report.findings_json is None
 
 
 def test_analyze_includes_code_analysis_section(client: TestClient, db):
@@ -183,3 +187,194 @@ def test_analyze_continues_when_batch_fetch_fails(client: TestClient, db):
             code_section = next((s for s in sections if s.get("name") == "Code Analysis"), None)
             if code_section is not None:
                 assert len(code_section.get("checks") or []) == 0
+
+
+QUICK_FETCH = {
+    "owner": "test",
+    "name": "repo",
+    "default_branch": "main",
+    "tree_blobs": [{"path": "app/main.py", "sha": "abc"}],
+    "tree_paths": ["app/main.py"],
+    "key_files": [{"path": "README.md", "found": True, "snippet": "pip install", "size": 11, "truncated": False}],
+    "workflows": [],
+    "test_folders_detected": [],
+}
+
+
+def test_analyze_quick_returns_provisional_report(client: TestClient, db):
+    """depth=quick scores from metadata only, without downloading blobs, and stays pending."""
+    with patch("app.api.reports.fetch_repo", return_value=QUICK_FETCH), \
+            patch("app.api.reports.batch_fetch_text") as mock_batch, \
+            patch("app.api.reports._upgrade_report") as mock_upgrade:
+        resp = client.post("/api/analyze", json={"repo_url": "https://github.com/test/repo", "depth": "quick"})
+        assert resp.status_code == 200
+        assert resp.json()["provisional"] is True
+        assert resp.json()["eta_seconds"] > 0
+        mock_batch.assert_not_called()
+        mock_upgrade.assert_called_once()
+
+        report = client.get(f"/api/reports/{resp.json()['report_id']}", params={"v": 2})
+        assert "etag" not in report.headers
+        body = report.json()
+        assert body["status"] == "pending"
+        assert body["overall_score"] is not None
+        assert body["findings_json"]["provisional"] is True
+        assert body["findings_json"]["eta"]["seconds"] == resp.json()["eta_seconds"]
+        names = [s["name"] for s in body["findings_json"]["sections"]]
+        assert "Runability" in names and "Code Analysis" not in names
+
+
+def test_analyze_quick_is_upgraded_in_place(client: TestClient, db):
+    """The queued full analysis completes the same report, with code analysis and no provisional flag."""
+    with patch("app.api.reports.fetch_repo", return_value=QUICK_FETCH) as mock_fetch, \
+            patch("app.api.reports.batch_fetch_text", return_value={"app/main.py": "x = 1\n"}):
+        resp = client.post("/api/analyze", json={"repo_url": "https://github.com/test/repo", "depth": "quick"})
+        report_id = resp.json()["report_id"]
+        # The full analysis reuses the quick scan's fetch.
+        assert mock_fetch.call_count == 1
+
+    report = client.get(f"/api/reports/{report_id}", params={"v": 2})
+    assert report.headers["etag"]
+    body = report.json()
+    assert body["status"] == "done"
+    assert "provisional" not in body["findings_json"] and "eta" not in body["findings_json"]
+    assert "Code Analysis" in [s["name"] for s in body["findings_json"]["sections"]]
+    assert db.query(Report).count() == 1
+
+
+def test_analyze_quick_fetch_error_fails_report(client: TestClient, db):
+    from app.services.github_client import RepoNotFoundError
+
+    with patch("app.api.reports.fetch_repo", side_effect=RepoNotFoundError("Repository not found")):
+        resp = client.post("/api/analyze", json={"repo_url": "https://github.com/test/repo", "depth": "quick"})
+    assert resp.json()["provisional"] is False
+    report = db.get(Report, uuid.UUID(resp.json()["report_id"]))
+    assert report.status == "failed"
+
+
+def test_analyze_quick_upgrade_error_fails_report(client: TestClient, db):
+    """If the full analysis raises, the provisional report ends failed instead of pending forever."""
+    from app.services.analyzer import analyze
+
+    def analyze_metadata_only(fetch, content_by_path=None, **kwargs):
+        if content_by_path:
+            raise RuntimeError("analyzer crashed")
+        return analyze(fetch, content_by_path=content_by_path, **kwargs)
+
+    with patch("app.api.reports.fetch_repo", return_value=QUICK_FETCH), \
+            patch("app.api.reports.batch_fetch_text", return_value={"app/main.py": "x = 1\n"}), \
+            patch("app.api.reports.analyze", side_effect=analyze_metadata_only):
+        resp = client.post("/api/analyze", json={"repo_url": "https://github.com/test/repo", "depth": "quick"})
+    assert resp.json()["provisional"] is True
+
+    body = client.get(f"/api/reports/{resp.json()['report_id']}", params={"v": 2}).json()
+    assert body["status"] == "failed"
+    assert body["findings_json"] == {"error": "analyzer crashed"}
+
+
+def test_analyze_rejects_unknown_depth(client: TestClient):
+    resp = client.post("/api/analyze", json={"repo_url": "https://github.com/test/repo", "depth": "deep"})
+    assert resp.status_code == 422
+
+
+def test_analyze_stores_profile_and_limits(client: TestClient, db):
+    """The resolved profile is stored on the report, bounds the download and is part of the body (and ETag)."""
+    fetch = {**QUICK_FETCH, "tree_blobs": [{"path": f"app/m{i}.py", "sha": f"s{i}"} for i in range(5)]}
+    with patch("app.api.reports.fetch_repo", return_value=fetch), \
+            patch("app.api.reports.batch_fetch_text", side_effect=batch_fetch_text), \
+            patch("app.services.repo_content.get_blob_text", return_value="x = 1\n") as mock_blob:
+        resp = client.post("/api/analyze", json={
+            "repo_url": "https://github.com/test/repo", "profile": "deep", "limits": {"max_files_fetch": 2},
+        })
+        assert resp.status_code == 200
+        assert mock_blob.call_count == 2
+
+    report = client.get(f"/api/reports/{resp.json()['report_id']}", params={"v": 2})
+    profile = report.json()["analysis_profile"]
+    assert profile["name"] == "deep" and profile["max_files_fetch"] == 2
+    row = db.get(Report, uuid.UUID(resp.json()["report_id"]))
+    assert row.analysis_profile == profile
+
+    projected = client.get(f"/api/reports/{resp.json()['report_id']}", params={"fields": "id,analysis_profile"})
+    assert projected.json()["analysis_profile"] == profile
+
+
+def test_analyze_rejects_limits_above_ceiling(client: TestClient, db):
+    resp = client.post("/api/analyze", json={
+        "repo_url": "https://github.com/test/repo", "limits": {"max_total_bytes": 10**12},
+    })
+    assert resp.status_code == 400
+    assert "max_total_bytes" in resp.json()["detail"]
+    resp = client.post("/api/analyze", json={"repo_url": "https://github.com/test/repo", "profile": "huge"})
+    assert resp.status_code == 400
+    assert db.query(Report).count() == 0
+
+
+def test_analyze_stratified_sampling_reports_estimates(client: TestClient, db):
+    fetch = {**QUICK_FETCH, "tree_blobs": [{"path": f"app/m{i}.py", "sha": f"s{i}"} for i in range(30)]}
+    with patch("app.api.reports.fetch_repo", return_value=fetch), \
+            patch("app.api.reports.batch_fetch_text", side_effect=batch_fetch_text), \
+            patch("app.services.repo_content.get_blob_text", return_value="x = 1\n"):
+        resp = client.post("/api/analyze", json={
+            "repo_url": "https://github.com/test/repo", "sampling": "stratified", "limits": {"max_files_fetch": 10},
+        })
+    assert resp.status_code == 200
+    report = client.get(
+        f"/api/reports/{resp.json()['report_id']}", params={"fields": "analysis_profile,findings_json.sampling"}
+    ).json()
+    assert report["analysis_profile"]["sampling"] == "stratified"
+    sampling = report["findings_json"]["sampling"]
+    assert sampling["code_files"] == 30 and sampling["code_files_read"] == 10
+    assert sampling["estimates"]["smells"]["estimate"] == 0
+
+    bad = client.post("/api/analyze", json={"repo_url": "https://github.com/test/repo", "sampling": "random"})
+    assert bad.status_code == 422
+
+
+def _saturated_admission() -> AdmissionController:
+    admission = AdmissionController(max_concurrent=1, max_queue=0, queue_timeout=1)
+    admission.running = 1
+    return admission
+
+
+def test_analyze_returns_503_when_saturated(client: TestClient, db):
+    with patch("app.api.reports.ANALYSIS_ADMISSION", _saturated_admission()):
+        resp = client.post("/api/analyze", json={"repo_url": "https://github.com/test/repo"})
+    assert resp.status_code == 503
+    assert int(resp.headers["Retry-After"]) >= 1
+    assert db.query(Report).count() == 0
+
+
+def test_analyze_queues_by_cost_and_calibrates(client: TestClient, db):
+    """A full analysis waits for a slot with its predicted cost, and its timings feed the cost model."""
+    model = CostModel()
+    admission = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=1)
+    with patch("app.api.reports.fetch_repo", return_value=QUICK_FETCH), \
+            patch("app.api.reports.batch_fetch_text", return_value={"app/main.py": "x = 1\n"}), \
+            patch("app.api.reports.COST_MODEL", model), \
+            patch("app.services.cost_model.COST_MODEL", model), \
+            patch("app.api.reports.ANALYSIS_ADMISSION", admission), \
+            patch.object(admission, "acquire", wraps=admission.acquire) as acquire:
+        resp = client.post("/api/analyze", json={"repo_url": "https://github.com/test/repo"})
+    assert resp.status_code == 200
+    assert acquire.call_args.args[1] > 0
+    assert model.observations == 1
+
+
+def test_analyze_timeout_in_queue_leaves_no_report(client: TestClient, db):
+    admission = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=0.01)
+    admission.running = 1
+    with patch("app.api.reports.fetch_repo", return_value=QUICK_FETCH), \
+            patch("app.api.reports.ANALYSIS_ADMISSION", admission):
+        resp = client.post("/api/analyze", json={"repo_url": "https://github.com/test/repo"})
+    assert resp.status_code == 503
+    assert db.query(Report).count() == 0
+
+
+def test_ready_reports_saturation(client: TestClient):
+    assert client.get("/ready").json()["status"] == "ready"
+    with patch("app.api.routes.ANALYSIS_ADMISSION", _saturated_admission()):
+        resp = client.get("/ready")
+    assert resp.status_code == 503
+    assert resp.json()["status"] == "saturated"
+    assert resp.headers["Retry-After"] == str(resp.json()["admission"]["retry_after_s"])
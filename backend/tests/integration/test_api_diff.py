@@ -0,0 +1,103 @@
+"""Integration tests for GET /api/reports/{base}/diff/{head}."""
+
+import json
+import uuid
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.models import Report
+
+
+def _analyze(client: TestClient, fetch: dict | None = None) -> str:
+    if fetch is None:
+        resp = client.post("/api/analyze", json={"repo_url": "https://github.com/test/repo"})
+    else:
+        with patch("app.api.reports.fetch_repo", return_value=fetch):
+            resp = client.post("/api/analyze", json={"repo_url": "https://github.com/test/repo"})
+    assert resp.status_code == 200
+    return resp.json()["report_id"]
+
+
+def _fetch_with_readme() -> dict:
+    """Same repository as the conftest fetch mock, now with a README."""
+    return {
+        "owner": "owner",
+        "name": "repo",
+        "default_branch": "main",
+        "key_files": [{"path": "README.md", "found": True, "snippet": "Install: pip install .\nRun: make run"}],
+        "workflows": [],
+        "test_folders_detected": [],
+    }
+
+
+def test_diff_two_analyses(client: TestClient):
+    base_id = _analyze(client)
+    head_id = _analyze(client, _fetch_with_readme())
+
+    resp = client.get(f"/api/reports/{base_id}/diff/{head_id}")
+    assert resp.status_code == 200, resp.text
+    diff = resp.json()
+    assert diff["base"]["id"] == base_id and diff["head"]["id"] == head_id
+    assert diff["overall_score"]["delta"] == diff["head"]["overall_score"] - diff["base"]["overall_score"]
+    assert diff["overall_score"]["delta"] > 0
+    readme = next(c for c in diff["checks"]["changed"] if c["id"] == "runability_readme_install_run")
+    assert readme["status"]["head"] == "pass"
+    assert any(f["check_id"] == "runability_readme_install_run" for f in diff["resolved_findings"])
+    assert "Runability" in diff["category_scores"]
+    assert "immutable" in resp.headers["cache-control"]
+
+    # Served from cache, and conditional requests need no findings at all.
+    again = client.get(f"/api/reports/{base_id}/diff/{head_id}")
+    assert again.content == resp.content
+    not_modified = client.get(
+        f"/api/reports/{base_id}/diff/{head_id}", headers={"If-None-Match": resp.headers["etag"]}
+    )
+    assert not_modified.status_code == 304
+
+    reverse = client.get(f"/api/reports/{head_id}/diff/{base_id}").json()
+    assert reverse["overall_score"]["delta"] == -diff["overall_score"]["delta"]
+    assert any(f["check_id"] == "runability_readme_install_run" for f in reverse["new_findings"])
+    assert reverse["resolved_findings"] == diff["new_findings"]
+
+
+def test_diff_same_report_is_empty(client: TestClient):
+    report_id = _analyze(client)
+    diff = client.get(f"/api/reports/{report_id}/diff/{report_id}").json()
+    assert diff["checks"] == {"added": [], "removed": [], "changed": []}
+    assert diff["new_findings"] == []
+
+
+def test_diff_rejects_other_repo_unfinished_and_missing(client: TestClient, db):
+    report_id = _analyze(client)
+    other = Report(repo_url="https://github.com/x/y", repo_owner="x", repo_name="y", status="done",
+                   findings_v2={"sections": []})
+    pending = Report(repo_url="https://github.com/test/repo", repo_owner="test", repo_name="repo",
+                     status="pending")
+    db.add_all([other, pending])
+    db.commit()
+
+    resp = client.get(f"/api/reports/{report_id}/diff/{other.id}")
+    assert resp.status_code == 400
+    resp = client.get(f"/api/reports/{report_id}/diff/{pending.id}")
+    assert resp.status_code == 409
+    assert "pending" in resp.json()["detail"]
+    resp = client.get(f"/api/reports/{report_id}/diff/{uuid.uuid4()}")
+    assert resp.status_code == 404
+
+
+def test_diff_uncached_legacy_rows(client: TestClient, db):
+    """Rows without a stored body are diffed from findings_json and not cached."""
+    findings = {"overall_score": 40, "sections": [{"name": "Runability", "checks": []}], "category_scores": {"Runability": 40}}
+    rows = [
+        Report(repo_url="https://github.com/o/r", repo_owner="o", repo_name="r", status="done",
+               overall_score=40, findings_json=findings),
+        Report(repo_url="https://github.com/o/r", repo_owner="o", repo_name="r", status="done",
+               overall_score=60, findings_json=json.loads(json.dumps(findings).replace("40", "60"))),
+    ]
+    db.add_all(rows)
+    db.commit()
+    resp = client.get(f"/api/reports/{rows[0].id}/diff/{rows[1].id}")
+    assert resp.status_code == 200
+    assert "etag" not in resp.headers
+    assert resp.json()["category_scores"]["Runability"] == {"base": 40, "head": 60, "delta": 20}
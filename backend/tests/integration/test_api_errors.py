@@ -94,7 +94,8 @@ def test_health_endpoint(client: TestClient):
     """Test health endpoint returns 200."""
     resp = client.get("/health")
     assert resp.status_code == 200
-    assert resp.json() == {"status": "ok"}
+    assert resp.json()["status"] == "ok"
+    assert resp.json()["admission"]["saturated"] is False
 
 
 def test_db_check_endpoint(client: TestClient):
@@ -0,0 +1,104 @@
+"""Integration tests for GET /api/reports/export and the export CLI."""
+
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.cli.export import export, resume_cursor
+from app.models import Report
+
+
+def _analyze(client: TestClient) -> str:
+    resp = client.post("/api/analyze", json={"repo_url": "https://github.com/test/repo"})
+    assert resp.status_code == 200
+    return resp.json()["report_id"]
+
+
+def _lines(resp) -> list[dict]:
+    assert resp.status_code == 200, resp.text
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in resp.text.splitlines()]
+
+
+def test_export_matches_report_endpoint(client: TestClient, db):
+    ids = [_analyze(client) for _ in range(3)]
+    legacy = Report(repo_url="https://github.com/o/old", status="done", overall_score=10,
+                    findings_json={"sections": []})
+    db.add(legacy)
+    db.commit()
+
+    with patch("app.api.reports.EXPORT_BATCH_ROWS", 2):
+        resp = client.get("/api/reports/export?v=2")
+    by_id = {r["id"]: r for r in _lines(resp)}
+    assert set(by_id) == set(ids) | {str(legacy.id)}
+    for report_id in ids:
+        assert by_id[report_id] == client.get(f"/api/reports/{report_id}?v=2").json()
+    assert by_id[str(legacy.id)]["findings_json"] == {"sections": []}
+
+    v1 = next(r for r in _lines(client.get("/api/reports/export")) if r["id"] == ids[0])
+    assert isinstance(v1["findings_json"]["sections"][0]["checks"][0]["recommendation"], str)
+
+
+def test_export_filters_and_cursor(client: TestClient, db):
+    now = datetime.now(timezone.utc)
+    rows = [
+        Report(repo_url=f"https://github.com/o/r{i}", status=status, created_at=now - timedelta(days=d))
+        for i, (status, d) in enumerate([("done", 10), ("failed", 5), ("done", 3), ("done", 1)])
+    ]
+    db.add_all(rows)
+    db.commit()
+
+    done = _lines(client.get("/api/reports/export", params={"status": "done"}))
+    assert [r["id"] for r in done] == [str(rows[i].id) for i in (0, 2, 3)]
+
+    window = _lines(client.get("/api/reports/export", params={
+        "created_after": (now - timedelta(days=6)).isoformat(),
+        "created_before": (now - timedelta(days=2)).isoformat(),
+    }))
+    assert [r["id"] for r in window] == [str(rows[1].id), str(rows[2].id)]
+
+    resumed = _lines(client.get("/api/reports/export", params={"cursor": str(rows[1].id)}))
+    assert [r["id"] for r in resumed] == [str(rows[2].id), str(rows[3].id)]
+
+    resp = client.get("/api/reports/export", params={"cursor": str(uuid.uuid4())})
+    assert resp.status_code == 400
+
+
+def test_export_decodes_compressed_bodies(client: TestClient):
+    with patch("app.api.reports.REPORT_BODY_COMPRESSION", "gzip"):
+        report_id = _analyze(client)
+    rows = _lines(client.get("/api/reports/export?v=2"))
+    assert rows == [client.get(f"/api/reports/{report_id}?v=2").json()]
+
+
+def test_export_cli_resumes_after_partial_line(client: TestClient, tmp_path):
+    ids = [_analyze(client) for _ in range(4)]
+    out = tmp_path / "reports.ndjson"
+
+    assert export(client, out, {"status": "done", "v": "2"}) == 4
+    full = out.read_bytes()
+
+    # Simulate a dropped connection: two whole lines and half of the third.
+    lines = full.splitlines(keepends=True)
+    out.write_bytes(b"".join(lines[:2]) + lines[2][:40])
+    assert export(client, out, {"status": "done", "v": "2"}, resume=True) == 2
+    assert out.read_bytes() == full
+    assert sorted(json.loads(line)["id"] for line in out.read_bytes().splitlines()) == sorted(ids)
+
+    # Nothing new: resuming appends nothing.
+    assert export(client, out, {"v": "2"}, resume=True) == 0
+    assert out.read_bytes() == full
+
+
+def test_resume_cursor_edge_cases(tmp_path):
+    path = tmp_path / "x.ndjson"
+    path.write_bytes(b'{"id": "a"}\n')
+    assert resume_cursor(path) == "a"
+    path.write_bytes(b'{"id": "a"')
+    assert resume_cursor(path) is None
+    assert path.read_bytes() == b""
+    path.write_bytes(b'{"id": "a"}\n' + b'{"id": "' + b"b" * 70_000 + b'"}\n{"id"')
+    assert resume_cursor(path) == "b" * 70_000
@@ -6,7 +6,10 @@ from unittest.mock import patch
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
 
+from app.api.reports import _findings_key_expr
 from app.models import Report
 
 
@@ -220,3 +223,236 @@ def test_get_report_v2_falls_back_to_legacy_when_v2_missing(client: TestClient,
     assert resp.status_code == 200
     # Falls back to findings_json since findings_v2 is None
     assert resp.json()["findings_json"] == legacy_only
+
+
+def _analyze(client: TestClient) -> str:
+    resp = client.post("/api/analyze", json={"repo_url": "https://github.com/test/repo"})
+    assert resp.status_code == 200
+    return resp.json()["report_id"]
+
+
+def test_get_report_serves_precomputed_body_with_etag(client: TestClient, db):
+    """A finished report is served from stored bytes with a strong ETag and immutable caching."""
+    report_id = _analyze(client)
+
+    row = db.query(Report).filter(Report.id == uuid.UUID(report_id)).first()
+    assert row.body_v2 is not None
+    assert row.body_etag
+
+    resp_v1 = client.get(f"/api/reports/{report_id}")
+    resp_v2 = client.get(f"/api/reports/{report_id}?v=2")
+    assert resp_v1.status_code == 200 and resp_v2.status_code == 200
+    assert resp_v2.content == row.body_v2
+    assert "immutable" in resp_v1.headers["cache-control"]
+
+    etag_v1, etag_v2 = resp_v1.headers["etag"], resp_v2.headers["etag"]
+    assert etag_v1.startswith('"') and not etag_v1.startswith("W/")
+    assert etag_v1 != etag_v2
+    assert isinstance(resp_v1.json()["findings_json"]["sections"][0]["checks"][0]["recommendation"], str)
+    assert isinstance(resp_v2.json()["findings_json"]["sections"][0]["checks"][0]["recommendation"], dict)
+
+
+def test_get_report_if_none_match_returns_304(client: TestClient):
+    """If-None-Match with the current ETag (weak or strong form) returns 304 with no body."""
+    report_id = _analyze(client)
+    etag = client.get(f"/api/reports/{report_id}?v=2").headers["etag"]
+
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        resp = client.get(f"/api/reports/{report_id}?v=2", headers={"If-None-Match": header})
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["etag"] == etag
+
+    # The v2 tag does not validate the v1 representation.
+    resp = client.get(f"/api/reports/{report_id}?v=1", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+
+
+def test_get_report_if_none_match_unknown_report_404(client: TestClient):
+    resp = client.get(f"/api/reports/{uuid.uuid4()}", headers={"If-None-Match": '"abc-v1"'})
+    assert resp.status_code == 404
+
+
+def test_get_report_without_precomputed_body_has_no_etag(client: TestClient, db):
+    """Rows written before bodies were precomputed are rendered on the fly, uncached."""
+    report = Report(repo_url="https://github.com/test/old", status="done", overall_score=70, findings_json={"sections": []})
+    db.add(report)
+    db.commit()
+
+    resp = client.get(f"/api/reports/{report.id}", headers={"If-None-Match": "*"})
+    assert resp.status_code == 200
+    assert "etag" not in resp.headers
+    assert resp.json()["findings_json"] == {"sections": []}
+
+
+def test_failed_report_body_is_precomputed(client: TestClient, db):
+    """Failed reports are terminal too, so their body is stored and cacheable."""
+    from app.services.github_client import RepoNotFoundError
+
+    with patch("app.api.reports.fetch_repo", side_effect=RepoNotFoundError("Repository not found")):
+        report_id = _analyze(client)
+    resp = client.get(f"/api/reports/{report_id}")
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "failed"
+    assert resp.json()["findings_json"] == {"error": "Repository not found"}
+    assert "etag" in resp.headers
+
+
+def test_get_report_fields_projection(client: TestClient):
+    """?fields= returns only the named fields, with the same values as the full report."""
+    report_id = _analyze(client)
+    full = client.get(f"/api/reports/{report_id}?v=2").json()
+
+    resp = client.get(
+        f"/api/reports/{report_id}",
+        params={"fields": "overall_score, id,findings_json.category_scores", "v": 2},
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {
+        "id": report_id,
+        "overall_score": full["overall_score"],
+        "findings_json": {"category_scores": full["findings_json"]["category_scores"]},
+    }
+    assert "immutable" in resp.headers["cache-control"]
+
+    etag = resp.headers["etag"]
+    assert etag != client.get(f"/api/reports/{report_id}?v=2").headers["etag"]
+    again = client.get(
+        f"/api/reports/{report_id}",
+        params={"fields": "id,overall_score,findings_json.category_scores", "v": 2},
+        headers={"If-None-Match": etag},
+    )
+    assert again.status_code == 304
+
+    timestamps = client.get(f"/api/reports/{report_id}?fields=created_at,updated_at").json()
+    assert list(timestamps) == ["created_at", "updated_at"]
+    assert timestamps["created_at"] == full["created_at"]
+
+
+def test_get_report_fields_sections_use_requested_version(client: TestClient):
+    report_id = _analyze(client)
+    v1 = client.get(f"/api/reports/{report_id}?fields=findings_json.sections").json()
+    v2 = client.get(f"/api/reports/{report_id}?fields=findings_json.sections&v=2").json()
+    assert isinstance(v1["findings_json"]["sections"][0]["checks"][0]["recommendation"], str)
+    assert isinstance(v2["findings_json"]["sections"][0]["checks"][0]["recommendation"], dict)
+
+
+def test_get_report_fields_legacy_row_and_missing_keys(client: TestClient, db):
+    """Uncompacted rows are read from findings_json; keys the document lacks are omitted."""
+    report = Report(
+        repo_url="https://github.com/test/old",
+        status="done",
+        overall_score=70,
+        findings_json={"overall_score": 70, "sections": []},
+    )
+    db.add(report)
+    db.commit()
+
+    resp = client.get(
+        f"/api/reports/{report.id}",
+        params={"fields": "status,findings_json.overall_score,findings_json.interview_pack"},
+    )
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "done", "findings_json": {"overall_score": 70}}
+    assert "etag" not in resp.headers
+
+
+def test_get_report_fields_value_types(client: TestClient, db):
+    """Strings, booleans, nested documents and JSON null come back as stored, on every database."""
+    findings = {"eta": "2026-01-01T00:00:00", "provisional": True, "sampling": {"files": [1, 2]}, "error": None}
+    report = Report(repo_url="https://github.com/test/types", status="pending", findings_v2=findings)
+    db.add(report)
+    db.commit()
+
+    fields = ",".join(f"findings_json.{k}" for k in findings)
+    resp = client.get(f"/api/reports/{report.id}?v=2", params={"fields": fields})
+    assert resp.status_code == 200
+    assert resp.json() == {"findings_json": {k: v for k, v in findings.items() if v is not None}}
+
+
+@pytest.mark.parametrize("dialect", [postgresql.asyncpg.dialect(), sqlite.dialect()])
+def test_findings_key_expr_compiles_for_each_dialect(dialect):
+    """Postgres rejects subscripting a function call, e.g. coalesce(...)['key']."""
+    sql = str(select(_findings_key_expr(dialect.name, "sampling")).compile(dialect=dialect))
+    assert "[" not in sql
+    assert ("jsonb_extract_path" if dialect.name == "postgresql" else "json_extract") in sql
+
+
+def test_get_report_fields_validation(client: TestClient):
+    report_id = _analyze(client)
+    resp = client.get(f"/api/reports/{report_id}?fields=id,secret")
+    assert resp.status_code == 400
+    assert "secret" in resp.json()["detail"]
+    assert client.get(f"/api/reports/{report_id}?fields=,").status_code == 400
+    assert client.get(f"/api/reports/{uuid.uuid4()}?fields=id").status_code == 404
+
+
+def test_get_report_section(client: TestClient):
+    """A single section is served on its own, in either recommendation shape."""
+    report_id = _analyze(client)
+    full = client.get(f"/api/reports/{report_id}?v=2").json()
+    expected = full["findings_json"]["sections"][1]
+
+    resp_v2 = client.get(f"/api/reports/{report_id}/sections/{expected['name']}?v=2")
+    assert resp_v2.status_code == 200
+    assert resp_v2.json() == expected
+
+    resp_v1 = client.get(f"/api/reports/{report_id}/sections/{expected['name']}")
+    assert resp_v1.status_code == 200
+    assert resp_v1.json()["name"] == expected["name"]
+    assert all(isinstance(c["recommendation"], str) for c in resp_v1.json()["checks"])
+
+    etag = resp_v2.headers["etag"]
+    assert etag != resp_v1.headers["etag"]
+    resp = client.get(
+        f"/api/reports/{report_id}/sections/{expected['name']}?v=2", headers={"If-None-Match": etag}
+    )
+    assert resp.status_code == 304
+
+
+def test_get_report_section_not_found(client: TestClient):
+    report_id = _analyze(client)
+    resp = client.get(f"/api/reports/{report_id}/sections/Nope")
+    assert resp.status_code == 404
+    assert resp.json()["detail"] == "Section not found"
+    resp = client.get(f"/api/reports/{uuid.uuid4()}/sections/Runability")
+    assert resp.status_code == 404
+    assert resp.json()["detail"] == "Report not found"
+
+
+def test_list_reports_keyset_pagination_walks_every_row_once(client: TestClient, db):
+    """Following X-Next-Cursor visits every report exactly once, newest first."""
+    for i in range(7):
+        db.add(Report(repo_url=f"https://github.com/test/page{i}", status="done", overall_score=i))
+    db.commit()
+
+    seen: list[str] = []
+    url = "/api/reports?limit=3"
+    pages = 0
+    while True:
+        resp = client.get(url)
+        assert resp.status_code == 200
+        seen.extend(item["id"] for item in resp.json())
+        pages += 1
+        cursor = resp.headers.get("x-next-cursor")
+        if not cursor:
+            break
+        url = f"/api/reports?limit=3&cursor={cursor}"
+
+    assert pages == 3
+    assert len(seen) == 7 and len(set(seen)) == 7
+    rows = db.query(Report.id, Report.created_at).all()
+    expected = [str(r.id) for r in sorted(rows, key=lambda r: (r.created_at, str(r.id)), reverse=True)]
+    assert seen == expected
+
+
+def test_list_reports_last_page_has_no_cursor(client: TestClient, db):
+    db.add(Report(repo_url="https://github.com/test/only", status="done", overall_score=1))
+    db.commit()
+    resp = client.get("/api/reports?limit=1")
+    assert len(resp.json()) == 1
+    assert "x-next-cursor" not in resp.headers
+
+
+def test_list_reports_invalid_cursor(client: TestClient):
+    assert client.get("/api/reports?cursor=not-a-uuid").status_code == 422
@@ -0,0 +1,96 @@
+"""Integration tests for GET /api/reports/search."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from app.models import Report, ReportFailedCheck
+
+
+def _seed(db) -> dict[str, Report]:
+    now = datetime.now(timezone.utc)
+    rows = {
+        "low": Report(repo_url="https://github.com/Acme/api", repo_owner="Acme", repo_name="api",
+                      status="done", overall_score=45, created_at=now - timedelta(days=1)),
+        "high": Report(repo_url="https://github.com/acme/web", repo_owner="acme", repo_name="web",
+                       status="done", overall_score=90, created_at=now - timedelta(days=2)),
+        "old": Report(repo_url="https://github.com/acme/api", repo_owner="acme", repo_name="api",
+                      status="done", overall_score=30, created_at=now - timedelta(days=30)),
+        "failed": Report(repo_url="https://github.com/acme/gone", repo_owner="acme", repo_name="gone",
+                         status="failed", created_at=now - timedelta(hours=1)),
+        "other": Report(repo_url="https://github.com/other/api", repo_owner="other", repo_name="api",
+                        status="done", overall_score=50, created_at=now - timedelta(hours=2)),
+    }
+    rows["low"].failed_checks = [ReportFailedCheck(check_id="secrets_possible_secrets")]
+    rows["other"].failed_checks = [
+        ReportFailedCheck(check_id="secrets_possible_secrets"),
+        ReportFailedCheck(check_id="runability_docker"),
+    ]
+    db.add_all(rows.values())
+    db.commit()
+    return rows
+
+
+def _ids(resp) -> set[str]:
+    assert resp.status_code == 200, resp.text
+    return {item["id"] for item in resp.json()}
+
+
+def test_search_owner_status_score_and_date(client: TestClient, db):
+    rows = _seed(db)
+    week_ago = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
+    resp = client.get(
+        "/api/reports/search",
+        params={"owner": "ACME", "status": "done", "max_score": 59, "created_after": week_ago},
+    )
+    assert _ids(resp) == {str(rows["low"].id)}
+    item = resp.json()[0]
+    assert item["repo_owner"] == "Acme" and item["status"] == "done" and item["score"] == 45
+
+
+def test_search_failing_check(client: TestClient, db):
+    rows = _seed(db)
+    resp = client.get("/api/reports/search", params={"failing_check": "secrets_possible_secrets"})
+    assert _ids(resp) == {str(rows["low"].id), str(rows["other"].id)}
+    resp = client.get("/api/reports/search", params={"failing_check": "runability_docker", "owner": "acme"})
+    assert _ids(resp) == set()
+
+
+def test_search_repo_and_score_range(client: TestClient, db):
+    rows = _seed(db)
+    assert _ids(client.get("/api/reports/search", params={"repo": "api"})) == {
+        str(rows["low"].id), str(rows["old"].id), str(rows["other"].id)
+    }
+    assert _ids(client.get("/api/reports/search", params={"min_score": 50, "max_score": 90})) == {
+        str(rows["high"].id), str(rows["other"].id)
+    }
+    assert _ids(client.get("/api/reports/search", params={"status": "failed"})) == {str(rows["failed"].id)}
+
+
+def test_search_paginates_newest_first(client: TestClient, db):
+    rows = _seed(db)
+    first = client.get("/api/reports/search", params={"owner": "acme", "limit": 2})
+    assert [i["id"] for i in first.json()] == [str(rows["failed"].id), str(rows["low"].id)]
+    cursor = first.headers["x-next-cursor"]
+    second = client.get("/api/reports/search", params={"owner": "acme", "limit": 2, "cursor": cursor})
+    assert [i["id"] for i in second.json()] == [str(rows["high"].id), str(rows["old"].id)]
+    assert "x-next-cursor" not in second.headers
+
+
+def test_search_rejects_invalid_filters(client: TestClient):
+    assert client.get("/api/reports/search", params={"status": "bogus"}).status_code == 422
+    assert client.get("/api/reports/search", params={"min_score": 101}).status_code == 422
+
+
+def test_analyze_records_failed_checks_and_owner(client: TestClient, db):
+    """POST /api/analyze denormalizes owner/repo and the failing check ids."""
+    resp = client.post("/api/analyze", json={"repo_url": "https://github.com/Some/Thing"})
+    report_id = resp.json()["report_id"]
+    report = db.query(Report).filter(Report.id == uuid.UUID(report_id)).first()
+    failed = {f.check_id for f in report.failed_checks}
+    # The mocked fetch has no README, Docker, tests or CI.
+    assert {"runability_readme_install_run", "runability_docker", "engineering_tests"} <= failed
+
+    found = client.get("/api/reports/search", params={"failing_check": "runability_docker"})
+    assert report_id in _ids(found)
@@ -0,0 +1,34 @@
+"""Integration tests for GET /metrics."""
+
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+
+def _value(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_analyze_records_pipeline_metrics(client: TestClient):
+    stages = ("fetch_repo", "analyze", "serialize", "db_commit")
+    before = {s: _value("shipcheck_stage_seconds_count", stage=s) for s in stages}
+    runability = _value("shipcheck_analyzer_seconds_count", analyzer="runability")
+
+    resp = client.post("/api/analyze", json={"repo_url": "https://github.com/test/repo"})
+    assert resp.status_code == 200
+    for s in stages:
+        assert _value("shipcheck_stage_seconds_count", stage=s) == before[s] + 1, s
+    assert _value("shipcheck_analyzer_seconds_count", analyzer="runability") == runability + 1
+    assert _value("shipcheck_analyses_in_flight") == 0
+
+    report_id = resp.json()["report_id"]
+    etag = client.get(f"/api/reports/{report_id}").headers["etag"]
+    hits = _value("shipcheck_cache_lookups_total", cache="report_etag", result="hit")
+    client.get(f"/api/reports/{report_id}", headers={"If-None-Match": etag})
+    assert _value("shipcheck_cache_lookups_total", cache="report_etag", result="hit") == hits + 1
+
+    metrics = client.get("/metrics")
+    assert metrics.status_code == 200
+    assert metrics.headers["content-type"].startswith("text/plain")
+    text = metrics.text
+    assert 'shipcheck_stage_seconds_bucket{le="0.001",stage="fetch_repo"}' in text
+    assert "shipcheck_analyses_in_flight" in text
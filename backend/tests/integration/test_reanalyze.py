@@ -0,0 +1,70 @@
+"""Integration tests for analysis snapshots and `python -m app.cli reanalyze`."""
+
+import json
+import uuid
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.cli import main
+from app.models import Report
+from app.services.snapshot_archive import SnapshotArchive
+
+CONTENT = {"app/main.py": "def run():\n    return 1\n"}
+FETCH = {
+    "owner": "owner", "name": "repo", "default_branch": "main", "key_files": [], "workflows": [],
+    "test_folders_detected": [], "tree_blobs": [{"path": "app/main.py", "sha": "a" * 40, "size": 25}],
+}
+
+
+def _analyze(client: TestClient, archive: SnapshotArchive) -> str:
+    with patch("app.api.reports.get_archive", return_value=archive), \
+            patch("app.api.reports.fetch_repo", return_value=FETCH), \
+            patch("app.api.reports.batch_fetch_text", return_value=CONTENT):
+        resp = client.post("/api/analyze", json={"repo_url": "https://github.com/test/repo"})
+    assert resp.status_code == 200
+    return resp.json()["report_id"]
+
+
+def test_analysis_inputs_are_snapshotted(client: TestClient, tmp_path):
+    archive = SnapshotArchive(tmp_path)
+    report_id = _analyze(client, archive)
+    repo_url, fetch, content, profile = archive.load(uuid.UUID(report_id))
+    assert repo_url == "https://github.com/test/repo"
+    assert fetch == FETCH
+    assert content == CONTENT
+    assert profile["name"] == "standard"
+
+
+def test_snapshot_failure_does_not_fail_the_analysis(client: TestClient, tmp_path):
+    archive = SnapshotArchive(tmp_path)
+    with patch.object(archive, "save", side_effect=OSError("disk full")):
+        report_id = _analyze(client, archive)
+    assert client.get(f"/api/reports/{report_id}").json()["status"] == "done"
+
+
+def test_reanalyze_prints_and_saves_new_reports(client: TestClient, db, tmp_path, capsys):
+    archive = SnapshotArchive(tmp_path)
+    report_id = _analyze(client, archive)
+    original = client.get(f"/api/reports/{report_id}").json()
+
+    assert main(["reanalyze", "--snapshot-dir", str(tmp_path)]) == 0
+    line = json.loads(capsys.readouterr().out)
+    assert line["report_id"] == report_id
+    assert line["overall_score"] == original["overall_score"]
+    assert "findings" not in line
+
+    with patch("app.cli.reanalyze.SessionLocal", return_value=db):
+        assert main(["reanalyze", report_id, str(uuid.uuid4()), "--snapshot-dir", str(tmp_path), "--save"]) == 1
+    saved, missing = [json.loads(x) for x in capsys.readouterr().out.splitlines()]
+    assert "error" in missing
+    assert saved["previous_score"] == original["overall_score"]
+    new = client.get(f"/api/reports/{saved['new_report_id']}").json()
+    assert new["status"] == "done" and new["repo_url"] == original["repo_url"]
+    assert new["findings_json"] == original["findings_json"]
+    assert db.query(Report).count() == 2
+
+
+def test_reanalyze_needs_an_archive(capsys):
+    with patch("app.cli.reanalyze.SNAPSHOT_DIR", None):
+        assert main(["reanalyze"]) == 2
@@ -0,0 +1,113 @@
+"""Integration tests for compressed report bodies: serving, passthrough and the backfill commands."""
+
+import uuid
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.cli import main as cli_main
+from app.cli.storage import compress_bodies, train
+from app.models import CompressionDictionary, Report
+
+
+def _analyze(client: TestClient) -> str:
+    resp = client.post("/api/analyze", json={"repo_url": "https://github.com/test/repo"})
+    assert resp.status_code == 200
+    return resp.json()["report_id"]
+
+
+def _row(db, report_id: str) -> Report:
+    db.expire_all()
+    return db.query(Report).filter(Report.id == uuid.UUID(report_id)).one()
+
+
+@pytest.fixture
+def gzip_storage():
+    with patch("app.api.reports.REPORT_BODY_COMPRESSION", "gzip"):
+        yield
+
+
+def test_gzip_body_passthrough_and_decode(client: TestClient, db, gzip_storage):
+    report_id = _analyze(client)
+    row = _row(db, report_id)
+    assert row.body_encoding == "gzip"
+
+    plain = client.get(f"/api/reports/{report_id}?v=2", headers={"Accept-Encoding": "identity"})
+    assert plain.status_code == 200
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+
+    passthrough = client.get(f"/api/reports/{report_id}?v=2", headers={"Accept-Encoding": "gzip"})
+    assert passthrough.headers["content-encoding"] == "gzip"
+    assert passthrough.headers["content-length"] == str(len(row.body_v2))
+    assert passthrough.json() == plain.json()
+    assert passthrough.headers["etag"] != plain.headers["etag"]
+
+    # Each representation validates only itself.
+    etag = passthrough.headers["etag"]
+    resp = client.get(
+        f"/api/reports/{report_id}?v=2", headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+    )
+    assert resp.status_code == 304
+    assert resp.headers["vary"] == "Accept-Encoding"
+    resp = client.get(
+        f"/api/reports/{report_id}?v=2", headers={"Accept-Encoding": "identity", "If-None-Match": etag}
+    )
+    assert resp.status_code == 200
+
+    v1 = client.get(f"/api/reports/{report_id}").json()
+    assert isinstance(v1["findings_json"]["sections"][0]["checks"][0]["recommendation"], str)
+    assert v1["id"] == report_id
+
+
+def test_zdict_bodies_after_training(client: TestClient, db):
+    seed_ids = [_analyze(client) for _ in range(3)]
+    entry = train(db, samples=10)
+    assert entry is not None and entry.sample_count == 3
+
+    with patch("app.api.reports.REPORT_BODY_COMPRESSION", "zdict"):
+        report_id = _analyze(client)
+    row = _row(db, report_id)
+    assert (row.body_encoding, row.body_dict_id) == ("zdict", entry.id)
+
+    resp = client.get(f"/api/reports/{report_id}?v=2", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert "content-encoding" not in resp.headers
+    reference = client.get(f"/api/reports/{seed_ids[0]}?v=2").json()
+    assert resp.json()["findings_json"] == reference["findings_json"]
+
+
+def test_compress_bodies_backfill_round_trip(client: TestClient, db):
+    ids = [_analyze(client) for _ in range(3)]
+    originals = {i: client.get(f"/api/reports/{i}?v=2").content for i in ids}
+
+    converted, before, after = compress_bodies(db, "gzip", batch_size=2)
+    assert converted == 3 and after < before
+    assert compress_bodies(db, "gzip")[0] == 0  # idempotent
+
+    train(db)
+    assert compress_bodies(db, "zdict")[0] == 3
+    assert {_row(db, i).body_encoding for i in ids} == {"zdict"}
+    for i in ids:
+        resp = client.get(f"/api/reports/{i}?v=2")
+        assert resp.content == originals[i]
+
+    assert compress_bodies(db, "none")[0] == 3
+    for i in ids:
+        row = _row(db, i)
+        assert row.body_encoding is None and row.body_v2 == originals[i]
+
+
+def test_cli_commands(client: TestClient, db, capsys):
+    from tests.conftest import TestSessionLocal
+
+    with patch("app.cli.storage.SessionLocal", TestSessionLocal):
+        assert cli_main(["train-dictionary"]) == 1
+        _analyze(client)
+        assert cli_main(["train-dictionary", "--samples", "5"]) == 0
+        assert cli_main(["compress-bodies", "--codec", "zdict"]) == 0
+    out = capsys.readouterr().out
+    assert "No stored report bodies" in out
+    assert "Re-encoded 1 of 1 bodies as zdict" in out
+    assert db.query(CompressionDictionary).count() == 1
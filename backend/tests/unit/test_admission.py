@@ -0,0 +1,158 @@
+"""Unit tests for analysis admission control."""
+
+import asyncio
+
+import pytest
+
+from app.core.admission import MAX_RETRY_AFTER, AdmissionController, AdmissionRejected
+
+
+def test_admits_up_to_limit_then_queues_in_order():
+    async def run():
+        admission = AdmissionController(max_concurrent=2, max_queue=5, queue_timeout=5)
+        order = []
+
+        async def job(n: int, hold: asyncio.Event):
+            async with admission.admitted():
+                order.append(n)
+                await hold.wait()
+
+        holds = [asyncio.Event() for _ in range(4)]
+        tasks = [asyncio.create_task(job(n, holds[n])) for n in range(4)]
+        await asyncio.sleep(0)
+        assert admission.running == 2 and admission.queued == 2
+        assert order == [0, 1]
+        holds[1].set()
+        await asyncio.sleep(0.01)
+        assert order == [0, 1, 2]
+        for h in holds:
+            h.set()
+        await asyncio.gather(*tasks)
+        assert order == [0, 1, 2, 3]
+        assert admission.running == 0 and admission.queued == 0
+        assert admission.admitted_total == 4
+
+    asyncio.run(run())
+
+
+def test_rejects_when_queue_full_with_retry_after():
+    async def run():
+        admission = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=5)
+        admission.avg_duration = 10.0
+        await admission.acquire()
+        waiter = asyncio.create_task(admission.acquire())
+        await asyncio.sleep(0)
+        assert admission.saturated()
+        with pytest.raises(AdmissionRejected) as exc:
+            await admission.acquire()
+        # one queued plus this request, drained by one slot at 10s each
+        assert exc.value.retry_after == 20
+        assert admission.rejected_total == 1
+        admission.release()
+        await waiter
+        assert admission.running == 1 and admission.queued == 0
+
+    asyncio.run(run())
+
+
+def test_queue_wait_times_out():
+    async def run():
+        admission = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=0.01)
+        await admission.acquire()
+        with pytest.raises(AdmissionRejected):
+            await admission.acquire()
+        assert admission.queued == 0
+        admission.release()
+        assert admission.running == 0
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_leaves_queue():
+    async def run():
+        admission = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=5)
+        await admission.acquire()
+        waiter = asyncio.create_task(admission.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert admission.queued == 0
+        admission.release()
+        assert admission.running == 0
+
+    asyncio.run(run())
+
+
+def test_blocking_acquire_ignores_queue_limit():
+    async def run():
+        admission = AdmissionController(max_concurrent=1, max_queue=0, queue_timeout=0.01)
+        await admission.acquire()
+        waiter = asyncio.create_task(admission.acquire(block=True))
+        await asyncio.sleep(0.05)
+        assert not waiter.done() and admission.queued == 1
+        admission.release()
+        await waiter
+        assert admission.running == 1
+
+    asyncio.run(run())
+
+
+def test_duration_average_and_retry_after_cap():
+    admission = AdmissionController(max_concurrent=1, max_queue=10, queue_timeout=5)
+    admission.running = 1
+    admission.release(duration=55.0)
+    assert admission.avg_duration == pytest.approx(15.0)
+    admission.avg_duration = 10_000.0
+    assert admission.retry_after() == MAX_RETRY_AFTER
+
+
+def test_disabled_admits_everything():
+    async def run():
+        admission = AdmissionController(max_concurrent=0, max_queue=0, queue_timeout=0)
+        for _ in range(100):
+            await admission.acquire()
+        assert not admission.saturated()
+        assert admission.status()["enabled"] is False
+
+    asyncio.run(run())
+
+
+def test_cheapest_waiter_runs_first_and_aging_bounds_the_wait():
+    async def run(aging: float) -> list[str]:
+        admission = AdmissionController(max_concurrent=1, max_queue=5, queue_timeout=5, aging=aging)
+        order = []
+
+        async def job(name: str, cost: float):
+            async with admission.admitted(cost=cost):
+                order.append(name)
+
+        await admission.acquire()
+        big = asyncio.create_task(job("big", 60))
+        await asyncio.sleep(0.01)
+        small = asyncio.create_task(job("small", 1))
+        await asyncio.sleep(0)
+        assert admission.status()["queued_seconds"] == 61
+        admission.release()
+        await asyncio.gather(big, small)
+        return order
+
+    assert asyncio.run(run(aging=1.0)) == ["small", "big"]
+    # Aging this strong turns the queue into first come, first served.
+    assert asyncio.run(run(aging=1e6)) == ["big", "small"]
+
+
+def test_eta_counts_cheaper_work_ahead():
+    async def run():
+        admission = AdmissionController(max_concurrent=1, max_queue=5, queue_timeout=5, aging=0)
+        assert admission.eta(3) == 3
+        await admission.acquire()
+        waiters = [asyncio.create_task(admission.acquire(cost=c)) for c in (2, 50)]
+        await asyncio.sleep(0)
+        assert admission.eta(10) == pytest.approx(12)
+        assert admission.retry_after(10) == 62
+        for w in waiters:
+            w.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+
+    asyncio.run(run())
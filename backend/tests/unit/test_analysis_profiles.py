@@ -0,0 +1,61 @@
+"""Unit tests for analysis_profiles: named profiles, overrides and ceilings."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.core.analysis_profiles import (
+    DEEP,
+    PROFILE_CEILINGS,
+    STANDARD,
+    AnalysisProfile,
+    InvalidProfileError,
+    resolve_profile,
+)
+from app.services.analyzer import _complexity_checks
+
+
+def test_resolve_named_and_default():
+    assert resolve_profile() == STANDARD
+    assert resolve_profile("deep") == DEEP
+    assert resolve_profile("quick").max_files_fetch < STANDARD.max_files_fetch
+
+
+def test_overrides_apply_within_ceilings():
+    p = resolve_profile("quick", {"max_files_fetch": 10, "complexity_high": 5})
+    assert p.name == "quick" and p.max_files_fetch == 10 and p.complexity_high == 5
+
+
+@pytest.mark.parametrize("overrides", [
+    {"max_files_fetch": 0},
+    {"max_files_fetch": PROFILE_CEILINGS["max_files_fetch"][1] + 1},
+    {"max_total_bytes": "big"},
+    {"max_bucket_f": True},
+    {"timeout": 5},
+    {"complexity_high": 30, "complexity_very_high": 20},
+])
+def test_invalid_overrides(overrides):
+    with pytest.raises(InvalidProfileError):
+        resolve_profile("standard", overrides)
+
+
+def test_unknown_profile():
+    with pytest.raises(InvalidProfileError):
+        resolve_profile("exhaustive")
+
+
+def test_profiles_are_clamped_to_configured_ceilings():
+    with patch.dict(PROFILE_CEILINGS, {"max_files_fetch": (1, 100)}):
+        assert resolve_profile("deep").max_files_fetch == 100
+
+
+def test_stored_profile_round_trip():
+    p = resolve_profile("deep", {"max_bucket_f": 12})
+    assert AnalysisProfile.from_dict(p.as_dict()) == p
+    assert AnalysisProfile.from_dict(None) == STANDARD
+
+
+def test_complexity_thresholds_are_tunable():
+    branchy = "def f(x):\n" + "".join(f"    if x == {i}:\n        return {i}\n" for i in range(6)) + "    return 0\n"
+    assert _complexity_checks({"a.py": branchy})[0].status == "pass"
+    assert _complexity_checks({"a.py": branchy}, high=5, very_high=50)[0].status == "warn"
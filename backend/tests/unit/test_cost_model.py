@@ -0,0 +1,56 @@
+"""Unit tests for the analysis cost model."""
+
+from dataclasses import replace
+
+import pytest
+
+from app.core.analysis_profiles import QUICK, STANDARD
+from app.services.cost_model import MAX_RATIO, CostModel, RepoStats, estimate_cost
+
+
+def _blobs(n: int, ext: str = "py", size: int = 4000, prefix: str = "src") -> list[dict]:
+    return [{"path": f"{prefix}/m{i}.{ext}", "sha": f"{ext}{i}", "size": size} for i in range(n)]
+
+
+def test_stats_follow_profile_limits_and_language_mix():
+    tree = _blobs(300) + _blobs(100, "ts") + [{"path": "logo.png", "sha": "p", "size": 10**6}]
+    stats = RepoStats.from_tree(tree, STANDARD)
+    assert stats.tree_files == 401
+    assert stats.fetch_files == STANDARD.max_files_fetch
+    assert stats.fetch_bytes == 250 * 4000
+    assert stats.bytes_by_language["python"] == pytest.approx(3 * stats.bytes_by_language["javascript"], rel=0.01)
+
+    small = RepoStats.from_tree(tree, replace(QUICK, max_total_bytes=10_000))
+    assert small.fetch_bytes == 10_000
+
+
+def test_files_outside_code_folders_are_not_counted():
+    assert RepoStats.from_tree(_blobs(10, prefix="tests"), STANDARD).fetch_files == 0
+    assert RepoStats.from_tree([{"path": "README.md", "sha": "r", "size": 10}], STANDARD).fetch_files == 1
+
+
+def test_larger_repositories_cost_more():
+    model = CostModel()
+    small = model.predict(RepoStats.from_tree(_blobs(20), STANDARD))
+    large = model.predict(RepoStats.from_tree(_blobs(5000, size=20_000), STANDARD))
+    assert 0 < small.total_seconds < large.total_seconds
+    assert large.fetch_seconds > small.fetch_seconds and large.analyze_seconds > small.analyze_seconds
+
+
+def test_observe_calibrates_towards_measured_times():
+    model = CostModel()
+    stats = RepoStats.from_tree(_blobs(100), STANDARD)
+    before = model.predict(stats)
+    for _ in range(100):
+        model.observe(stats, before.fetch_seconds * 2, before.analyze_seconds / 2)
+    after = model.predict(stats)
+    assert after.fetch_seconds == pytest.approx(before.fetch_seconds * 2, rel=0.01)
+    assert after.analyze_seconds == pytest.approx(before.analyze_seconds / 2, rel=0.01)
+    assert model.status()["observations"] == 100
+
+    model.observe(stats, 10**9, None)
+    assert model.fetch_scale <= MAX_RATIO
+
+
+def test_estimate_cost_without_tree():
+    assert estimate_cost({}).fetch_seconds == 0
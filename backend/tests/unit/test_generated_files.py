@@ -0,0 +1,65 @@
+"""Unit tests for the generated / minified file classifier."""
+
+import base64
+import os
+
+import pytest
+
+from app.services.generated_files import classify_path, classify_text, generated_summary
+
+HAND_WRITTEN = "import os\n\n\ndef main():\n    return os.getcwd()\n" * 40
+
+
+@pytest.mark.parametrize("text", [
+    "# Generated by Django 4.2 on 2024-01-01 12:00\nfrom django.db import migrations\n",
+    "// Code generated by protoc-gen-go. DO NOT EDIT.\npackage api\n",
+    "/**\n * @generated\n */\nexport const x = 1\n",
+    '"""Add users\n\nRevision ID: 1\n"""\n\n\ndef upgrade():\n    # ### commands auto generated by Alembic - please adjust! ###\n    pass\n',
+    "/******/ (() => { // webpackBootstrap\n/******/ \tvar __webpack_modules__ = ({});\n",
+])
+def test_generator_markers(text):
+    assert classify_text(text) == "marker"
+
+
+def test_minified_and_encoded_content():
+    assert classify_text('"use strict";' + "var a=function(b,c){return b+c};" * 200) == "minified"
+    assert classify_text(base64.encodebytes(os.urandom(3000)).decode()) == "encoded"
+
+
+def test_hand_written_code_is_not_generated():
+    assert classify_text(HAND_WRITTEN) is None
+    assert classify_text("") is None
+    # Markers below the header are prose, not a banner.
+    assert classify_text(HAND_WRITTEN + "# Files generated by protoc are skipped\n") is None
+
+
+@pytest.mark.parametrize("text", [
+    '"""\nrequests.hooks\n\nAvailable hooks:\n\n``response``:\n    The response generated from a Request.\n"""\n',
+    '"""Generated by hand. Do not edit the order of these constants."""\nA = 1\n',
+    "# The client code generated with this helper is cached.\n# Do not modify without a migration.\nx = 1\n",
+    "// Values generated from the schema; do not edit them here.\nexport const x = 1\n",
+    'HELP = "auto generated by Alembic"\nBANNER = "/******/"\n',
+])
+def test_prose_about_generated_code_is_not_a_banner(text):
+    assert classify_text(text) is None
+
+
+def test_this_classifier_does_not_flag_itself():
+    import app.services.generated_files as module
+
+    assert classify_text(open(module.__file__).read()) is None
+    assert classify_text(open(__file__).read()) is None
+
+
+def test_lockfiles_by_name():
+    assert classify_path("frontend/package-lock.json") == "lockfile"
+    assert classify_path("poetry.lock") == "lockfile"
+    assert classify_path("src/lock.py") is None
+
+
+def test_summary():
+    assert generated_summary({}) is None
+    assert generated_summary({
+        "yarn.lock": {"reason": "lockfile", "size": 100},
+        "src/bundle.js": {"reason": "minified", "size": 50},
+    }) == {"files": 2, "bytes": 150, "reasons": {"lockfile": 1, "minified": 1}, "paths": ["src/bundle.js", "yarn.lock"]}
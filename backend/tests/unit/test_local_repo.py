@@ -0,0 +1,168 @@
+"""Unit tests for local_repo: directory, zip and git sources give the API's analyzer inputs."""
+
+import json
+import shutil
+import subprocess
+import zipfile
+
+import pytest
+
+from app.cli import main
+from app.core.analysis_profiles import resolve_profile
+from app.services.local_repo import LocalSourceError, git_blob_sha, load_source, report_json
+
+FILES = {
+    "README.md": "# Demo\n\n## Install\n\npip install demo\n",
+    "app/main.py": "def run(x):\n    if x:\n        return 1\n    return 2\n",
+    "tests/test_main.py": "def test_run():\n    assert True\n",
+    ".github/workflows/ci.yml": "on: push\n",
+    "node_modules/left-pad/index.js": "module.exports = 1\n",
+}
+
+
+def _write(root, files=FILES):
+    for rel, text in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return root
+
+
+def _git(root, *args):
+    subprocess.run(
+        ["git", "-C", str(root), "-c", "user.email=t@example.com", "-c", "user.name=t", *args],
+        check=True, capture_output=True,
+    )
+
+
+def test_directory_source_matches_fetch_repo_shape(tmp_path):
+    fetch, content = load_source(str(_write(tmp_path / "demo")))
+    assert fetch["owner"] == "local" and fetch["name"] == "demo"
+    paths = set(fetch["tree_paths"])
+    assert "app/main.py" in paths and not any(p.startswith("node_modules/") for p in paths)
+    blob = next(b for b in fetch["tree_blobs"] if b["path"] == "app/main.py")
+    assert blob["sha"] == git_blob_sha(FILES["app/main.py"].encode())
+    assert [k["path"] for k in fetch["key_files"]] == ["README.md"]
+    assert fetch["key_files"][0]["snippet"].startswith("# Demo")
+    assert fetch["workflows"][0]["path"] == ".github/workflows/ci.yml"
+    assert fetch["test_folders_detected"] == ["tests"]
+    assert content["app/main.py"] == FILES["app/main.py"]
+
+
+def test_zip_strips_single_top_folder(tmp_path):
+    src = _write(tmp_path / "demo")
+    archive = tmp_path / "demo.zip"
+    with zipfile.ZipFile(archive, "w") as z:
+        for rel, text in FILES.items():
+            z.writestr(f"demo-main/{rel}", text)
+    fetch, content = load_source(str(archive))
+    assert fetch["name"] == "demo-main"
+    assert sorted(fetch["tree_paths"]) == sorted(load_source(str(src))[0]["tree_paths"])
+    assert content["app/main.py"] == FILES["app/main.py"]
+
+
+def test_zip_does_not_decompress_members_it_would_not_read(tmp_path):
+    from unittest.mock import patch
+
+    from app.services import local_repo
+
+    archive = tmp_path / "demo.zip"
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("README.md", "# Big\n" + "x" * 300_000)
+        z.writestr("assets/logo.png", b"\0" * 5_000_000)
+        z.writestr("app/main.py", FILES["app/main.py"])
+    with patch.object(local_repo, "_hash_member", wraps=local_repo._hash_member) as hashed, \
+            patch.object(zipfile.ZipFile, "close", autospec=True, side_effect=zipfile.ZipFile.close) as closed:
+        fetch, content = load_source(str(archive))
+    assert [call.args[1].filename for call in hashed.call_args_list] == ["app/main.py"]
+    assert closed.called
+    blobs = {b["path"]: b for b in fetch["tree_blobs"]}
+    assert blobs["assets/logo.png"] == {"path": "assets/logo.png", "sha": None, "size": 5_000_000}
+    assert blobs["app/main.py"]["sha"] == git_blob_sha(FILES["app/main.py"].encode())
+    readme = next(k for k in fetch["key_files"] if k["path"] == "README.md")
+    assert readme["skipped"] and readme["size"] == 300_006
+    assert content == {"app/main.py": FILES["app/main.py"]}
+
+
+def test_directory_does_not_hash_files_it_would_not_read(tmp_path):
+    from unittest.mock import patch
+
+    from app.services import local_repo
+
+    root = _write(tmp_path / "demo")
+    (root / "data.csv").write_bytes(b"1,2\n" * 100_000)
+    (root / "app" / "logo.png").write_bytes(b"\0" * 1000)
+    with patch.object(local_repo, "_hash_file", wraps=local_repo._hash_file) as hashed:
+        fetch, content = load_source(str(root))
+    hashed_paths = {call.args[0].relative_to(root).as_posix() for call in hashed.call_args_list}
+    assert hashed_paths == {p for p in FILES if not p.startswith("node_modules/")}
+    blobs = {b["path"]: b for b in fetch["tree_blobs"]}
+    assert blobs["data.csv"] == {"path": "data.csv", "sha": None, "size": 400_000}
+    assert blobs["app/logo.png"]["sha"] is None
+    assert content["app/main.py"] == FILES["app/main.py"] and "data.csv" not in content
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+def test_git_ref_reads_committed_tree(tmp_path):
+    work = _write(tmp_path / "demo")
+    _git(work, "init", "-q", "-b", "main")
+    _git(work, "add", "-A")
+    _git(work, "commit", "-qm", "init")
+    (work / "app" / "later.py").write_text("x = 1\n")
+
+    fetch, content = load_source(str(work), ref="HEAD")
+    assert "app/later.py" not in fetch["tree_paths"]
+    assert fetch["default_branch"] == "main"
+    assert content["app/main.py"] == FILES["app/main.py"]
+
+    bare = tmp_path / "demo.git"
+    subprocess.run(["git", "clone", "-q", "--bare", str(work), str(bare)], check=True)
+    fetch, _ = load_source(str(bare))
+    assert fetch["name"] == "demo"
+    assert {b["sha"] for b in fetch["tree_blobs"]} >= {git_blob_sha(FILES["app/main.py"].encode())}
+
+    with pytest.raises(LocalSourceError):
+        load_source(str(work), ref="no-such-ref")
+
+
+def test_selection_limits_apply(tmp_path):
+    files = {f"app/m{i}.py": f"x = {i}\n" for i in range(5)}
+    root = str(_write(tmp_path / "many", files))
+    assert len(load_source(root)[1]) == 5
+    assert len(load_source(root, profile=resolve_profile("standard", {"max_files_fetch": 2}))[1]) == 2
+
+
+def test_missing_source_raises(tmp_path):
+    with pytest.raises(LocalSourceError):
+        load_source(str(tmp_path / "nope"))
+    (tmp_path / "plain.txt").write_text("x")
+    with pytest.raises(LocalSourceError):
+        load_source(str(tmp_path / "plain.txt"))
+
+
+def test_report_json_has_scores(tmp_path):
+    report = report_json(str(_write(tmp_path / "demo")))
+    assert report["repo"] == "local/demo"
+    assert 0 <= report["overall_score"] <= 100
+    json.dumps(report)
+
+
+def test_generated_files_are_reported_not_analyzed(tmp_path):
+    bundle = "!function(e){" + "var t=e.length;" * 100 + "}();\n"
+    fetch, content = load_source(str(_write(tmp_path / "demo", {**FILES, "src/vendor.js": bundle, "package-lock.json": "{}"})))
+    assert "src/vendor.js" not in content and "package-lock.json" not in content
+    assert fetch["generated_files"]["src/vendor.js"]["reason"] == "minified"
+    report = report_json(str(tmp_path / "demo"))
+    assert report["generated"]["reasons"] == {"lockfile": 1, "minified": 1}
+
+
+def test_analyze_cli_prints_one_line_per_source(tmp_path, capsys):
+    src = str(_write(tmp_path / "demo"))
+    assert main(["analyze", src, str(tmp_path / "nope")]) == 1
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert lines[0]["source"] == src and "overall_score" in lines[0]
+    assert "error" in lines[1]
+
+    out = tmp_path / "out.json"
+    assert main(["analyze", src, "--output", str(out), "--pretty"]) == 0
+    assert json.loads(out.read_text())["repo"] == "local/demo"
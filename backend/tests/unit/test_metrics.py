@@ -0,0 +1,77 @@
+"""Unit tests for app.core.metrics."""
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core.metrics import (
+    github_endpoint,
+    record_cache,
+    record_github_response,
+    render,
+    time_analyzer,
+    time_stage,
+)
+from app.services.repo_content import batch_fetch_text
+
+
+def _value(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.parametrize(
+    "url, endpoint",
+    [
+        ("https://api.github.com/repos/o/r", "repo"),
+        ("https://api.github.com/repos/o/r/git/trees/main?recursive=1", "tree"),
+        ("https://api.github.com/repos/o/r/git/blobs/abc", "blob"),
+        ("https://api.github.com/repos/o/r/contents/README.md?ref=main", "contents"),
+        ("https://api.github.com/repos/o/r/git/refs", "other"),
+        ("https://api.github.com/repos/o/r/pulls", "other"),
+        ("https://api.github.com/rate_limit", "other"),
+    ],
+)
+def test_github_endpoint(url, endpoint):
+    assert github_endpoint(url) == endpoint
+
+
+def test_github_responses_are_counted_with_bytes():
+    before = _value("shipcheck_github_requests_total", endpoint="blob", status="200")
+    bytes_before = _value("shipcheck_github_downloaded_bytes_total", endpoint="blob")
+    record_github_response("https://api.github.com/repos/o/r/git/blobs/1", 200, 120)
+    record_github_response("https://api.github.com/repos/o/r/git/blobs/2", "error", 0)
+    assert _value("shipcheck_github_requests_total", endpoint="blob", status="200") == before + 1
+    assert _value("shipcheck_github_requests_total", endpoint="blob", status="error") >= 1
+    assert _value("shipcheck_github_downloaded_bytes_total", endpoint="blob") == bytes_before + 120
+
+
+def test_timers_observe_stage_and_analyzer():
+    before = _value("shipcheck_stage_seconds_count", stage="select_candidates")
+    with time_stage("select_candidates"):
+        pass
+    assert _value("shipcheck_stage_seconds_count", stage="select_candidates") == before + 1
+
+    before = _value("shipcheck_analyzer_seconds_count", analyzer="smells")
+    with time_analyzer("smells"):
+        pass
+    assert _value("shipcheck_analyzer_seconds_count", analyzer="smells") == before + 1
+
+
+def test_blob_cache_lookups(monkeypatch):
+    monkeypatch.setattr("app.services.repo_content.get_blob_text", lambda o, r, sha: "x = 1\n")
+    hits = _value("shipcheck_cache_lookups_total", cache="blob", result="hit")
+    misses = _value("shipcheck_cache_lookups_total", cache="blob", result="miss")
+    blobs = [{"path": "a.py", "sha": "s1"}, {"path": "b.py", "sha": "s1"}, {"path": "c.py", "sha": "s2"}]
+    batch_fetch_text("o", "r", blobs)
+    assert _value("shipcheck_cache_lookups_total", cache="blob", result="hit") == hits + 1
+    assert _value("shipcheck_cache_lookups_total", cache="blob", result="miss") == misses + 2
+
+
+def test_render_text_format(monkeypatch, tmp_path):
+    record_cache("diff", True)
+    body, content_type = render()
+    assert content_type.startswith("text/plain")
+    assert b'shipcheck_cache_lookups_total{cache="diff",result="hit"}' in body
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    body, _ = render()  # aggregates the (empty) shared directory
+    assert b"shipcheck_stage_seconds" not in body
@@ -0,0 +1,39 @@
+"""Unit tests for app.core.profiling."""
+
+import time
+
+from app.core.profiling import StackSampler
+
+
+def _spin(seconds: float) -> int:
+    end = time.perf_counter() + seconds
+    n = 0
+    while time.perf_counter() < end:
+        n += 1
+    return n
+
+
+def _work() -> int:
+    return _spin(0.05)
+
+
+def test_sampler_returns_the_result_and_collapses_stacks():
+    sampler = StackSampler(interval=0.001, root=_work)
+    assert sampler.run(_work) > 0
+    assert sampler.samples > 0
+    assert sampler.duration >= 0.05
+
+    lines = sampler.collapsed().splitlines()
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    frames = stack.split(";")
+    assert frames[0] == f"{__name__}:_work"
+    assert f"{__name__}:_spin" in frames
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == sampler.samples
+
+
+def test_samples_outside_the_root_are_ignored():
+    sampler = StackSampler(interval=0.001, root=_work)
+    sampler.run(_spin, 0.02)
+    assert sampler.samples == 0
+    assert sampler.collapsed() == ""
@@ -1,14 +1,21 @@
 """Unit tests for rate limiting logic."""
 
-import time
+import threading
+
 import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from app.core.rate_limit import (
+    DatabaseRateLimitStore,
+    MemoryRateLimitStore,
     RateLimitExceeded,
     check_analyze_rate_limit,
     WINDOW_SECONDS,
     MAX_REQUESTS_PER_WINDOW,
 )
+from app.models import Base, RateLimitBucket
 
 
 def test_rate_limit_allows_requests():
@@ -17,11 +24,11 @@ def test_rate_limit_allows_requests():
     # Clear any existing state
     from app.core.rate_limit import _store
     _store.clear()
-    
+
     # Make requests up to limit
     for _ in range(MAX_REQUESTS_PER_WINDOW):
         check_analyze_rate_limit(ip)
-    
+
     # Should not raise
 
 
@@ -30,49 +37,134 @@ def test_rate_limit_blocks_excess():
     ip = "127.0.0.2"
     from app.core.rate_limit import _store
     _store.clear()
-    
+
     # Make requests up to limit
     for _ in range(MAX_REQUESTS_PER_WINDOW):
         check_analyze_rate_limit(ip)
-    
+
     # Next request should fail
     with pytest.raises(RateLimitExceeded, match="Too many analyze requests"):
         check_analyze_rate_limit(ip)
 
 
+def test_rate_limit_disabled_with_zero():
+    """ANALYZE_RATE_LIMIT=0 lets every request through."""
+    from unittest.mock import patch
+
+    from app.core.rate_limit import _store
+    _store.clear()
+
+    with patch("app.core.rate_limit.MAX_REQUESTS_PER_WINDOW", 0):
+        for _ in range(50):
+            check_analyze_rate_limit("127.0.0.9")
+
+
 def test_rate_limit_different_ips():
     """Test that different IPs have separate limits."""
     ip1 = "127.0.0.3"
     ip2 = "127.0.0.4"
     from app.core.rate_limit import _store
     _store.clear()
-    
+
     # Exhaust limit for ip1
     for _ in range(MAX_REQUESTS_PER_WINDOW):
         check_analyze_rate_limit(ip1)
-    
+
     # ip2 should still be able to make requests
     check_analyze_rate_limit(ip2)
     check_analyze_rate_limit(ip2)
 
 
 def test_rate_limit_window_expiry():
-    """Test that old requests expire after window."""
-    ip = "127.0.0.5"
-    from app.core.rate_limit import _store, _prune
-    _store.clear()
-    
-    # Make requests up to limit
+    """Requests age out of the sliding window: half of the previous window still counts halfway through."""
+    store = MemoryRateLimitStore()
+    t0 = 1000 * WINDOW_SECONDS  # start of a window
+
     for _ in range(MAX_REQUESTS_PER_WINDOW):
-        check_analyze_rate_limit(ip)
-    
-    # Manually expire old timestamps (simulate time passing)
-    _store[ip] = [time.monotonic() - WINDOW_SECONDS - 1]
-    
-    # Prune expired entries (this happens in check_analyze_rate_limit)
-    _prune(_store[ip], WINDOW_SECONDS)
-    
-    # Should be able to make new request
-    check_analyze_rate_limit(ip)
-    # After pruning and adding new request, should have 1 item (old was pruned)
-    assert len(_store[ip]) == 1
+        assert store.hit("ip", MAX_REQUESTS_PER_WINDOW, WINDOW_SECONDS, now=t0)
+    assert not store.hit("ip", MAX_REQUESTS_PER_WINDOW, WINDOW_SECONDS, now=t0 + 1)
+
+    # Halfway through the next window, the previous window counts for half.
+    halfway = t0 + WINDOW_SECONDS * 1.5
+    allowed = sum(
+        store.hit("ip", MAX_REQUESTS_PER_WINDOW, WINDOW_SECONDS, now=halfway)
+        for _ in range(MAX_REQUESTS_PER_WINDOW)
+    )
+    assert allowed == MAX_REQUESTS_PER_WINDOW // 2
+
+    # Two windows later everything has expired.
+    assert store.hit("ip", MAX_REQUESTS_PER_WINDOW, WINDOW_SECONDS, now=t0 + WINDOW_SECONDS * 3)
+
+
+def test_memory_store_evicts_idle_keys():
+    store = MemoryRateLimitStore()
+    store.hit("idle", 5, 60, now=0.0)
+    store.hit("busy", 5, 60, now=100.0)
+    assert len(store) == 2
+    store.hit("busy", 5, 60, now=121.0)  # "idle" last seen > 2 windows ago
+    assert len(store) == 1
+
+
+def test_memory_store_is_bounded():
+    store = MemoryRateLimitStore(max_keys=3)
+    for i in range(10):
+        store.hit(f"ip{i}", 5, 60, now=float(i))
+    assert len(store) == 3
+
+
+def test_memory_store_is_thread_safe():
+    store = MemoryRateLimitStore()
+    results: list[bool] = []
+
+    def worker():
+        for _ in range(50):
+            results.append(store.hit("shared", 100, 60, now=30.0))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(results) == 100
+
+
+@pytest.fixture
+def db_store():
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine, tables=[RateLimitBucket.__table__])
+    factory = sessionmaker(bind=engine)
+    yield DatabaseRateLimitStore(session_factory=factory), factory
+    engine.dispose()
+
+
+def test_database_store_enforces_limit(db_store):
+    store, _ = db_store
+    t0 = 500 * WINDOW_SECONDS
+    for _ in range(3):
+        assert store.hit("ip", 3, WINDOW_SECONDS, now=t0)
+    assert not store.hit("ip", 3, WINDOW_SECONDS, now=t0 + 1)
+    assert store.hit("other", 3, WINDOW_SECONDS, now=t0 + 1)
+    assert store.hit("ip", 3, WINDOW_SECONDS, now=t0 + WINDOW_SECONDS * 3)
+
+
+def test_database_store_shared_between_instances(db_store):
+    """Two store instances (as in two workers) see the same counters."""
+    store, factory = db_store
+    other_worker = DatabaseRateLimitStore(session_factory=factory)
+    t0 = 700 * WINDOW_SECONDS
+    assert store.hit("ip", 2, WINDOW_SECONDS, now=t0)
+    assert other_worker.hit("ip", 2, WINDOW_SECONDS, now=t0)
+    assert not store.hit("ip", 2, WINDOW_SECONDS, now=t0)
+
+
+def test_database_store_purges_expired_rows(db_store):
+    store, factory = db_store
+    store.hit("old", 3, WINDOW_SECONDS, now=0.0)
+    store.hit("new", 3, WINDOW_SECONDS, now=WINDOW_SECONDS * 10.0)
+    with factory() as db:
+        assert [r.key for r in db.query(RateLimitBucket).all()] == ["new"]
+    store.clear()
+    with factory() as db:
+        assert db.query(RateLimitBucket).count() == 0
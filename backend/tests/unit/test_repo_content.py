@@ -55,3 +55,34 @@ def test_batch_fetch_text_uses_cache_same_sha(mock_get_blob):
     assert out["a.py"] == "same"
     assert out["b.py"] == "same"
     assert mock_get_blob.call_count == 1
+
+
+@patch("app.services.repo_content.get_blob_text")
+def test_batch_fetch_text_leaves_out_generated_files(mock_get_blob):
+    """Lockfiles are not downloaded; generated texts are recorded, not returned, and use a file slot."""
+    texts = {"s1": "// @generated\nexport const a = 1\n", "s2": "x = 1\n"}
+    mock_get_blob.side_effect = lambda owner, repo, sha: texts[sha]
+    blobs = [
+        {"path": "yarn.lock", "sha": "s0", "size": 9000},
+        {"path": "src/gen.ts", "sha": "s1"},
+        {"path": "src/main.py", "sha": "s2"},
+    ]
+    generated: dict = {}
+    out = batch_fetch_text("o", "r", blobs, max_files=2, max_total_bytes=1_000_000, generated=generated)
+    assert out == {"src/main.py": "x = 1\n"}
+    assert generated == {
+        "yarn.lock": {"reason": "lockfile", "size": 9000},
+        "src/gen.ts": {"reason": "marker", "size": len(texts["s1"])},
+    }
+    assert mock_get_blob.call_count == 2
+
+
+@patch("app.services.repo_content.get_blob_text")
+def test_batch_fetch_text_counts_generated_downloads_against_max_files(mock_get_blob):
+    """Many generated files (migrations, *_pb2.py) cannot push downloads past max_files."""
+    mock_get_blob.return_value = "# Generated by Django 4.2 on 2024-01-01\n"
+    blobs = [{"path": f"app/migrations/{i:04}_auto.py", "sha": f"s{i}"} for i in range(50)]
+    generated: dict = {}
+    out = batch_fetch_text("o", "r", blobs, max_files=5, max_total_bytes=1_000_000, generated=generated)
+    assert out == {} and len(generated) == 5
+    assert mock_get_blob.call_count == 5
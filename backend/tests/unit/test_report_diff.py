@@ -0,0 +1,123 @@
+"""Unit tests for report_diff: keyed diff of two findings documents."""
+
+from app.services.report_diff import DiffCache, diff_findings
+
+
+def _check(check_id: str, status: str = "pass", points: int = 5, file: str = "README.md") -> dict:
+    return {
+        "id": check_id,
+        "name": check_id.title(),
+        "status": status,
+        "points": points,
+        "evidence": {"file": file, "snippet": ""},
+        "recommendation": {"what": "", "where": "", "why": "", "how": ""},
+    }
+
+
+def _findings(sections: dict[str, list[dict]], overall: int, categories: dict[str, int]) -> dict:
+    return {
+        "overall_score": overall,
+        "sections": [{"name": name, "score": 0, "checks": checks} for name, checks in sections.items()],
+        "interview_pack": [],
+        "category_scores": categories,
+    }
+
+
+def test_diff_checks_scores_and_findings():
+    base = _findings(
+        {
+            "Runability": [_check("readme"), _check("docker", "fail", 0, "—")],
+            "Secrets Safety": [_check("secrets", "fail", 0, "config.py"), _check("gone")],
+        },
+        overall=50,
+        categories={"Runability": 40, "Security & Deps": 20},
+    )
+    # Sections reordered and a check moved between sections: keyed by id, not position.
+    head = _findings(
+        {
+            "Secrets Safety": [_check("secrets", "fail", 0, "settings.py"), _check("docker", "pass", 10)],
+            "Runability": [_check("readme", "warn", 2), _check("ci", "fail", 0, ".github")],
+        },
+        overall=65,
+        categories={"Runability": 70, "Documentation": 50},
+    )
+
+    diff = diff_findings(base, head)
+
+    assert diff["overall_score"] == {"base": 50, "head": 65, "delta": 15}
+    assert diff["category_scores"] == {
+        "Runability": {"base": 40, "head": 70, "delta": 30},
+        "Security & Deps": {"base": 20, "head": None, "delta": None},
+        "Documentation": {"base": None, "head": 50, "delta": None},
+    }
+    assert [c["id"] for c in diff["checks"]["added"]] == ["ci"]
+    assert diff["checks"]["added"][0]["section"] == "Runability"
+    assert [c["id"] for c in diff["checks"]["removed"]] == ["gone"]
+    changed = {c["id"]: c for c in diff["checks"]["changed"]}
+    assert set(changed) == {"docker", "readme"}
+    assert changed["docker"]["status"] == {"base": "fail", "head": "pass"}
+    assert changed["docker"]["section"] == "Secrets Safety"
+    assert changed["readme"]["points"] == {"base": 5, "head": 2}
+
+    new = {(f["check_id"], f["evidence"]["file"]) for f in diff["new_findings"]}
+    resolved = {(f["check_id"], f["evidence"]["file"]) for f in diff["resolved_findings"]}
+    assert new == {("secrets", "settings.py"), ("readme", "README.md"), ("ci", ".github")}
+    assert resolved == {("secrets", "config.py"), ("docker", "—")}
+
+
+def test_diff_identical_is_empty():
+    doc = _findings({"Runability": [_check("readme", "fail", 0)]}, overall=10, categories={"Runability": 10})
+    diff = diff_findings(doc, doc)
+    assert diff["checks"] == {"added": [], "removed": [], "changed": []}
+    assert diff["new_findings"] == [] and diff["resolved_findings"] == []
+    assert diff["category_scores"]["Runability"]["delta"] == 0
+
+
+def test_diff_tolerates_missing_or_error_documents():
+    head = _findings({"Runability": [_check("readme")]}, overall=80, categories={})
+    diff = diff_findings({"error": "Repository not found"}, head)
+    assert diff["overall_score"] == {"base": None, "head": 80, "delta": None}
+    assert [c["id"] for c in diff["checks"]["added"]] == ["readme"]
+    assert diff_findings(None, None)["checks"]["added"] == []
+
+
+def test_diff_cache_is_bounded_lru():
+    cache = DiffCache(max_entries=2)
+    cache.put(("a", "b"), b"1")
+    cache.put(("a", "c"), b"2")
+    assert cache.get(("a", "b")) == b"1"  # now most recently used
+    cache.put(("a", "d"), b"3")
+    assert len(cache) == 2
+    assert cache.get(("a", "c")) is None
+    assert cache.get(("a", "b")) == b"1"
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_inserted_code_finding_does_not_shift_the_others():
+    def finding(i: int, name: str, file: str) -> dict:
+        return {**_check(f"code_finding_{i}", "fail", 0, file), "name": name, "evidence": {"file": file, "snippet": name}}
+
+    key = finding(0, "Possible secret: hardcoded key", "app/config.py")
+    danger = finding(1, "Dangerous pattern: eval", "app/run.py")
+    base = _findings({"Code Analysis": [key, danger]}, overall=50, categories={})
+    # Positional ids: the new finding takes code_finding_0 and pushes the others down.
+    head = _findings({"Code Analysis": [
+        finding(0, "Dangerous pattern: pickle", "app/cache.py"),
+        {**key, "id": "code_finding_1"},
+        {**danger, "id": "code_finding_2"},
+    ]}, overall=45, categories={})
+
+    diff = diff_findings(base, head)
+    assert [c["name"] for c in diff["checks"]["added"]] == ["Dangerous pattern: pickle"]
+    assert diff["checks"]["removed"] == [] and diff["checks"]["changed"] == []
+    assert [f["name"] for f in diff["new_findings"]] == ["Dangerous pattern: pickle"]
+    assert diff["resolved_findings"] == []
+
+
+def test_code_finding_ids_come_from_content():
+    from app.services.analyzer import _finding_id
+
+    assert _finding_id("Possible secret", "a.py", 3) == _finding_id("Possible secret", "a.py", 3)
+    assert _finding_id("Possible secret", "a.py", 3) != _finding_id("Possible secret", "a.py", 4)
+    assert _finding_id("Possible secret", "a.py", 3).startswith("code_finding_")
@@ -0,0 +1,64 @@
+"""Unit tests for report_render: streaming v1 rendering of stored v2 findings."""
+
+import copy
+import json
+from dataclasses import asdict
+
+from app.services.analyzer import analyze
+from app.services.report_render import (
+    buffered,
+    iter_legacy_detail,
+    iter_legacy_findings,
+    legacy_recommendation,
+)
+
+
+def _findings() -> dict:
+    fetch = {
+        "owner": "o",
+        "name": "r",
+        "key_files": [{"path": "README.md", "found": True, "snippet": "Install: pip install ."}],
+        "workflows": [],
+        "test_folders_detected": [],
+    }
+    return asdict(analyze(fetch, content_by_path={"app/main.py": "print('hi')\n"}))
+
+
+def test_legacy_recommendation_collapses_dict_and_passes_strings():
+    assert legacy_recommendation({"what": "A.", "where": "x", "why": "y", "how": "B."}) == "A. B."
+    assert legacy_recommendation("already flat") == "already flat"
+    assert legacy_recommendation(None) is None
+
+
+def test_iter_legacy_findings_matches_eager_transform():
+    findings = _findings()
+    expected = copy.deepcopy(findings)
+    for section in expected["sections"]:
+        for check in section["checks"]:
+            check["recommendation"] = legacy_recommendation(check["recommendation"])
+
+    rendered = json.loads("".join(iter_legacy_findings(findings)))
+    assert rendered == expected
+    # Input is left untouched: no in-place rewriting of the stored document.
+    assert isinstance(findings["sections"][0]["checks"][0]["recommendation"], dict)
+
+
+def test_iter_legacy_findings_handles_error_and_legacy_payloads():
+    assert json.loads("".join(iter_legacy_findings({"error": "boom"}))) == {"error": "boom"}
+    assert json.loads("".join(iter_legacy_findings(None))) is None
+    legacy = {"sections": [{"name": "S", "checks": [{"id": "c", "recommendation": "flat"}]}]}
+    assert json.loads("".join(iter_legacy_findings(legacy))) == legacy
+
+
+def test_iter_legacy_detail_only_rewrites_findings():
+    detail = {"id": "1", "recommendation": {"what": "keep"}, "findings_json": _findings()}
+    out = json.loads("".join(iter_legacy_detail(detail)))
+    assert out["recommendation"] == {"what": "keep"}
+    assert isinstance(out["findings_json"]["sections"][0]["checks"][0]["recommendation"], str)
+
+
+def test_buffered_coalesces_chunks():
+    blocks = list(buffered(["ab"] * 10, size=5))
+    assert b"".join(blocks) == b"ab" * 10
+    assert all(len(b) >= 5 for b in blocks[:-1])
+    assert list(buffered([])) == []
@@ -0,0 +1,101 @@
+"""Unit tests for report_storage: body codecs, streaming decode, dictionary training."""
+
+import gzip
+import json
+from dataclasses import asdict
+
+import pytest
+
+from app.services.analyzer import analyze
+from app.services.report_storage import (
+    MAX_DICTIONARY_BYTES,
+    UnknownEncodingError,
+    accepts_gzip,
+    decode_body,
+    encode_body,
+    iter_decoded,
+    train_dictionary,
+)
+
+
+def _body(name: str, readme: bool = True) -> bytes:
+    fetch = {
+        "owner": "o",
+        "name": name,
+        "key_files": [{"path": "README.md", "found": readme, "snippet": f"Install {name}: pip install ."}],
+        "workflows": [],
+        "test_folders_detected": [],
+    }
+    findings = asdict(analyze(fetch, content_by_path={"app/main.py": f"print('{name}')\n"}))
+    return json.dumps({"id": name, "findings_json": findings}, separators=(",", ":")).encode()
+
+
+@pytest.mark.parametrize("codec", ["none", "gzip"])
+def test_round_trip(codec):
+    raw = _body("r")
+    stored, encoding, dict_id = encode_body(raw, codec)
+    assert dict_id is None
+    assert decode_body(stored, encoding) == raw
+    if codec == "gzip":
+        assert encoding == "gzip"
+        assert gzip.decompress(stored) == raw  # a plain gzip member, servable as-is
+        assert len(stored) < len(raw)
+
+
+def test_zdict_round_trip_and_fallback():
+    samples = [_body(f"repo{i}", readme=i % 2 == 0) for i in range(6)]
+    zdict = train_dictionary(samples[:5])
+    assert 0 < len(zdict) <= MAX_DICTIONARY_BYTES
+
+    raw = samples[5]
+    stored, encoding, dict_id = encode_body(raw, "zdict", (7, zdict))
+    assert (encoding, dict_id) == ("zdict", 7)
+    assert decode_body(stored, encoding, zdict) == raw
+    assert len(stored) < len(encode_body(raw, "gzip")[0])
+
+    # Not trained yet: gzip.
+    assert encode_body(raw, "zdict")[1:] == ("gzip", None)
+
+
+def test_iter_decoded_streams_in_bounded_chunks():
+    raw = b"".join(_body(f"r{i}") for i in range(5))
+    stored, encoding, _ = encode_body(raw, "gzip")
+    chunks = list(iter_decoded(stored, encoding, chunk_size=1024))
+    assert len(chunks) > 1
+    assert max(len(c) for c in chunks) <= 1024
+    assert b"".join(chunks) == raw
+    assert list(iter_decoded(raw, None)) == [raw]
+
+
+def test_unknown_encodings_raise():
+    with pytest.raises(UnknownEncodingError):
+        encode_body(b"{}", "brotli")
+    with pytest.raises(UnknownEncodingError):
+        decode_body(b"{}", "brotli")
+    with pytest.raises(UnknownEncodingError):
+        decode_body(b"{}", "zdict", None)
+
+
+def test_train_dictionary_edge_cases():
+    assert train_dictionary([]) == b""
+    assert len(train_dictionary([_body(f"r{i}") for i in range(3)], size=100)) <= 100
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, False),
+        ("", False),
+        ("gzip", True),
+        ("gzip, deflate, br", True),
+        ("br;q=1.0, gzip;q=0.5", True),
+        ("gzip;q=0", False),
+        ("identity", False),
+        ("*", True),
+        ("*;q=0", False),
+        ("gzip;q=0, *", False),
+        ("gzip;q=bad", False),
+    ],
+)
+def test_accepts_gzip(header, expected):
+    assert accepts_gzip(header) is expected
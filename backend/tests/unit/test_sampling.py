@@ -0,0 +1,108 @@
+"""Unit tests for stratified sampling and whole-tree extrapolation."""
+
+from dataclasses import replace
+
+import pytest
+
+from app.core.analysis_profiles import STANDARD, InvalidProfileError, resolve_profile
+from app.services.analyzer import analyze
+from app.services.sampling import (
+    allocate,
+    sampling_summary,
+    select_for_profile,
+    stratified_candidates,
+    stratify,
+)
+
+STRATIFIED = replace(STANDARD, sampling="stratified")
+EMPTY_EXCEPT_SRC = "try:\n    f()\nexcept Exception:\n    pass\n"
+CLEAN_SRC = "x = 1\n"
+
+
+def _tree(counts: dict[str, int]) -> list[dict]:
+    """{directory/extension: n} -> n blobs in each."""
+    blobs = []
+    for stem, n in counts.items():
+        directory, ext = stem.rsplit("/", 1)
+        blobs += [{"path": f"{directory}/f{i:03d}.{ext}", "sha": f"{stem}-{i}", "size": 10} for i in range(n)]
+    return blobs
+
+
+def test_allocate_is_proportional_with_one_per_stratum():
+    alloc = allocate({("a", ".py"): 90, ("b", ".py"): 9, ("c", ".ts"): 1}, 20)
+    assert sum(alloc.values()) == 20
+    assert alloc[("c", ".ts")] == 1
+    assert alloc[("a", ".py")] > alloc[("b", ".py")] >= 1
+    assert allocate({("a", ".py"): 3}, 10) == {("a", ".py"): 3}
+    assert sum(allocate({("a", ".py"): 5, ("b", ".py"): 5, ("c", ".py"): 5}, 2).values()) == 2
+
+
+def test_stratify_by_directory_and_extension():
+    blobs = _tree({"src/api/py": 2, "src/web/ts": 2}) + [{"path": "src/main.py", "sha": "m"}]
+    strata = stratify(blobs)
+    assert set(strata) == {("src/api", ".py"), ("src/web", ".ts"), ("(entry points)", ".py")}
+
+
+def test_stratified_candidates_cover_every_stratum_deterministically():
+    tree = _tree({"src/api/py": 300, "src/web/ts": 100, "app/lib/js": 5}) + [
+        {"path": "README.md", "sha": "r"},
+        {"path": "src/main.py", "sha": "m"},
+    ]
+    picked = stratified_candidates(tree, max_files=42)
+    paths = [b["path"] for b in picked]
+    assert len(paths) == 42
+    assert paths[:2] == ["README.md", "src/main.py"]
+    assert all(any(p.startswith(d) for p in paths) for d in ("src/api/", "src/web/", "app/lib/"))
+    assert stratified_candidates(list(reversed(tree)), max_files=42) == picked
+
+
+def test_select_for_profile_keeps_priority_order_by_default():
+    tree = _tree({"src/api/py": 5})
+    assert [b["path"] for b in select_for_profile(tree, STANDARD)] == sorted(b["path"] for b in tree)
+
+
+def test_summary_of_full_read_is_exact():
+    tree = _tree({"src/api/py": 4})
+    content = {b["path"]: "" for b in tree}
+    metrics = {tree[0]["path"]: {"smells": 3}}
+    summary = sampling_summary(tree, content, metrics, STRATIFIED)
+    assert summary["fraction"] == 1
+    assert summary["estimates"]["smells"] == {"observed": 3, "estimate": 3, "ci_low": 3, "ci_high": 3}
+
+
+def test_summary_extrapolates_with_interval():
+    tree = _tree({"src/api/py": 100, "src/web/ts": 100})
+    read = [b["path"] for b in tree if int(b["path"][-6:-3]) % 10 == 0]
+    metrics = {p: {"smells": 2 if p.endswith(".py") else 0} for p in read}
+    metrics[read[0]]["smells"] = 4
+    summary = sampling_summary(tree, dict.fromkeys(read, ""), metrics, STRATIFIED)
+    assert summary["code_files"] == 200 and summary["code_files_read"] == 20 and summary["strata"] == 2
+    est = summary["estimates"]["smells"]
+    assert est["observed"] == 22
+    assert est["estimate"] == pytest.approx(220)
+    assert est["observed"] <= est["ci_low"] < est["estimate"] < est["ci_high"]
+
+
+def test_summary_without_estimates_for_priority_or_no_code():
+    tree = _tree({"src/api/py": 4})
+    summary = sampling_summary(tree, {tree[0]["path"]: ""}, {}, STANDARD)
+    assert summary == {"mode": "priority", "code_files": 4, "code_files_read": 1, "fraction": 0.25}
+    assert sampling_summary(_tree({"docs/md": 3}), {}, {}, STRATIFIED) is None
+
+
+def test_analyze_reports_sampling_and_extrapolates_smells():
+    tree = _tree({"src/api/py": 40})
+    content = {b["path"]: (EMPTY_EXCEPT_SRC if i % 2 else CLEAN_SRC) for i, b in enumerate(tree[:10])}
+    result = analyze({"tree_blobs": tree}, content_by_path=content, profile=STRATIFIED)
+    assert result.sampling["fraction"] == 0.25
+    assert result.sampling["estimates"]["high_severity_smells"]["observed"] == 5
+    assert result.sampling["estimates"]["high_severity_smells"]["estimate"] == pytest.approx(20)
+    smells = next(c for s in result.sections for c in s.checks if c.id == "smells_summary")
+    assert "Extrapolated from 10 of 40 code files" in smells.recommendation.what
+
+
+def test_resolve_profile_sampling():
+    assert resolve_profile("quick", sampling="stratified").sampling == "stratified"
+    assert resolve_profile("quick").sampling == "priority"
+    with pytest.raises(InvalidProfileError):
+        resolve_profile(sampling="systematic")
@@ -0,0 +1,96 @@
+"""Unit tests for the known-scaffold index and its use in selection and analysis."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from app.cli import main
+from app.core.analysis_profiles import STANDARD
+from app.services import scaffold_index
+from app.services.analyzer import analyze
+from app.services.candidate_selector import select_candidates
+from app.services.cost_model import RepoStats
+from app.services.local_repo import git_blob_sha
+from app.services.scaffold_index import ScaffoldIndex, ScaffoldIndexError, get_scaffold_index
+
+TEMPLATE = {
+    "package.json": '{"name": "my-app"}\n',
+    "src/app/page.tsx": "export default function Page() { console.log('hi'); return null }\n",
+    "src/app/layout.tsx": "export default function Layout({ children }: any) { return children }\n",
+}
+
+
+@pytest.fixture
+def template(tmp_path: Path) -> Path:
+    root = tmp_path / "template"
+    for rel, text in TEMPLATE.items():
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text(text)
+    return root
+
+
+@pytest.fixture
+def index_file(tmp_path: Path, template: Path):
+    path = tmp_path / "scaffolds.json"
+    assert main(["scaffold-add", "next-app", str(template), "--index", str(path)]) == 0
+    with patch.object(scaffold_index, "SCAFFOLD_INDEX", str(path)):
+        get_scaffold_index.cache_clear()
+        yield path
+    get_scaffold_index.cache_clear()
+
+
+def _blob(path: str, text: str) -> dict:
+    data = text.encode()
+    return {"path": path, "sha": git_blob_sha(data), "size": len(data)}
+
+
+def _user_repo() -> list[dict]:
+    return [_blob(p, t) for p, t in TEMPLATE.items()] + [
+        _blob("src/app/api.ts", "export const x: any = 1\n"),
+    ]
+
+
+def test_add_records_metrics_and_round_trips(index_file: Path):
+    index = ScaffoldIndex.load(index_file)
+    assert index.scaffolds["next-app"]["files"] == 3
+    page = index.get(git_blob_sha(TEMPLATE["src/app/page.tsx"].encode()))
+    assert page["scaffolds"] == ["next-app"] and page["metrics"] == {"smells": 1}
+    layout = index.get(git_blob_sha(TEMPLATE["src/app/layout.tsx"].encode()))
+    assert layout["metrics"] == {"any_usages": 1}
+
+
+def test_known_code_is_not_fetched_but_manifests_are(index_file: Path):
+    paths = [b["path"] for b in select_candidates(_user_repo())]
+    assert paths == ["package.json", "src/app/api.ts"]
+    assert RepoStats.from_tree(_user_repo(), STANDARD).fetch_files == 2
+
+
+def test_analyze_reports_scaffold_separately(index_file: Path):
+    result = analyze({"tree_blobs": _user_repo()}, content_by_path={"src/app/api.ts": "export const x = 1\n"})
+    assert result.scaffold == {
+        "files": 2,
+        "bytes": sum(len(TEMPLATE[p]) for p in ("src/app/page.tsx", "src/app/layout.tsx")),
+        "scaffolds": {"next-app": 2},
+        "metrics": {"smells": 1, "any_usages": 1},
+    }
+    assert analyze({"tree_blobs": [_blob("src/own.py", "x = 1\n")]}).scaffold is None
+
+
+def test_shared_blobs_survive_removing_one_scaffold(template: Path, tmp_path: Path):
+    from app.cli.scaffolds import add_scaffold
+
+    index = ScaffoldIndex()
+    add_scaffold(index, "a", str(template))
+    add_scaffold(index, "b", str(template))
+    assert index.remove("a") and not index.remove("a")
+    assert len(index) == 3
+    assert index.remove("b") and len(index) == 0
+
+
+def test_load_rejects_other_files(tmp_path: Path):
+    bad = tmp_path / "bad.json"
+    bad.write_text('{"version": 99}')
+    with pytest.raises(ScaffoldIndexError):
+        ScaffoldIndex.load(bad)
+    assert len(ScaffoldIndex.load(tmp_path / "missing.json")) == 0
@@ -0,0 +1,74 @@
+"""Unit tests for snapshot_archive: append-only storage of analysis inputs."""
+
+import uuid
+
+import pytest
+
+from app.services.snapshot_archive import (
+    DATA_FILE,
+    INDEX_FILE,
+    SnapshotArchive,
+    SnapshotNotFoundError,
+    rebuild_index,
+)
+
+FETCH = {"owner": "o", "name": "r", "tree_blobs": [{"path": "a.py", "sha": "1" * 40, "size": 6}]}
+CONTENT = {"a.py": "x = 1\n", "b.py": "print('héllo')\n"}
+
+
+def test_round_trip_and_order(tmp_path):
+    first, second = uuid.uuid4(), uuid.uuid4()
+    with SnapshotArchive(tmp_path) as archive:
+        archive.save(first, "https://github.com/o/r", FETCH, CONTENT)
+        archive.save(second, "https://github.com/o/r", FETCH, {"c.py": ""})
+        assert archive.load(first) == ("https://github.com/o/r", FETCH, CONTENT, None)
+        assert archive.load(second)[2] == {"c.py": ""}
+        assert archive.report_ids() == [first, second]
+        assert first in archive and uuid.uuid4() not in archive
+        with pytest.raises(SnapshotNotFoundError):
+            archive.load(uuid.uuid4())
+
+
+def test_unchanged_files_are_stored_once(tmp_path):
+    archive = SnapshotArchive(tmp_path)
+    first = archive.save(uuid.uuid4(), "u", FETCH, CONTENT)
+    again = archive.save(uuid.uuid4(), "u", FETCH, CONTENT)
+    assert again < first
+    assert archive.stats()["blobs"] == 2 and archive.stats()["snapshots"] == 2
+
+
+def test_writers_see_each_other(tmp_path):
+    a, b = SnapshotArchive(tmp_path), SnapshotArchive(tmp_path)
+    rid = uuid.uuid4()
+    a.save(rid, "u", FETCH, CONTENT)
+    assert b.load(rid)[2] == CONTENT
+    other = uuid.uuid4()
+    b.save(other, "u", FETCH, {"a.py": "x = 1\n"})
+    assert a.report_ids() == [rid, other]
+    assert a.stats()["blobs"] == 2
+
+
+def test_torn_tail_is_ignored_and_cut(tmp_path):
+    rid = uuid.uuid4()
+    SnapshotArchive(tmp_path).save(rid, "u", FETCH, CONTENT)
+    with open(tmp_path / DATA_FILE, "ab") as f:
+        f.write(b"SCS1b" + b"\0" * 10)
+    with open(tmp_path / INDEX_FILE, "ab") as f:
+        f.write(b"\0" * 7)
+
+    archive = SnapshotArchive(tmp_path)
+    assert archive.load(rid)[2] == CONTENT
+    later = uuid.uuid4()
+    archive.save(later, "u", FETCH, {"z.py": "z"})
+    (tmp_path / INDEX_FILE).unlink()
+    assert SnapshotArchive(tmp_path).report_ids() == [rid, later]
+
+
+def test_rebuild_index_drops_partial_record(tmp_path):
+    rid = uuid.uuid4()
+    SnapshotArchive(tmp_path).save(rid, "u", FETCH, CONTENT)
+    entries = rebuild_index(tmp_path)
+    with open(tmp_path / DATA_FILE, "ab") as f:
+        f.write(b"SCS1s" + b"\0" * 20 + (1000).to_bytes(8, "little") + b"partial")
+    assert rebuild_index(tmp_path) == entries == 3
+    assert SnapshotArchive(tmp_path).load(rid)[2] == CONTENT
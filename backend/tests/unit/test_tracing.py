@@ -0,0 +1,69 @@
+"""Unit tests for app.core.tracing."""
+
+import gzip
+import json
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+from app.core.metrics import time_stage
+from app.core.tracing import Trace, encode_trace, recording, span
+
+
+def test_span_outside_recording_is_a_no_op():
+    with span("fetch_repo"):
+        pass
+
+
+def test_spans_are_exported_as_chrome_complete_events():
+    trace = Trace()
+    with recording(trace):
+        with time_stage("analyze"):
+            with span("complexity", "file", path="a.py", chars=10):
+                pass
+    doc = trace.to_chrome({"report_id": "r1"})
+
+    events = [e for e in doc["traceEvents"] if e["ph"] == "X"]
+    assert [(e["name"], e["cat"]) for e in events] == [("complexity", "file"), ("analyze", "stage")]
+    inner, outer = events
+    assert inner["args"] == {"path": "a.py", "chars": 10}
+    assert "args" not in outer
+    assert outer["ts"] <= inner["ts"] and inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert {e["name"] for e in doc["traceEvents"] if e["ph"] == "M"} == {"thread_name"}
+    assert doc["otherData"]["report_id"] == "r1"
+    assert doc["otherData"]["span_count"] == 2
+    assert doc["otherData"]["dropped_spans"] == 0
+
+
+def test_trace_follows_the_context_into_worker_threads():
+    def work():
+        with span("fetch_blob", "file", path="x"):
+            pass
+
+    trace = Trace()
+    with recording(trace):
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pool.submit(copy_context().run, work).result()
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pool.submit(copy_context().run, work).result()
+
+    assert [e[0] for e in trace.events] == ["fetch_blob"]
+    assert trace.to_chrome()["traceEvents"][0]["args"] == {"path": "x"}
+
+
+def test_spans_beyond_the_limit_are_counted_not_kept():
+    trace = Trace(max_spans=2)
+    with recording(trace):
+        for i in range(5):
+            with span("s", i=i):
+                pass
+    assert len(trace.events) == 2
+    assert trace.dropped == 3
+
+
+def test_encode_trace_is_gzipped_json():
+    trace = Trace()
+    with recording(trace), span("serialize"):
+        pass
+    doc = json.loads(gzip.decompress(encode_trace(trace, {"repo_url": "u"})))
+    assert doc["otherData"]["repo_url"] == "u"
+    assert doc["traceEvents"][0]["name"] == "serialize"
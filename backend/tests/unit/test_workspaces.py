@@ -0,0 +1,100 @@
+"""Unit tests for monorepo workspace detection and sharded per-package analysis."""
+
+import json
+
+from app.services.analyzer import analyze
+from app.services.workspaces import (
+    detect_packages,
+    matches_workspace,
+    merge_deps,
+    run_shards,
+    shard_pool,
+    split_files,
+    workspace_globs,
+)
+
+CONTENT = {
+    "package.json": json.dumps({"name": "root", "private": True, "workspaces": ["packages/*"]}),
+    "packages/web/package.json": json.dumps({"name": "@acme/web", "dependencies": {"react": "18.2.0", "left-pad": "1.3.0"}}),
+    "packages/web/src/index.ts": "import React from 'react'\nimport { util } from './util'\n",
+    "packages/web/src/util.ts": "export const util = 1\n",
+    "services/api/requirements.txt": "fastapi==0.110.0\n",
+    "services/api/app/main.py": "from fastapi import FastAPI\nfrom app.routes import router\n",
+    "services/api/app/routes.py": "router = None\n",
+}
+TREE = sorted(CONTENT) + ["examples/demo/package.json", "node_modules/react/package.json", "tools/x/package.json"]
+
+
+def test_workspace_globs_from_npm_and_pnpm():
+    assert workspace_globs(CONTENT) == ["packages/*"]
+    pnpm = "packages:\n  - 'apps/*'\n  - \"libs/**\"\n  - '!libs/legacy'\nother:\n  - nope\n"
+    globs = workspace_globs({"pnpm-workspace.yaml": pnpm})
+    assert globs == ["apps/*", "libs/**", "!libs/legacy"]
+    assert matches_workspace("apps/web", globs) and not matches_workspace("apps/web/sub", globs)
+    assert matches_workspace("libs/a/b", globs) and not matches_workspace("libs/legacy", globs)
+
+
+def test_detect_packages():
+    packages = detect_packages(TREE, CONTENT)
+    assert [(p.name, p.root, p.languages) for p in packages] == [
+        ("@acme/web", "packages/web", ("javascript",)),
+        ("services/api", "services/api", ("python",)),
+        ("root", "", ("javascript",)),
+    ]
+    # tools/x is not a declared workspace; examples/ and node_modules/ never count.
+    assert detect_packages(["package.json", "src/index.ts"], {}) == []
+
+
+def test_split_files_uses_deepest_root():
+    packages = detect_packages(TREE, CONTENT)
+    web, api, root = split_files({**CONTENT, "scripts/build.js": "x"}, packages)
+    assert set(web) == {"package.json", "src/index.ts", "src/util.ts"}
+    assert set(api) == {"requirements.txt", "app/main.py", "app/routes.py"}
+    assert set(root) == {"package.json", "scripts/build.js"}
+
+
+def test_files_outside_every_package_go_to_a_root_shard():
+    content = {k: v for k, v in CONTENT.items() if k != "package.json"}
+    content.update({
+        "packages/web/package.json": json.dumps({"name": "@acme/web"}),
+        "scripts/release.py": "import helpers\n",
+        "helpers.py": "x = 1\n",
+    })
+    packages = detect_packages(sorted(content), content)
+    assert [(p.name, p.root, p.manifests) for p in packages][-1] == ("(root)", "", ())
+    *_, root = split_files(content, packages)
+    assert set(root) == {"scripts/release.py", "helpers.py"}
+
+    result = analyze({"tree_paths": sorted(content)}, content_by_path=content)
+    assert [(p.root, p.files) for p in result.packages][0] == ("", 2)
+
+
+def test_shards_run_the_same_in_processes():
+    packages = detect_packages(TREE, CONTENT)
+    shards = split_files(CONTENT, packages)
+    inline = run_shards(shards, workers=0)
+    assert run_shards(shards, workers=2) == inline
+    # One long-lived pool, whose workers are not forked from this process.
+    pool = shard_pool(2)
+    assert run_shards(shards, workers=2) == inline and shard_pool(2) is pool
+    assert pool._mp_context.get_start_method() in ("forkserver", "spawn")
+    # Each package resolves its own imports and manifest.
+    assert inline[1]["python_deps"]["missing"] == []
+    assert ["src/index.ts", "src/util.ts"] in inline[0]["imports"]
+    js = merge_deps(packages, inline, "js_deps", "package.json")
+    assert js["unused"] == ["left-pad (@acme/web)"]
+    assert js["manifest"] == "packages/web/package.json"
+
+
+def test_analyze_reports_packages_and_rolls_up():
+    fetch = {"tree_paths": TREE, "tree_blobs": [{"path": p, "sha": p} for p in TREE]}
+    result = analyze(fetch, content_by_path=CONTENT)
+    assert [p.root for p in result.packages] == ["", "packages/web", "services/api"]
+    api = result.packages[2]
+    assert api.files == 3 and [s.name for s in api.sections] == ["Dependencies", "Architecture"]
+    checks = {c.id: c for s in result.sections for c in s.checks}
+    assert checks["dependencies_missing"].status == "pass"
+    assert checks["dependencies_unused"].evidence["file"] == "packages/web/package.json"
+
+    single = analyze({"tree_paths": ["app/main.py"]}, content_by_path={"app/main.py": "x = 1\n"})
+    assert single.packages == []
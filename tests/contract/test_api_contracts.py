@@ -30,7 +30,10 @@ from .schemas import (
 def client():
     """Create test client."""
     from app.main import app
-    return TestClient(app)
+    # Context-managed so every request runs on one event loop; pooled
+    # asyncpg connections are bound to the loop that opened them.
+    with TestClient(app) as c:
+        yield c
 
 
 def test_analyze_response_contract(client):